@@ -138,14 +138,10 @@ def validate(self):
         if self.name in self.blacklist:
             raise InvalidAliasError("The name %s can't be aliased "
                                     "because it is a keyword or builtin." % self.name)
-        try:
-            caller = self.shell.magics_manager.magics['line'][self.name]
-        except KeyError:
-            pass
-        else:
-            if not isinstance(caller, Alias):
-                raise InvalidAliasError("The name %s can't be aliased "
-                                        "because it is another magic command." % self.name)
+        caller = self.shell.find_line_magic(self.name)
+        if caller is not None and not isinstance(caller, Alias):
+            raise InvalidAliasError("The name %s can't be aliased "
+                                    "because it is another magic command." % self.name)
 
         if not (isinstance(self.cmd, str)):
             raise InvalidAliasError("An alias command must be a string, "
@@ -31,10 +31,18 @@
 from ast import PyCF_ONLY_AST
 import codeop
 import functools
+import glob
 import hashlib
+from importlib.util import MAGIC_NUMBER
 import linecache
+import marshal
 import operator
+import os
 import time
+import types
+
+from IPython.core import release
+from IPython.utils.path import ensure_dir_exists
 
 #-----------------------------------------------------------------------------
 # Constants
@@ -133,6 +141,86 @@ def cache(self, code, number=0):
         linecache._ipython_cache[name] = entry
         return name
 
+class BytecodeCache(object):
+    """Cache on disk the code objects compiled from files.
+
+    Entries are keyed on the file name, its source, the versions of IPython
+    and of the Python bytecode, and an optional ``context`` string describing
+    anything else the compilation depends on. A file is therefore only
+    compiled again once one of those has changed. Only the latest entry of
+    each file is kept.
+
+    Errors reading or writing the cache are ignored, so it can be used on
+    read-only or shared directories.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _paths(self, filename, source, context):
+        """Return the path of an entry, and a glob matching all the entries
+        of the same file."""
+        if isinstance(source, str):
+            source = source.encode('utf-8', 'surrogateescape')
+        filename = filename.encode('utf-8', 'surrogateescape')
+        key = hashlib.sha256()
+        for part in (MAGIC_NUMBER, release.version.encode('ascii'),
+                     filename, context.encode('utf-8', 'surrogateescape')):
+            key.update(part)
+            key.update(b'\0')
+        key.update(source)
+        prefix = os.path.join(self.directory,
+                              hashlib.sha1(filename).hexdigest()[:16])
+        return ('%s-%s.bin' % (prefix, key.hexdigest()[:32]),
+                prefix + '-*.bin')
+
+    def get(self, filename, source, context=''):
+        """Return the code cached for this source of filename, or None."""
+        path, _ = self._paths(filename, source, context)
+        try:
+            with open(path, 'rb') as f:
+                code = marshal.load(f)
+        except Exception:
+            # Missing or unreadable entry
+            return None
+        if not isinstance(code, types.CodeType):
+            return None
+        return code
+
+    def store(self, filename, source, code, context=''):
+        """Cache the code compiled from this source of filename."""
+        path, pattern = self._paths(filename, source, context)
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            ensure_dir_exists(self.directory)
+            for old in glob.glob(pattern):
+                if old != path:
+                    os.remove(old)
+            with open(tmp, 'wb') as f:
+                marshal.dump(code, f)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def compile(self, source, filename, mode='exec', context=''):
+        """Compile like the builtin :func:`compile`, through the cache.
+
+        This can be used as the compiler of
+        :func:`IPython.utils.py3compat.execfile`. Only ``exec`` mode
+        compilations are cached.
+        """
+        if mode != 'exec':
+            return compile(source, filename, mode, dont_inherit=True)
+        code = self.get(filename, source, context)
+        if code is None:
+            code = compile(source, filename, mode, dont_inherit=True)
+            self.store(filename, source, code, context)
+        return code
+
+
 def check_linecache_ipython(*args):
     """Call linecache.checkcache() safely protecting our cached values.
     """
@@ -1227,7 +1227,7 @@ def magic_matches(self, text):
         """Match magics"""
         # Get all shell magics now rather than statically, so magics loaded at
         # runtime show up too.
-        lsm = self.shell.magics_manager.lsmagic()
+        lsm = self.shell.magics_manager.magic_names()
         line_magics = lsm['line']
         cell_magics = lsm['cell']
         pre = self.magic_escape
@@ -1270,6 +1270,8 @@ def magic_config_matches(self, text:str) -> List[str]:
         texts = text.strip().split()
 
         if len(texts) > 0 and (texts[0] == 'config' or texts[0] == '%config'):
+            # magics not used yet aren't instantiated
+            self.shell.magics_manager.load_lazy()
             # get all configuration classes
             classes = sorted(set([ c for c in self.shell.configurables
                                    if c.__class__.class_traits(config=True)
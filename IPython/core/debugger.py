@@ -27,10 +27,14 @@
 #*****************************************************************************
 
 import bdb
+import dis
+import fnmatch
 import functools
 import inspect
 import linecache
+import os
 import sys
+import sysconfig
 import warnings
 import re
 
@@ -199,16 +203,70 @@ def _file_lines(fname):
     """Return the contents of a named file as a list of lines.
 
     This function never raises an IOError exception: if the file can't be
-    read, it simply returns an empty list."""
+    read, it simply returns an empty list. The lines are cached by
+    :mod:`linecache`, which reads the file again only once it changed."""
+    linecache.checkcache(fname)
+    return linecache.getlines(fname)
+
+
+def _library_paths():
+    """Patterns matching the files of the standard library and of the
+    installed packages."""
+    paths = sysconfig.get_paths()
+    dirs = set(paths[name] for name in ('stdlib', 'platstdlib', 'purelib',
+                                        'platlib') if name in paths)
+    return [os.path.join(d, '*') for d in sorted(dirs)]
+
+
+def _code_lines(code):
+    """The line numbers of the statements of a code object, without those of
+    the functions and classes it defines."""
+    lines = set(lineno for _, lineno in dis.findlinestarts(code)
+                if lineno is not None)
+    lines.add(code.co_firstlineno)
+    return lines
 
-    try:
-        outfile = open(fname)
-    except IOError:
-        return []
-    else:
-        out = outfile.readlines()
-        outfile.close()
-        return out
+
+@functools.lru_cache(maxsize=128)
+def _compile_condition(cond):
+    return compile(cond, '<breakpoint>', 'eval')
+
+
+def _effective(file, line, frame):
+    """Like bdb.effective, but with breakpoint conditions compiled once.
+
+    Returns (active breakpoint, delete temporary flag) or (None, None).
+    """
+    for b in bdb.Breakpoint.bplist[file, line]:
+        if not b.enabled:
+            continue
+        if not bdb.checkfuncname(b, frame):
+            continue
+        # Count every hit when bp is enabled
+        b.hits += 1
+        if not b.cond:
+            # If unconditional, and ignoring go on to next, else break
+            if b.ignore > 0:
+                b.ignore -= 1
+                continue
+            # breakpoint and marker that it's ok to delete if temporary
+            return (b, True)
+        # Conditional bp. Ignore count applies only to those bpt hits where
+        # the condition evaluates to true.
+        try:
+            val = eval(_compile_condition(b.cond), frame.f_globals,
+                       frame.f_locals)
+        except:
+            # if eval fails, most conservative thing is to stop on
+            # breakpoint regardless of ignore count.  Don't delete
+            # temporary, as another hint to user.
+            return (b, False)
+        if val:
+            if b.ignore > 0:
+                b.ignore -= 1
+            else:
+                return (b, True)
+    return (None, None)
 
 
 class Pdb(OldPdb):
@@ -217,10 +275,24 @@ class Pdb(OldPdb):
     for a standalone version that uses prompt_toolkit, see
     `IPython.terminal.debugger.TerminalPdb` and
     `IPython.terminal.debugger.set_trace()`
+
+    With ``fast_tracing``, only the frames which have breakpoints, or are
+    being stepped through, are traced line by line: other functions, even in
+    files with breakpoints, run at nearly full speed on ``continue`` and
+    ``next``. Frames of files matching ``skip_paths`` (glob patterns, by
+    default the standard library and installed packages) are never stepped
+    into, unless they have breakpoints.
     """
 
+    #: Default for the fast_tracing argument, unless the shell's
+    #: debugger_fast_tracing option is set
+    fast_tracing = False
+    #: Default for the skip_paths argument; None means library files.
+    skip_paths = None
+
     def __init__(self, color_scheme=None, completekey=None,
-                 stdin=None, stdout=None, context=5):
+                 stdin=None, stdout=None, context=5, fast_tracing=None,
+                 skip_paths=None):
 
         # Parent constructor:
         try:
@@ -287,12 +359,163 @@ def __init__(self, color_scheme=None, completekey=None,
         # Set the prompt - the default prompt is '(Pdb)'
         self.prompt = prompt
 
+        if fast_tracing is None and getattr(self.shell,
+                                            'debugger_fast_tracing', False):
+            fast_tracing = True
+        if fast_tracing is not None:
+            self.fast_tracing = fast_tracing
+        if skip_paths is not None:
+            self.skip_paths = skip_paths
+        if self.skip_paths is None:
+            self.skip_paths = _library_paths()
+        # code object -> whether it has breakpoints, or is skipped
+        self._code_breaks = {}
+        self._code_skipped = {}
+        # Formatted stack entries, for the current stop, and highlighted
+        # source lines
+        self._stack_entries = {}
+        self._highlighted = {}
+        self._repr_budget = None
+
     def set_colors(self, scheme):
         """Shorthand access to the color table scheme selector method."""
         self.color_scheme_table.set_active_scheme(scheme)
         self.parser.style = scheme
 
+    #-------------------------------------------------------------------------
+    # Fast tracing
+
+    def _has_breaks(self, code):
+        """Whether there are breakpoints in the lines of a code object."""
+        try:
+            return self._code_breaks[code]
+        except KeyError:
+            pass
+        lines = self.breaks.get(self.canonic(code.co_filename))
+        found = bool(lines) and not _code_lines(code).isdisjoint(lines)
+        self._code_breaks[code] = found
+        return found
+
+    def _is_skipped_code(self, code):
+        """Whether a code object is in a file matching skip_paths."""
+        try:
+            return self._code_skipped[code]
+        except KeyError:
+            pass
+        filename = self.canonic(code.co_filename)
+        skipped = any(fnmatch.fnmatch(filename, pattern)
+                      for pattern in self.skip_paths)
+        self._code_skipped[code] = skipped
+        return skipped
+
+    def _breaks_changed(self):
+        self._code_breaks.clear()
+
+    def set_break(self, *args, **kwargs):
+        self._breaks_changed()
+        return OldPdb.set_break(self, *args, **kwargs)
+
+    def clear_break(self, *args, **kwargs):
+        self._breaks_changed()
+        return OldPdb.clear_break(self, *args, **kwargs)
+
+    def clear_all_file_breaks(self, *args, **kwargs):
+        self._breaks_changed()
+        return OldPdb.clear_all_file_breaks(self, *args, **kwargs)
+
+    def clear_all_breaks(self, *args, **kwargs):
+        self._breaks_changed()
+        return OldPdb.clear_all_breaks(self, *args, **kwargs)
+
+    def trace_dispatch(self, frame, event, arg):
+        if (event == 'call' and self.fast_tracing
+                and self.stopframe is not None and frame is not self.stopframe
+                and self.botframe is not None):
+            # Not stepping: only trace functions with breakpoints
+            code = frame.f_code
+            try:
+                has_breaks = self._code_breaks[code]
+            except KeyError:
+                has_breaks = self._has_breaks(code)
+            if not has_breaks:
+                return None
+        return OldPdb.trace_dispatch(self, frame, event, arg)
+
+    def break_anywhere(self, frame):
+        if not self.fast_tracing:
+            return OldPdb.break_anywhere(self, frame)
+        return self._has_breaks(frame.f_code)
+
+    def stop_here(self, frame):
+        if (self.fast_tracing and frame is not self.stopframe
+                and self._is_skipped_code(frame.f_code)):
+            return False
+        return OldPdb.stop_here(self, frame)
+
+    def break_here(self, frame):
+        if not self.fast_tracing:
+            return OldPdb.break_here(self, frame)
+        filename = self.canonic(frame.f_code.co_filename)
+        lines = self.breaks.get(filename)
+        if not lines:
+            return False
+        lineno = frame.f_lineno
+        if lineno not in lines:
+            # The line itself has no breakpoint, but maybe the line is the
+            # first line of a function with breakpoint set by function name.
+            lineno = frame.f_code.co_firstlineno
+            if lineno not in lines:
+                return False
+        bp, flag = _effective(filename, lineno, frame)
+        if not bp:
+            return False
+        self.currentbp = bp.number
+        if flag and bp.temporary:
+            self.do_clear(str(bp.number))
+        return True
+
+    def dispatch_line(self, frame):
+        trace = OldPdb.dispatch_line(self, frame)
+        if self.fast_tracing and frame.f_trace is None:
+            # set_continue stopped tracing this frame
+            return None
+        return trace
+
+    def set_continue(self):
+        OldPdb.set_continue(self)
+        if self.fast_tracing and self.breaks:
+            # Stop tracing the frames of the stack without breakpoints; they
+            # are traced again if the debugger stops in a frame they called.
+            frame = sys._getframe().f_back
+            while frame and frame is not self.botframe:
+                if not self._has_breaks(frame.f_code):
+                    frame.f_trace = None
+                frame = frame.f_back
+
+    def _trace_callers(self, frame):
+        """Trace the frames of the stack again, to step back into them."""
+        frame = frame.f_back
+        while frame and frame is not self.botframe:
+            if frame.f_trace is None:
+                frame.f_trace = self.trace_dispatch
+            frame = frame.f_back
+
+    def setup(self, f, tb):
+        self._stack_entries = {}
+        return OldPdb.setup(self, f, tb)
+
+    def forget(self):
+        OldPdb.forget(self)
+        self._stack_entries = {}
+
+    def new_repr_budget(self):
+        """A ReprBudget for the values shown in a stack listing, with the
+        limits the shell uses for tracebacks."""
+        return self.shell.InteractiveTB.new_repr_budget()
+
     def interaction(self, frame, traceback):
+        if self.fast_tracing and frame is not None and traceback is None:
+            self._trace_callers(frame)
         try:
             OldPdb.interaction(self, frame, traceback)
         except KeyboardInterrupt:
@@ -334,11 +557,14 @@ def print_stack_trace(self, context=None):
                 raise ValueError("Context must be a positive integer")
         except (TypeError, ValueError):
                 raise ValueError("Context must be a positive integer")
+        self._repr_budget = self.new_repr_budget()
         try:
             for frame_lineno in self.stack:
                 self.print_stack_entry(frame_lineno, context=context)
         except KeyboardInterrupt:
             pass
+        finally:
+            self._repr_budget = None
 
     def print_stack_entry(self,frame_lineno, prompt_prefix='\n-> ',
                           context=None):
@@ -367,11 +593,30 @@ def format_stack_entry(self, frame_lineno, lprefix=': ', context=None):
                 print("Context must be a positive integer")
         except (TypeError, ValueError):
                 print("Context must be a positive integer")
+        frame, lineno = frame_lineno
+        filename = self.canonic(frame.f_code.co_filename)
+        # Frames don't run while the debugger is stopped, but breakpoints
+        # may be added, enabled or disabled.
+        breaks = tuple((line, bp.number, bp.enabled)
+                       for line in self.get_file_breaks(filename)
+                       for bp in self.get_breaks(filename, line)[-1:])
+        key = (frame, lineno, context, frame is self.curframe,
+               self.color_scheme_table.active_scheme_name, breaks)
+        try:
+            return self._stack_entries[key]
+        except KeyError:
+            pass
+        entry = self._stack_entries[key] = self._format_stack_entry(
+            frame, lineno, filename, context)
+        return entry
+
+    def _format_stack_entry(self, frame, lineno, filename, context):
         try:
             import reprlib  # Py 3
         except ImportError:
             import repr as reprlib  # Py 2
 
+        budget = self._repr_budget or self.new_repr_budget()
         ret = []
 
         Colors = self.color_scheme_table.active_colors
@@ -382,17 +627,14 @@ def format_stack_entry(self, frame_lineno, lprefix=': ', context=None):
         tpl_line_em = u'%%s%s%%s %s%%s%s' % (Colors.linenoEm, Colors.line,
                                             ColorsNormal)
 
-        frame, lineno = frame_lineno
-
         return_value = ''
         if '__return__' in frame.f_locals:
             rv = frame.f_locals['__return__']
             #return_value += '->'
-            return_value += reprlib.repr(rv) + '\n'
+            return_value += budget(rv, reprlib.repr) + '\n'
         ret.append(return_value)
 
         #s = filename + '(' + `lineno` + ')'
-        filename = self.canonic(frame.f_code.co_filename)
         link = tpl_link % py3compat.cast_unicode(filename)
 
         if frame.f_code.co_name:
@@ -403,7 +645,7 @@ def format_stack_entry(self, frame_lineno, lprefix=': ', context=None):
         call = ''
         if func != '?':
             if '__args__' in frame.f_locals:
-                args = reprlib.repr(frame.f_locals['__args__'])
+                args = budget(frame.f_locals['__args__'], reprlib.repr)
             else:
                 args = '()'
             call = tpl_call % (func, args)
@@ -436,7 +678,12 @@ def __format_line(self, tpl_line, filename, lineno, line, arrow = False):
         bp_mark = ""
         bp_mark_color = ""
 
-        new_line, err = self.parser.format2(line, 'str')
+        key = (self.parser.style, line)
+        try:
+            new_line, err = self._highlighted[key]
+        except KeyError:
+            new_line, err = self._highlighted[key] = \
+                self.parser.format2(line, 'str')
         if not err:
             line = new_line
 
@@ -8,6 +8,7 @@
 from binascii import b2a_hex, b2a_base64, hexlify
 import json
 import mimetypes
+import mmap
 import os
 import struct
 import sys
@@ -36,6 +37,50 @@ def _safe_exists(path):
     except Exception:
         return False
 
+# Types of the raw binary data display objects accept
+_BINARY_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+# Files are base64-encoded by chunks of this size, a multiple of 3 bytes so
+# that the encoded chunks can be concatenated.
+_B64_CHUNK_SIZE = 3 * 2**18
+
+def _b64encode(data=None, filename=None, newline=False):
+    """Base64-encode binary data, or the content of a file, to a str.
+
+    Files are read and encoded in chunks, written straight to the output
+    buffer, so that their content is never held in memory as a whole.
+    """
+    if filename is None:
+        encoded = b2a_base64(data)
+        if not newline:
+            encoded = encoded[:-1]
+        return encoded.decode('ascii')
+
+    size = os.path.getsize(filename)
+    out = bytearray(4 * ((size + 2) // 3) + 1)
+    pos = 0
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(_B64_CHUNK_SIZE)
+            if not chunk:
+                break
+            encoded = memoryview(b2a_base64(chunk))[:-1]
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    if newline:
+        out[pos:pos + 1] = b'\n'
+        pos += 1
+    # The file may have changed size since we looked
+    del out[pos:]
+    return out.decode('ascii')
+
+def _read_at(data, offset, size):
+    """Read size bytes at offset of data, binary data or a binary file."""
+    if hasattr(data, 'read'):
+        data.seek(offset)
+        return data.read(size)
+    return bytes(data[offset:offset + size])
+
 def _merge(d1, d2):
     """Like update, but merges sub-dicts instead of clobbering at the top level.
 
@@ -114,13 +159,24 @@ def publish_display_data(data, metadata=None, source=None, *, transient=None, **
     if transient:
         kwargs['transient'] = transient
 
-    display_pub.publish(
+    # Frequent updates of a display are coalesced by the publisher
+    publish = getattr(display_pub, 'publish_coalesced', display_pub.publish)
+    publish(
         data=data,
         metadata=metadata,
         **kwargs
     )
 
 
+def _flush_display_updates():
+    """Publish the display updates held back by the display publisher."""
+    from IPython.core.interactiveshell import InteractiveShell
+    if InteractiveShell.initialized():
+        display_pub = InteractiveShell.instance().display_pub
+        if hasattr(display_pub, 'flush_updates'):
+            display_pub.flush_updates()
+
+
 def _new_id():
     """Generate a new random text id with urandom"""
     return b2a_hex(os.urandom(16)).decode('ascii')
@@ -289,13 +345,16 @@ def display(*objs, include=None, exclude=None, metadata=None, transient=None, di
         kwargs['transient'] = transient
 
     if not raw:
-        format = InteractiveShell.instance().display_formatter.format
+        shell = InteractiveShell.instance()
+        format = shell.display_formatter.format
+        accept = getattr(shell.display_pub, 'accepted_mimetypes', None)
 
     for obj in objs:
         if raw:
             publish_display_data(data=obj, metadata=metadata, **kwargs)
         else:
-            format_dict, md_dict = format(obj, include=include, exclude=exclude)
+            format_dict, md_dict = format(obj, include=include, exclude=exclude,
+                                          accept=accept)
             if not format_dict:
                 # nothing to display (e.g. _ipython_display_ took over)
                 continue
@@ -565,6 +624,10 @@ class DisplayObject(object):
     _read_flags = 'r'
     _show_mem_addr = False
     metadata = None
+    # Subclasses setting this don't read their file until the data is needed,
+    # and don't keep its content in memory.
+    _load_lazily = False
+    _data = None
 
     def __init__(self, data=None, url=None, filename=None, metadata=None):
         """Create a display object given raw data.
@@ -621,6 +684,34 @@ def _check_data(self):
         """Override in subclasses if there's something to check."""
         pass
 
+    @property
+    def data(self):
+        """The raw data. For objects loading their file lazily, the file is
+        read each time."""
+        if self._data_in_file():
+            with open(self.filename, self._read_flags) as f:
+                return f.read()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    def _data_in_file(self):
+        """Whether the data is read from the file when needed, rather than
+        held in memory."""
+        return (self._load_lazily and self._data is None
+                and self.filename is not None)
+
+    def _b64_data(self, newline=False):
+        """The raw binary data, base64-encoded.
+
+        The file of lazily loaded objects is encoded by chunks.
+        """
+        if self._data_in_file():
+            return _b64encode(filename=self.filename, newline=newline)
+        return _b64encode(self._data, newline=newline)
+
     def _data_and_metadata(self):
         """shortcut for returning metadata with shape information, if defined"""
         if self.metadata:
@@ -631,8 +722,14 @@ def _data_and_metadata(self):
     def reload(self):
         """Reload the raw data from file or URL."""
         if self.filename is not None:
-            with open(self.filename, self._read_flags) as f:
-                self.data = f.read()
+            if self._load_lazily:
+                # The file is read when needed, see the data property, but
+                # must exist now
+                os.stat(self.filename)
+                self.data = None
+            else:
+                with open(self.filename, self._read_flags) as f:
+                    self.data = f.read()
         elif self.url is not None:
             try:
                 # Deferred import
@@ -765,6 +862,9 @@ def display(self):
 
     def update(self):
         display(self, display_id=self._display_id, update=True)
+        if self._progress >= self.total:
+            # Don't hold back the final state
+            _flush_display_updates()
 
     @property
     def progress(self):
@@ -988,11 +1088,16 @@ def _repr_javascript_(self):
 _PNG = b'\x89PNG\r\n\x1a\n'
 _JPEG = b'\xff\xd8'
 
+# The functions reading the size of images take the image data or a binary
+# file, and only read the headers they need.
+
 def _pngxy(data):
     """read the (width, height) from a PNG header"""
-    ihdr = data.index(b'IHDR')
+    # IHDR is the first chunk, right after the 8 bytes signature
+    header = _read_at(data, 0, 64)
+    ihdr = header.index(b'IHDR')
     # next 8 bytes are width/height
-    return struct.unpack('>ii', data[ihdr+4:ihdr+12])
+    return struct.unpack('>ii', header[ihdr+4:ihdr+12])
 
 def _jpegxy(data):
     """read the (width, height) from a JPEG header"""
@@ -1000,9 +1105,9 @@ def _jpegxy(data):
 
     idx = 4
     while True:
-        block_size = struct.unpack('>H', data[idx:idx+2])[0]
+        block_size = struct.unpack('>H', _read_at(data, idx, 2))[0]
         idx = idx + block_size
-        if data[idx:idx+2] == b'\xFF\xC0':
+        if _read_at(data, idx, 2) == b'\xFF\xC0':
             # found Start of Frame
             iSOF = idx
             break
@@ -1010,17 +1115,18 @@ def _jpegxy(data):
             # read another block
             idx += 2
 
-    h, w = struct.unpack('>HH', data[iSOF+5:iSOF+9])
+    h, w = struct.unpack('>HH', _read_at(data, iSOF+5, 4))
     return w, h
 
 def _gifxy(data):
     """read the (width, height) from a GIF header"""
-    return struct.unpack('<HH', data[6:10])
+    return struct.unpack('<HH', _read_at(data, 6, 4))
 
 
 class Image(DisplayObject):
 
     _read_flags = 'rb'
+    _load_lazily = True
     _FMT_JPEG = u'jpeg'
     _FMT_PNG = u'png'
     _FMT_GIF = u'gif'
@@ -1042,15 +1148,17 @@ def __init__(self, data=None, url=None, filename=None, format=None,
 
         Parameters
         ----------
-        data : unicode, str or bytes
+        data : unicode, str, bytes or bytes-like object
             The raw image data or a URL or filename to load the data from.
-            This always results in embedded image data.
+            This always results in embedded image data. Binary data can be a
+            memoryview or an mmap, which are used without being copied.
         url : unicode
             A URL to download the data from. If you specify `url=`,
             the image data will not be embedded unless you also specify `embed=True`.
         filename : unicode
             Path to a local file to load the data from.
-            Images from a file are always embedded.
+            Images from a file are always embedded. The file is read each time
+            the image is displayed, without keeping its content in memory.
         format : unicode
             The format of the image data (png/jpeg/jpg/gif). If a filename or URL is given
             for format will be inferred from the filename extension.
@@ -1118,7 +1226,7 @@ def __init__(self, data=None, url=None, filename=None, format=None,
                     format = self._FMT_GIF
                 else:
                     format = ext.lower()
-            elif isinstance(data, bytes):
+            elif isinstance(data, _BINARY_TYPES):
                 # infer image type from image data header,
                 # only if format has not been specified.
                 if data[:2] == _JPEG:
@@ -1162,14 +1270,19 @@ def _retina_shape(self):
         if not self.embed:
             return
         if self.format == self._FMT_PNG:
-            w, h = _pngxy(self.data)
+            sniff = _pngxy
         elif self.format == self._FMT_JPEG:
-            w, h = _jpegxy(self.data)
+            sniff = _jpegxy
         elif self.format == self._FMT_GIF:
-            w, h = _gifxy(self.data)
+            sniff = _gifxy
         else:
             # retina only supports png
             return
+        if self._data_in_file():
+            with open(self.filename, 'rb') as f:
+                w, h = sniff(f)
+        else:
+            w, h = sniff(self.data)
         self.width = w // 2
         self.height = h // 2
 
@@ -1212,7 +1325,7 @@ def _repr_mimebundle_(self, include=None, exclude=None):
 
     def _data_and_metadata(self, always_both=False):
         """shortcut for returning metadata with shape information, if defined"""
-        b64_data = b2a_base64(self.data).decode('ascii')
+        b64_data = self._b64_data(newline=True)
         md = {}
         if self.metadata:
             md.update(self.metadata)
@@ -1250,7 +1363,7 @@ def __init__(self, data=None, url=None, filename=None, embed=False, mimetype=Non
 
         Parameters
         ----------
-        data : unicode, str or bytes
+        data : unicode, str, bytes or bytes-like object
             The raw video data or a URL or filename to load the data from.
             Raw data will require passing `embed=True`.
         url : unicode
@@ -1258,7 +1371,8 @@ def __init__(self, data=None, url=None, filename=None, embed=False, mimetype=Non
             the image data will not be embedded.
         filename : unicode
             Path to a local file containing the video.
-            Will be interpreted as a local URL unless `embed=True`.
+            Will be interpreted as a local URL unless `embed=True`. Embedded
+            files are read and encoded by chunks when the video is displayed.
         embed : bool
             Should the video be embedded using a data URI (True) or be
             loaded using a <video> tag (False).
@@ -1285,7 +1399,7 @@ def __init__(self, data=None, url=None, filename=None, embed=False, mimetype=Non
         if url is None and isinstance(data, str) and data.startswith(('http:', 'https:')):
             url = data
             data = None
-        elif os.path.exists(data):
+        elif _safe_exists(data):
             filename = data
             data = None
 
@@ -1316,16 +1430,12 @@ def _repr_html_(self):
         if self.filename is not None:
             if not mimetype:
                 mimetype, _ = mimetypes.guess_type(self.filename)
-
-            with open(self.filename, 'rb') as f:
-                video = f.read()
-        else:
-            video = self.data
-        if isinstance(video, str):
+            b64_video = _b64encode(filename=self.filename)
+        elif isinstance(self.data, str):
             # unicode input is already b64-encoded
-            b64_video = video
+            b64_video = self.data
         else:
-            b64_video = b2a_base64(video).decode('ascii').rstrip()
+            b64_video = _b64encode(self.data)
 
         output = """<video controls>
  <source src="data:{0};base64,{1}" type="{0}">
@@ -1347,6 +1457,7 @@ def clear_output(wait=False):
         Wait to clear the output until new output is available to replace it."""
     from IPython.core.interactiveshell import InteractiveShell
     if InteractiveShell.initialized():
+        _flush_display_updates()
         InteractiveShell.instance().display_pub.clear_output(wait)
     else:
         print('\033[2K\r', end='')
@@ -1372,6 +1483,9 @@ def set_matplotlib_formats(*formats, **kwargs):
     ----------
     *formats : strs
         One or more figure formats to enable: 'png', 'retina', 'jpeg', 'svg', 'pdf'.
+    parallel : bool or int, optional
+        Render the formats of each figure concurrently, in worker processes.
+        An int gives the number of processes.
     **kwargs :
         Keyword args will be relayed to ``figure.canvas.print_figure``.
     """
@@ -13,9 +13,11 @@
 import tokenize
 
 from traitlets.config.configurable import Configurable
-from traitlets import Instance, Float
+from traitlets import Instance, Float, Integer, Bool, List, Unicode
 from warnings import warn
 
+from IPython.core.outputcache import OutputCache, estimate_size
+
 # TODO: Move the various attributes (cache_size, [others now moved]). Some
 # of these are also attributes of InteractiveShell. They should be on ONE object
 # only and the other objects should ask that one object for their values.
@@ -33,6 +35,25 @@ class DisplayHook(Configurable):
                            allow_none=True)
     cull_fraction = Float(0.2)
 
+    cache_max_bytes = Integer(0,
+        help="""Maximum estimated memory, in bytes, used by the results kept
+        in the output cache (Out, _oh and _N). Past it, the least recently
+        used results are removed from the cache, or saved to disk if
+        cache_spill is set. 0 means no limit."""
+    ).tag(config=True)
+    cache_spill = Bool(False,
+        help="""Save the results removed from the output cache because of
+        cache_max_bytes to a temporary directory, if they can be pickled.
+        Out[n] loads them back from there. Results which can't be pickled
+        are discarded."""
+    ).tag(config=True)
+
+    accepted_mimetypes = List(Unicode(), default_value=None, allow_none=True,
+        help="""The MIME types used by this display hook. Only these are
+        computed when formatting results; the format dict computes the
+        other ones when they are looked up. None computes all of them."""
+    ).tag(config=True)
+
     def __init__(self, shell=None, cache_size=1000, **kwargs):
         super(DisplayHook, self).__init__(shell=shell, **kwargs)
         cache_size_min = 3
@@ -146,9 +167,14 @@ def compute_format_data(self, result):
             MIME type representation of the object.
             md_dict is a :class:`dict` with the same MIME type keys
             of metadata associated with each output.
+
+            If :attr:`accepted_mimetypes` is set, format_dict is a
+            :class:`~IPython.core.formatters.LazyFormatDict` holding only
+            these MIME types to start with.
             
         """
-        return self.shell.display_formatter.format(result)
+        return self.shell.display_formatter.format(
+            result, accept=self.accepted_mimetypes)
 
     # This can be set to True by the write_output_prompt method in a subclass
     prompt_end_newline = False
@@ -223,7 +249,12 @@ def update_user_ns(self, result):
                 new_result = '_%s' % self.prompt_count
                 to_main[new_result] = result
                 self.shell.push(to_main, interactive=False)
-                self.shell.user_ns['_oh'][self.prompt_count] = result
+                oh = self.shell.user_ns['_oh']
+                oh[self.prompt_count] = result
+                if self.cache_max_bytes and isinstance(oh, OutputCache):
+                    oh.record_size(self.prompt_count, estimate_size(result))
+                    if oh.memory_size > self.cache_max_bytes:
+                        self.cull_cache_bytes()
 
     def fill_exec_result(self, result):
         if self.exec_result is not None:
@@ -274,8 +305,20 @@ def cull_cache(self):
             if i >= cull_count:
                 break
             self.shell.user_ns.pop('_%i' % n, None)
-            oh.pop(n, None)
-        
+            del oh[n]
+
+    def cull_cache_bytes(self):
+        """Outputs use too much memory, evict the least recently used ones
+
+        The most recent output is always kept.
+        """
+        oh = self.shell.user_ns['_oh']
+        for n in oh.least_recently_used()[:-1]:
+            if oh.memory_size <= self.cache_max_bytes:
+                break
+            self.shell.user_ns.pop('_%i' % n, None)
+            if not (self.cache_spill and oh.spill(n)):
+                del oh[n]
 
     def flush(self):
         if not self.do_full_cache:
@@ -16,10 +16,12 @@
 # Distributed under the terms of the Modified BSD License.
 
 
+from collections import OrderedDict
 import sys
+import time
 
 from traitlets.config.configurable import Configurable
-from traitlets import List
+from traitlets import Float, List, Unicode
 
 # This used to be defined here - it is imported for backwards compatibility
 from .display import publish_display_data
@@ -35,6 +37,29 @@ class DisplayPublisher(Configurable):
     be accessed there.
     """
 
+    accepted_mimetypes = List(Unicode(), default_value=None, allow_none=True,
+        help="""The MIME types used by this publisher. :func:`display` only
+        computes these, and publishes a format dict computing the other ones
+        when they are looked up. None computes all of them."""
+    ).tag(config=True)
+
+    update_interval = Float(0,
+        help="""Minimum time, in seconds, between two published updates of
+        the same display_id. More frequent updates are coalesced: only the
+        latest one is published, with the next update or message published
+        after the interval has passed, or when the cell finishes running.
+        A held update is not published on its own while the cell keeps
+        running, so a display can lag behind until then.
+        0, the default, publishes every update."""
+    ).tag(config=True)
+
+    def __init__(self, **kwargs):
+        super(DisplayPublisher, self).__init__(**kwargs)
+        # display_id -> publish() arguments of the latest update held back
+        self._pending_updates = OrderedDict()
+        # display_id -> time its last update was published
+        self._update_times = {}
+
     def _validate_data(self, data, metadata=None):
         """Validate the display data.
 
@@ -81,6 +106,8 @@ def publish(self, data, metadata=None, source=None, *, transient=None, update=Fa
             which can be displayed by all frontends. If more than the plain
             text is given, it is up to the frontend to decide which
             representation to use.
+            When :attr:`accepted_mimetypes` is set, this is usually a
+            :class:`~IPython.core.formatters.LazyFormatDict`.
         metadata : dict
             A dictionary for metadata related to the data. This can contain
             arbitrary key, value pairs that frontends can use to interpret
@@ -102,6 +129,52 @@ def publish(self, data, metadata=None, source=None, *, transient=None, update=Fa
         if 'text/plain' in data:
             print(data['text/plain'])
 
+    def publish_coalesced(self, data, metadata=None, **kwargs):
+        """Publish data like :meth:`publish`, coalescing frequent updates.
+
+        An update (``update=True``) of a display_id coming less than
+        :attr:`update_interval` seconds after the previous one is held back,
+        and replaced by the next update of the same display_id. Held updates
+        are published before any other message, and by :meth:`flush_updates`
+        when the cell finishes running, so the last state of each display
+        always reaches the frontend. Nothing is held back with the default
+        :attr:`update_interval` of 0.
+        """
+        transient = kwargs.get('transient') or {}
+        display_id = transient.get('display_id')
+        if (kwargs.get('update') and display_id is not None
+                and self.update_interval > 0):
+            now = time.monotonic()
+            last = self._update_times.get(display_id)
+            if last is not None and now - last < self.update_interval:
+                self._pending_updates[display_id] = (data, metadata, kwargs)
+                return
+            # Superseded by this one
+            self._pending_updates.pop(display_id, None)
+            self._update_times[display_id] = now
+        self._publish_pending()
+        self.publish(data=data, metadata=metadata, **kwargs)
+
+    def _publish_pending(self):
+        """Publish the updates held back by :meth:`publish_coalesced`."""
+        if not self._pending_updates:
+            return
+        now = time.monotonic()
+        while self._pending_updates:
+            display_id, (data, metadata, kwargs) = \
+                self._pending_updates.popitem(last=False)
+            self._update_times[display_id] = now
+            self.publish(data=data, metadata=metadata, **kwargs)
+
+    def flush_updates(self):
+        """Publish the updates held back, and forget when the previous
+        updates were published.
+
+        The shell calls this when a cell finishes running.
+        """
+        self._publish_pending()
+        self._update_times.clear()
+
     def clear_output(self, wait=False):
         """Clear the output of the cell receiving output."""
         print('\033[2K\r', end='')
@@ -15,6 +15,7 @@
 import sys
 import traceback
 import warnings
+import weakref
 from io import StringIO
 
 from decorator import decorator
@@ -23,9 +24,10 @@
 from IPython.core.getipython import get_ipython
 from IPython.utils.sentinel import Sentinel
 from IPython.utils.dir2 import get_real_method
+from IPython.utils.jsonclean import json_clean
 from IPython.lib import pretty
 from traitlets import (
-    Bool, Dict, Integer, Unicode, CUnicode, ObjectName, List,
+    Bool, Dict, Float, Integer, Unicode, CUnicode, ObjectName, List,
     ForwardDeclaredInstance,
     default, observe,
 )
@@ -86,7 +88,7 @@ def _formatters_default(self):
             d[f.format_type] = f
         return d
 
-    def format(self, obj, include=None, exclude=None):
+    def format(self, obj, include=None, exclude=None, accept=None):
         """Return a format data dict for an object.
 
         By default all format types will be computed.
@@ -117,6 +119,11 @@ def format(self, obj, include=None, exclude=None):
             data dict. If this is set all format types will be computed,
             except for those included in this argument.
             Mimetypes present in exclude will take precedence over the ones in include
+        accept : list, tuple or set; optional
+            The format types the frontend will use. If this is set, only these
+            format types are computed straight away, and format_dict is a
+            :class:`LazyFormatDict`, computing the other ones when they are
+            looked up.
 
         Returns
         -------
@@ -140,13 +147,20 @@ def format(self, obj, include=None, exclude=None):
             not be called.
 
         """
-        format_dict = {}
-        md_dict = {}
-        
         if self.ipython_display_formatter(obj):
             # object handled itself, don't proceed
             return {}, {}
 
+        if accept is None:
+            return self._compute_formats(obj, include, exclude)
+
+        format_dict = LazyFormatDict(self, obj, include, exclude)
+        format_dict.compute(accept)
+        return format_dict, format_dict.metadata
+
+    def _compute_formats(self, obj, include=None, exclude=None):
+        """Compute the format data, without giving the object a chance to
+        display itself with _ipython_display_."""
         format_dict, md_dict = self.mimebundle_formatter(obj, include=include, exclude=exclude)
 
         if format_dict or md_dict:
@@ -198,6 +212,77 @@ def format_types(self):
         return list(self.formatters.keys())
 
 
+class LazyFormatDict(dict):
+    """A format data dict computing the format types it lacks on demand.
+
+    :meth:`DisplayFormatter.format` returns one when it is told which format
+    types the frontend accepts, and computes only those. Looking up another
+    format type with ``format_dict[key]`` computes it, or raises KeyError if
+    the object has no representation in that format. Membership tests,
+    iteration and ``get()`` only see the format types computed so far:
+    :meth:`compute_all` completes the dict.
+
+    The metadata of the format types computed later is added to
+    :attr:`metadata`, the metadata dict returned along with this dict.
+    """
+
+    def __init__(self, formatter, obj, include=None, exclude=None):
+        super(LazyFormatDict, self).__init__()
+        self.metadata = {}
+        self._formatter = formatter
+        self._obj = obj
+        self._include = include
+        self._exclude = exclude
+        # Format types computed already, whether or not they gave any data
+        self._computed = set()
+        self.complete = False
+
+    def _wanted(self, format_type):
+        if format_type in self._computed:
+            return False
+        if self._include and format_type not in self._include:
+            return False
+        if self._exclude and format_type in self._exclude:
+            return False
+        return True
+
+    def _add(self, format_dict, md_dict):
+        for key, value in format_dict.items():
+            self.setdefault(key, value)
+        for key, value in md_dict.items():
+            self.metadata.setdefault(key, value)
+
+    def compute(self, format_types):
+        """Compute the given format types, unless already done."""
+        if self.complete:
+            return
+        format_types = [t for t in format_types if self._wanted(t)]
+        if not format_types:
+            return
+        self._computed.update(format_types)
+        self._add(*self._formatter._compute_formats(
+            self._obj, include=format_types, exclude=self._exclude))
+
+    def compute_all(self):
+        """Compute all the format types not computed yet, and return self."""
+        if not self.complete:
+            exclude = set(self._computed)
+            if self._exclude:
+                exclude.update(self._exclude)
+            self._add(*self._formatter._compute_formats(
+                self._obj, include=self._include, exclude=exclude))
+            self.complete = True
+            # Nothing else can be computed: let go of the object.
+            self._obj = None
+        return self
+
+    def __missing__(self, key):
+        self.compute([key])
+        if key not in self:
+            raise KeyError(key)
+        return dict.__getitem__(self, key)
+
+
 #-----------------------------------------------------------------------------
 # Formatters for specific format types (text, html, svg, etc.)
 #-----------------------------------------------------------------------------
@@ -327,7 +412,19 @@ class BaseFormatter(Configurable):
     # The deferred-import type-specific printers.
     # Map (modulename, classname) pairs to the format functions.
     deferred_printers = Dict().tag(config=True)
-    
+
+    def __init__(self, **kwargs):
+        # Cache of lookup_by_type: maps types to the class of their mro
+        # registered in type_printers, or to None if there is none. It is
+        # cleared when the registries change.
+        self._dispatch_cache = weakref.WeakKeyDictionary()
+        self._dispatch_state = None
+        super(BaseFormatter, self).__init__(**kwargs)
+
+    @observe('type_printers', 'deferred_printers')
+    def _printers_changed(self, change):
+        self._dispatch_state = None
+
     @catch_format_error
     def __call__(self, obj):
         """Compute the format for an object."""
@@ -421,13 +518,54 @@ def lookup_by_type(self, typ):
             else:
                 return self.deferred_printers[typ_key]
         else:
-            for cls in pretty._get_mro(typ):
-                if cls in self.type_printers or self._in_deferred_types(cls):
+            cls = self._dispatch(typ)
+            if cls is not None:
+                try:
                     return self.type_printers[cls]
+                except KeyError:
+                    # Replaced in type_printers since it was cached
+                    self._dispatch_state = None
+                    cls = self._dispatch(typ)
+                    if cls is not None:
+                        return self.type_printers[cls]
         
         # If we have reached here, the lookup failed.
         raise KeyError("No registered printer for {0!r}".format(typ))
 
+    def _dispatch(self, typ):
+        """Find the class of the mro of typ registered in type_printers.
+
+        Returns None if there is none. Results are cached until a printer is
+        added or removed.
+        """
+        type_printers = self.type_printers
+        deferred_printers = self.deferred_printers
+        # Catch the registries being modified directly, as well as through
+        # for_type() and pop()
+        state = (len(type_printers), len(deferred_printers))
+        cache = self._dispatch_cache
+        if state != self._dispatch_state:
+            cache.clear()
+            self._dispatch_state = state
+        try:
+            return cache[typ]
+        except KeyError:
+            pass
+        except TypeError:
+            # Not a type which can be weakly referenced
+            cache = None
+
+        found = None
+        for cls in pretty._get_mro(typ):
+            if cls in type_printers or self._in_deferred_types(cls):
+                found = cls
+                break
+        if cache is not None:
+            cache[typ] = found
+            # _in_deferred_types may have moved a printer to type_printers
+            self._dispatch_state = (len(type_printers), len(deferred_printers))
+        return found
+
     def for_type(self, typ, func=None):
         """Add a format function for a given type.
         
@@ -464,6 +602,7 @@ def for_type(self, typ, func=None):
         
         if func is not None:
             self.type_printers[typ] = func
+            self._dispatch_state = None
         
         return oldfunc
 
@@ -504,6 +643,7 @@ def for_type_by_name(self, type_module, type_name, func=None):
         
         if func is not None:
             self.deferred_printers[key] = func
+            self._dispatch_state = None
         return oldfunc
     
     def pop(self, typ, default=_raise_key_error):
@@ -545,6 +685,7 @@ def pop(self, typ, default=_raise_key_error):
                 old = self.deferred_printers.pop(_mod_name_key(typ), default)
         if old is _raise_key_error:
             raise KeyError("No registered value for {0!r}".format(typ))
+        self._dispatch_state = None
         return old
 
     def _in_deferred_types(self, cls):
@@ -601,6 +742,31 @@ def dtype_pprinter(obj, p, cycle):
         Set to 0 to disable truncation.
         """
     ).tag(config=True)
+
+    max_output_size = Integer(10**7,
+        help="""Stop pretty printing after this many characters, so that
+        printing huge objects doesn't hang the frontend. The output then ends
+        with a note saying it was truncated.
+
+        Set to 0 to disable the limit.
+        """
+    ).tag(config=True)
+
+    max_depth = Integer(0,
+        help="""Elide the contents of collections (lists, dicts, tuples, sets)
+        nested deeper than this, like cyclic references: [...]
+
+        Set to 0 to disable the limit.
+        """
+    ).tag(config=True)
+
+    max_time = Float(0,
+        help="""Stop pretty printing after this many seconds. The output then
+        ends with a note saying it was truncated.
+
+        Set to 0 to disable the limit.
+        """
+    ).tag(config=True)
     
     # Look for a _repr_pretty_ methods to use for pretty printing.
     print_method = ObjectName('_repr_pretty_')
@@ -696,6 +862,9 @@ def __call__(self, obj):
             printer = pretty.RepresentationPrinter(stream, self.verbose,
                 self.max_width, self.newline,
                 max_seq_length=self.max_seq_length,
+                max_output_size=self.max_output_size,
+                max_depth=self.max_depth,
+                max_time=self.max_time,
                 singleton_pprinters=self.singleton_printers,
                 type_pprinters=self.type_printers,
                 deferred_pprinters=self.deferred_printers)
@@ -838,7 +1007,17 @@ def _check_return(self, r, obj):
             warnings.warn("JSON expects JSONable list/dict containers, not JSON strings",
             FormatterWarning)
             r = json.loads(r)
-        
+
+        if isinstance(r, self._return_type):
+            # Convert NumPy data, tuples, etc. so that the data can be sent
+            try:
+                r = json_clean(r)
+            except ValueError as e:
+                warnings.warn("%s formatter returned data which can't be "
+                    "encoded in JSON (%s) for object: %s"
+                    % (self.format_type, e, _safe_repr(obj)), FormatterWarning)
+                return
+
         if md is not None:
             # put the tuple back together
             r = (r, md)
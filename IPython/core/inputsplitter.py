@@ -137,45 +137,87 @@ def partial_tokens(s):
 
 def find_next_indent(code):
     """Find the number of spaces for the next line of indentation"""
-    tokens = list(partial_tokens(code))
+    return _find_next_indent(code)[0]
+
+# Token types which can't begin a top-level statement
+_non_statement_tokens = {tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT,
+                         tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER,
+                         tokenize.ERRORTOKEN, INCOMPLETE_STRING,
+                         IN_MULTILINE_STATEMENT}
+
+def _find_next_indent(code, resume=(0, (0,))):
+    """Implementation of :func:`find_next_indent` which can resume a scan.
+
+    Returns the indentation, and a ``(offset, prev_indents)`` resume point: the
+    start of the last top-level statement in *code*, with the indentation seen
+    before it. Nothing before that point depends on what follows it, so the
+    resume point can be passed back when scanning code that extends *code*,
+    and only the code from there onwards is tokenized again.
+    """
+    start, prev_indents = resume
+    tokens = list(partial_tokens(code[start:]))
     if tokens[-1].type == tokenize.ENDMARKER:
         tokens.pop()
     if not tokens:
-        return 0
+        return 0, resume
     while (tokens[-1].type in {tokenize.DEDENT, tokenize.NEWLINE, tokenize.COMMENT}):
         tokens.pop()
 
     if tokens[-1].type == INCOMPLETE_STRING:
         # Inside a multiline string
-        return 0
+        return 0, resume
 
     # Find the indents used before
-    prev_indents = [0]
+    prev_indents = list(prev_indents)
     def _add_indent(n):
         if n != prev_indents[-1]:
             prev_indents.append(n)
 
+    # Offsets of the lines in code, to turn token positions into resume points
+    line_starts = [None, start]
+    line_starts.extend(m.end() + start for m in re.finditer('\n', code[start:]))
+    at_line_start = True
+    # The tokenizer's bracket depth. Unbalanced brackets or error tokens leave
+    # it in a state we can't restart from, so stop looking for resume points.
+    depth = 0
+
     tokiter = iter(tokens)
     for tok in tokiter:
         if tok.type in {tokenize.INDENT, tokenize.DEDENT}:
             _add_indent(tok.end[1])
         elif (tok.type == tokenize.NL):
             try:
-                _add_indent(next(tokiter).start[1])
+                tok = next(tokiter)
             except StopIteration:
                 break
+            _add_indent(tok.start[1])
+
+        if depth < 0:
+            continue
+        if tok.type == tokenize.NEWLINE:
+            at_line_start = True
+        elif tok.type == tokenize.ERRORTOKEN:
+            depth = -1
+        elif tok.type not in _non_statement_tokens:
+            if at_line_start and depth == 0 and tok.start[1] == 0:
+                resume = line_starts[tok.start[0]], tuple(prev_indents)
+            at_line_start = False
+            if tok.exact_type in {tokenize.LPAR, tokenize.LSQB, tokenize.LBRACE}:
+                depth += 1
+            elif tok.exact_type in {tokenize.RPAR, tokenize.RSQB, tokenize.RBRACE}:
+                depth -= 1
 
     last_indent = prev_indents.pop()
 
     # If we've just opened a multiline statement (e.g. 'a = ['), indent more
     if tokens[-1].type == IN_MULTILINE_STATEMENT:
         if tokens[-2].exact_type in {tokenize.LPAR, tokenize.LSQB, tokenize.LBRACE}:
-            return last_indent + 4
-        return last_indent
+            return last_indent + 4, resume
+        return last_indent, resume
 
     if tokens[-1].exact_type == tokenize.COLON:
         # Line ends with colon - indent
-        return last_indent + 4
+        return last_indent + 4, resume
 
     if last_indent:
         # Examine the last line for dedent cues - statements like return or
@@ -191,9 +233,9 @@ def _add_indent(n):
             # Find the most recent indentation less than the current level
             for indent in reversed(prev_indents):
                 if indent < last_indent:
-                    return indent
+                    return indent, resume
 
-    return last_indent
+    return last_indent, resume
 
 
 def last_blank(src):
@@ -297,6 +339,9 @@ class InputSplitter(object):
     # current indentation. Otherwise, the cache is invalid and the indentation
     # must be recalculated.
     _indent_spaces_cache = None, None
+    # Where to resume scanning for the indentation when more source is pushed:
+    # the code last scanned and the resume point returned by _find_next_indent
+    _indent_resume = '', (0, (0,))
     # String, indicating the default input encoding.  It is computed by default
     # at initialization time via get_input_encoding(), but it can be reset by a
     # client with specific knowledge of the encoding.
@@ -495,8 +540,13 @@ def get_indent_spaces(self):
             return n
 
         # self.source always has a trailing newline
-        n = find_next_indent(self.source[:-1])
+        code = self.source[:-1]
+        resume_code, resume = self._indent_resume
+        if not code.startswith(resume_code):
+            resume = 0, (0,)
+        n, resume = _find_next_indent(code, resume)
         self._indent_spaces_cache = (self.source, n)
+        self._indent_resume = code, resume
         return n
 
     # Backwards compatibility. I think all code that used .indent_spaces was
@@ -764,3 +814,109 @@ def _accumulating(dbg):
         self.transformer_accumulating = False
         return line
 
+
+
+class IncrementalCompleteChecker(object):
+    """Answer :meth:`InputSplitter.check_complete` queries incrementally.
+
+    A terminal frontend asks whether its buffer is complete every time the
+    user presses Enter, and the text it asks about almost always extends, or
+    is a prefix of, the text it asked about the previous time.
+    :meth:`InputSplitter.check_complete` resets the splitter and pushes the
+    whole cell through the transformers again on each query, so editing a long
+    cell gets slower with every line.
+
+    This keeps the splitter state left by the previous query and pushes only
+    the lines that follow the ones it has already seen. The result is
+    remembered for each number of lines checked, so asking again about an
+    earlier prefix of the same lines costs nothing. Only when a line that was
+    already checked has been edited is the splitter reset and the cell pushed
+    again from its first line. Cells ending with a blank line are always
+    checked from scratch.
+
+    The splitter may be shared with other code (e.g. the shell's
+    ``input_splitter``); if anything else pushes to or resets it between two
+    queries, this is detected and the next query starts from scratch.
+
+    Parameters
+    ----------
+    splitter : InputSplitter
+      The splitter used to evaluate the input.
+    """
+
+    def __init__(self, splitter):
+        self.splitter = splitter
+        self.reset()
+
+    def reset(self):
+        """Forget all cached state."""
+        # Lines currently pushed into the splitter, with their line endings
+        self._lines = []
+        # Number of lines -> (status, indent_spaces) for the prefixes checked
+        self._results = {}
+        # Raw splitter source right after our last push, to detect other users
+        self._source_raw = None
+
+    def check_complete(self, source):
+        """Return whether a block of code is ready to execute, or should be continued
+
+        Same interface as :meth:`InputSplitter.check_complete`, but the
+        splitter is not reset afterwards.
+        """
+        splitter = self.splitter
+        if not source.endswith('\n'):
+            # push() terminates the last line anyway.
+            source += '\n'
+        lines = source.splitlines(True)
+
+        if not lines[-1].strip():
+            # IPythonInputSplitter.push() drops a trailing blank line pushed
+            # along with other lines, so pushing such a cell in pieces would
+            # not give the same answer. This is usually the last Enter before
+            # the cell runs, so just check it from scratch.
+            self.reset()
+            return splitter.check_complete(source)
+
+        if self._raw_source() != self._source_raw:
+            self.reset()
+
+        old_lines = self._lines
+        common = 0
+        for old, new in zip(old_lines, lines):
+            if old != new:
+                break
+            common += 1
+
+        if common == len(lines) and common in self._results:
+            return self._results[common]
+
+        if common < len(old_lines) or not old_lines:
+            # An already checked line was edited: start again from the top.
+            self.reset()
+            splitter.reset()
+            common = 0
+
+        try:
+            splitter.push(''.join(lines[common:]))
+        except SyntaxError:
+            # Transformers in IPythonInputSplitter can raise SyntaxError,
+            # which push() will not catch.
+            splitter.reset()
+            self.reset()
+            return 'invalid', None
+
+        if splitter._is_invalid:
+            result = 'invalid', None
+        elif splitter.push_accepts_more():
+            result = 'incomplete', splitter.get_indent_spaces()
+        else:
+            result = 'complete', None
+
+        self._lines = lines
+        self._results[len(lines)] = result
+        self._source_raw = self._raw_source()
+        return result
+
+    def _raw_source(self):
+        # A plain InputSplitter doesn't transform, so its source is the raw one
+        return getattr(self.splitter, 'source_raw', self.splitter.source)
@@ -173,6 +173,15 @@ class DummyMod(object):
     pass
 
 
+def _transformer_name(transformer):
+    """Name an input transformer by the function doing its work."""
+    func = getattr(transformer, 'func', getattr(transformer, 'coro', None))
+    if func is None:
+        func = type(transformer)
+    return '%s.%s' % (getattr(func, '__module__', ''),
+                      getattr(func, '__qualname__', type(func).__qualname__))
+
+
 class ExecutionInfo(object):
     """The arguments used for a call to :meth:`InteractiveShell.run_cell`
 
@@ -428,10 +437,19 @@ def _prompt_trait_changed(self, change):
     separate_out = SeparateUnicode('').tag(config=True)
     separate_out2 = SeparateUnicode('').tag(config=True)
     wildcards_case_sensitive = Bool(True).tag(config=True)
-    xmode = CaselessStrEnum(('Context','Plain', 'Verbose'),
+    xmode = CaselessStrEnum(('Context','Plain', 'Verbose', 'Collapsed',
+                             'Minimal'),
                             default_value='Context',
                             help="Switch modes for the IPython exception handlers."
                             ).tag(config=True)
+    show_silent_tracebacks = Bool(True, help=
+        """
+        Show the tracebacks of the exceptions raised by code run silently
+        (``run_cell(..., silent=True)``). If False, they aren't formatted at
+        all; the exception is still stored for %debug and in the result of
+        run_cell.
+        """
+    ).tag(config=True)
 
     # Subcomponents of InteractiveShell
     alias_manager = Instance('IPython.core.alias.AliasManager', allow_none=True)
@@ -624,6 +642,36 @@ def refresh_style(self):
         # No-op here, used in subclass
         pass
 
+    def set_colors(self, scheme):
+        """Switch the color scheme of prompts, info system and exception
+        handlers. This is what %colors does."""
+        def color_switch_err(name):
+            warn('Error changing %s color schemes.\n%s' %
+                 (name, sys.exc_info()[1]), stacklevel=3)
+
+        # Set shell colour scheme
+        try:
+            self.colors = scheme
+            self.refresh_style()
+        except:
+            color_switch_err('shell')
+
+        # Set exception colors
+        try:
+            self.InteractiveTB.set_colors(scheme=scheme)
+            self.SyntaxTB.set_colors(scheme=scheme)
+        except:
+            color_switch_err('exception')
+
+        # Set info (for 'object?') colors
+        if self.color_info:
+            try:
+                self.inspector.set_active_scheme(scheme)
+            except:
+                color_switch_err('object inspector')
+        else:
+            self.inspector.set_active_scheme('NoColor')
+
     def init_pushd_popd_magic(self):
         # for pushd/popd management
         self.home_dir = get_home_dir()
@@ -891,6 +939,7 @@ def init_events(self):
         self.events = EventManager(self, available_events)
 
         self.events.register("pre_execute", self._clear_warning_registry)
+        self.events.register("post_execute", self._flush_display_updates)
 
     def register_post_execute(self, func):
         """DEPRECATED: Use ip.events.register('post_run_cell', func)
@@ -901,6 +950,12 @@ def register_post_execute(self, func):
              "ip.events.register('post_run_cell', func) instead.", stacklevel=2)
         self.events.register('post_run_cell', func)
     
+    def _flush_display_updates(self):
+        # publish the last state of the displays updated during the cell
+        flush_updates = getattr(self.display_pub, 'flush_updates', None)
+        if flush_updates is not None:
+            flush_updates()
+
     def _clear_warning_registry(self):
         # clear the warning registry, so that different code blocks with
         # overlapping line number ranges don't cause spurious suppression of
@@ -1627,13 +1682,23 @@ def init_history(self):
 
     debugger_cls = Pdb
 
+    debugger_fast_tracing = Bool(False, help=
+        """
+        Start the debuggers (%debug, %run -d and set_trace()) in fast
+        tracing mode, which only traces the functions having
+        breakpoints or being stepped through, and doesn't step into the
+        standard library and installed packages.
+        """
+    ).tag(config=True)
+
     def init_traceback_handlers(self, custom_exceptions):
         # Syntax error handler.
         self.SyntaxTB = ultratb.SyntaxTB(color_scheme='NoColor', parent=self)
 
         # The interactive one is initialized with an offset, meaning we always
         # want to remove the topmost item in the traceback, which is our own
-        # internal code. Valid modes: ['Plain','Context','Verbose']
+        # internal code. Valid modes: ['Plain','Context','Verbose','Collapsed',
+        # 'Minimal']
         self.InteractiveTB = ultratb.AutoFormattedTB(mode = 'Plain',
                                                      color_scheme='NoColor',
                                                      tb_offset = 1,
@@ -2063,11 +2128,13 @@ def init_magics(self):
         # Expose as public API from the magics manager
         self.register_magics = self.magics_manager.register
 
-        self.register_magics(m.AutoMagics, m.BasicMagics, m.CodeMagics,
-            m.ConfigMagics, m.DisplayMagics, m.ExecutionMagics,
-            m.ExtensionMagics, m.HistoryMagics, m.LoggingMagics,
-            m.NamespaceMagics, m.OSMagics, m.PylabMagics, m.ScriptMagics,
-        )
+        # The builtin magics are only imported and instantiated when first
+        # used, which saves a good part of the startup time.
+        for class_name, line, cell in m.lazy_magics:
+            self.magics_manager.register_lazy(class_name, line, cell)
+        if 'script_magics' in self.config.get('ScriptMagics', {}):
+            # The names of the script magics come from the config
+            self.magics_manager.load_lazy('ScriptMagics')
 
         # Register Magic Aliases
         mman = self.magics_manager
@@ -2083,7 +2150,8 @@ def init_magics(self):
         # FIXME: Move the color initialization to the DisplayHook, which
         # should be split into a prompt manager and displayhook. We probably
         # even need a centralize colors management object.
-        self.run_line_magic('colors', self.colors)
+        # Not through %colors, which would load BasicMagics.
+        self.set_colors(self.colors)
     
     # Defined here so that it's included in the documentation
     @functools.wraps(magic.MagicsManager.register_function)
@@ -2171,19 +2239,19 @@ def find_line_magic(self, magic_name):
         """Find and return a line magic by name.
 
         Returns None if the magic isn't found."""
-        return self.magics_manager.magics['line'].get(magic_name)
+        return self.magics_manager.find_magic(magic_name, 'line')
 
     def find_cell_magic(self, magic_name):
         """Find and return a cell magic by name.
 
         Returns None if the magic isn't found."""
-        return self.magics_manager.magics['cell'].get(magic_name)
+        return self.magics_manager.find_magic(magic_name, 'cell')
 
     def find_magic(self, magic_name, magic_kind='line'):
         """Find and return a magic of the given type by name.
 
         Returns None if the magic isn't found."""
-        return self.magics_manager.magics[magic_kind].get(magic_name)
+        return self.magics_manager.find_magic(magic_name, magic_kind)
 
     def magic(self, arg_s):
         """DEPRECATED. Use run_line_magic() instead.
@@ -2478,7 +2546,8 @@ def ev(self, expr):
         with self.builtin_trap:
             return eval(expr, self.user_global_ns, self.user_ns)
 
-    def safe_execfile(self, fname, *where, exit_ignore=False, raise_exceptions=False, shell_futures=False):
+    def safe_execfile(self, fname, *where, exit_ignore=False, raise_exceptions=False, shell_futures=False,
+                      cache=None):
         """A safe version of the builtin execfile().
 
         This version will never throw an exception, but instead print
@@ -2502,6 +2571,9 @@ def safe_execfile(self, fname, *where, exit_ignore=False, raise_exceptions=False
             shell. It will both be affected by previous __future__ imports, and
             any __future__ imports in the code will affect the shell. If False,
             __future__ imports are not shared in either direction.
+        cache : :class:`~IPython.core.compilerop.BytecodeCache`, optional
+            Cache to reuse the code compiled from the file by earlier calls.
+            It isn't used when shell_futures is True.
 
         """
         fname = os.path.abspath(os.path.expanduser(fname))
@@ -2522,9 +2594,13 @@ def safe_execfile(self, fname, *where, exit_ignore=False, raise_exceptions=False
         with prepended_to_syspath(dname), self.builtin_trap:
             try:
                 glob, loc = (where + (None, ))[:2]
-                py3compat.execfile(
-                    fname, glob, loc,
-                    self.compile if shell_futures else None)
+                if shell_futures:
+                    compiler = self.compile
+                elif cache is not None:
+                    compiler = cache.compile
+                else:
+                    compiler = None
+                py3compat.execfile(fname, glob, loc, compiler)
             except SystemExit as status:
                 # If the call was made with 0 or None exit status (sys.exit(0)
                 # or sys.exit() ), don't bother showing a traceback, as both of
@@ -2546,7 +2622,8 @@ def safe_execfile(self, fname, *where, exit_ignore=False, raise_exceptions=False
                 # tb offset is 2 because we wrap execfile
                 self.showtraceback(tb_offset=2)
 
-    def safe_execfile_ipy(self, fname, shell_futures=False, raise_exceptions=False):
+    def safe_execfile_ipy(self, fname, shell_futures=False, raise_exceptions=False,
+                          cache=None):
         """Like safe_execfile, but for .ipy or .ipynb files with IPython syntax.
 
         Parameters
@@ -2561,6 +2638,10 @@ def safe_execfile_ipy(self, fname, shell_futures=False, raise_exceptions=False):
             __future__ imports are not shared in either direction.
         raise_exceptions : bool (False)
             If True raise exceptions everywhere.  Meant for testing.
+        cache : :class:`~IPython.core.compilerop.BytecodeCache`, optional
+            Cache to reuse the code transformed and compiled from a .ipy file
+            by earlier calls, instead of running it as a cell. It isn't used
+            when shell_futures is True.
         """
         fname = os.path.abspath(os.path.expanduser(fname))
 
@@ -2593,6 +2674,16 @@ def get_cells():
 
         with prepended_to_syspath(dname):
             try:
+                if (cache is not None and not shell_futures
+                        and not fname.endswith('.ipynb')):
+                    with open(fname) as f:
+                        source = f.read()
+                    code = self._compile_ipy_file(fname, source, cache)
+                    if code is not None:
+                        result = self._run_compiled_file(code, source)
+                        if raise_exceptions:
+                            result.raise_error()
+                        return
                 for cell in get_cells():
                     result = self.run_cell(cell, silent=True, shell_futures=shell_futures)
                     if raise_exceptions:
@@ -2605,6 +2696,49 @@ def get_cells():
                 self.showtraceback()
                 warn('Unknown failure executing file: <%s>' % fname)
 
+    def _compile_ipy_file(self, fname, source, cache):
+        """Transform and compile the source of a whole .ipy file, using cache.
+
+        Returns None if the file can't be run this way: it is transformed to a
+        single line, which run_cell would also prefilter, it has errors to
+        report, or there are AST transformers to apply.
+        """
+        if self.ast_transformers:
+            return None
+        if len(source.splitlines()) < 2:
+            return None
+        # The result of the transformation depends on the transformers in use
+        context = ' '.join(_transformer_name(t) for t in
+                           self.input_transformer_manager.transforms)
+        code = cache.get(fname, source, context)
+        if code is None:
+            try:
+                cell = self.input_transformer_manager.transform_cell(source)
+            except Exception:
+                return None
+            # Like run_cell, which prefilters the cells transformed to a
+            # single line, e.g. with trailing blank lines
+            if len(cell.splitlines()) < 2:
+                return None
+            try:
+                code = compile(cell, fname, 'exec', dont_inherit=True)
+            except Exception:
+                return None
+            cache.store(fname, source, code, context)
+        return code
+
+    def _run_compiled_file(self, code, source):
+        """Run code compiled by _compile_ipy_file, like a silent cell."""
+        result = ExecutionResult(ExecutionInfo(source, False, True, False))
+        self.events.trigger('pre_execute')
+        try:
+            with self.builtin_trap, self.display_trap:
+                self.last_execution_succeeded = not self.run_code(code, result)
+                self.last_execution_result = result
+        finally:
+            self.events.trigger('post_execute')
+        return result
+
     def safe_run_module(self, mod_name, where):
         """A safe version of runpy.run_module().
 
@@ -2977,7 +3111,14 @@ def run_code(self, code_obj, result=None):
         except:
             if result is not None:
                 result.error_in_exec = sys.exc_info()[1]
-            self.showtraceback(running_compiled_code=True)
+            if (result is not None and result.info.silent
+                    and not self.show_silent_tracebacks):
+                # Keep the exception for %debug, without formatting it
+                self._get_exc_info()
+                if self.call_pdb:
+                    self.debugger(force=True)
+            else:
+                self.showtraceback(running_compiled_code=True)
         else:
             outflag = False
         return outflag
@@ -3034,6 +3175,7 @@ def enable_matplotlib(self, gui=None):
         # Now we must activate the gui pylab wants to use, and fix %run to take
         # plot updates into account
         self.enable_gui(gui)
+        self.magics_manager.load_lazy('ExecutionMagics')
         self.magics_manager.registry['ExecutionMagics'].default_runner = \
             pt.mpl_runner(self.safe_execfile)
         
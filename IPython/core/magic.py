@@ -21,6 +21,7 @@
 from IPython.core.error import UsageError
 from IPython.core.inputsplitter import ESC_MAGIC, ESC_MAGIC2
 from decorator import decorator
+from IPython.utils.importstring import import_item
 from IPython.utils.ipstruct import Struct
 from IPython.utils.process import arg_split
 from IPython.utils.text import dedent
@@ -295,6 +296,11 @@ class MagicsManager(Configurable):
     # A registry of the original objects that we've been given holding magics.
     registry = Dict()
 
+    # Magics declared with register_lazy() whose class hasn't been loaded yet:
+    # a two-level dict, first keyed by magic type, then by magic name, and
+    # holding the import string of the Magics class providing it as value.
+    lazy_magics = Dict()
+
     shell = Instance('IPython.core.interactiveshell.InteractiveShellABC', allow_none=True)
 
     auto_magic = Bool(True, help=
@@ -315,6 +321,7 @@ def __init__(self, shell=None, config=None, user_magics=None, **traits):
         super(MagicsManager, self).__init__(shell=shell, config=config,
                                            user_magics=user_magics, **traits)
         self.magics = dict(line={}, cell={})
+        self.lazy_magics = dict(line={}, cell={})
         # Let's add the user_magics to the registry for uniformity, so *all*
         # registered magic containers can be found there.
         self.registry[user_magics.__class__.__name__] = user_magics
@@ -328,9 +335,35 @@ def lsmagic(self):
 
         The return dict has the keys 'line' and 'cell', corresponding to the
         two types of magics we support.  Each value is a list of names.
+
+        This loads all the magics registered lazily; use :meth:`magic_names`
+        if only the names are needed.
         """
+        self.load_lazy()
         return self.magics
 
+    def magic_names(self):
+        """Return a dict of the names of the available magic functions.
+
+        Like :meth:`lsmagic`, but includes the magics registered lazily
+        without loading them.
+        """
+        return {kind: sorted(set(self.magics[kind]).union(self.lazy_magics[kind]))
+                for kind in magic_kinds}
+
+    def find_magic(self, magic_name, magic_kind='line'):
+        """Find and return a magic of the given type by name.
+
+        If the magic was registered lazily, its class is loaded first.
+
+        Returns None if the magic isn't found.
+        """
+        magic = self.magics[magic_kind].get(magic_name)
+        if magic is None and magic_name in self.lazy_magics[magic_kind]:
+            self._load_lazy_class(self.lazy_magics[magic_kind][magic_name])
+            magic = self.magics[magic_kind].get(magic_name)
+        return magic
+
     def lsmagic_docs(self, brief=False, missing=''):
         """Return dict of documentation of magic functions.
 
@@ -342,9 +375,10 @@ def lsmagic_docs(self, brief=False, missing=''):
         If brief is True, only the first line of each docstring will be returned.
         """
         docs = {}
-        for m_type in self.magics:
+        magics = self.lsmagic()
+        for m_type in magics:
             m_docs = {}
-            for m_name, m_func in self.magics[m_type].items():
+            for m_name, m_func in magics[m_type].items():
                 if m_func.__doc__:
                     if brief:
                         m_docs[m_name] = m_func.__doc__.split('\n', 1)[0]
@@ -390,6 +424,67 @@ def register(self, *magic_objects):
             self.registry[m.__class__.__name__] = m
             for mtype in magic_kinds:
                 self.magics[mtype].update(m.magics[mtype])
+                self._forget_lazy(mtype, m.magics[mtype])
+
+    def register_lazy(self, class_name, line=(), cell=()):
+        """Register a class of magics without importing it yet.
+
+        The class is only imported, instantiated and registered (as with
+        :meth:`register`) the first time one of the given magics is looked up,
+        which saves the cost of doing so at startup for magics that are never
+        used.
+
+        Parameters
+        ----------
+        class_name : str
+          Import string of the Magics subclass, e.g.
+          ``'IPython.core.magics.osm.OSMagics'``.
+
+        line, cell : list of str
+          Names of the line and cell magics the class provides.
+        """
+        for mtype, names in (('line', line), ('cell', cell)):
+            for name in names:
+                self.lazy_magics[mtype][name] = class_name
+
+    def load_lazy(self, class_name=None):
+        """Load magics registered lazily, without waiting for a lookup.
+
+        Parameters
+        ----------
+        class_name : str, optional
+          Name of the Magics class to load, e.g. ``'ExecutionMagics'``.  By
+          default, all of the lazily registered classes are loaded.
+        """
+        pending = set()
+        for mtype in magic_kinds:
+            pending.update(self.lazy_magics[mtype].values())
+        for spec in sorted(pending):
+            if class_name is None or spec.rsplit('.', 1)[-1] == class_name:
+                self._load_lazy_class(spec)
+
+    def _load_lazy_class(self, spec):
+        """Import, instantiate and register the lazily registered class spec."""
+        m = import_item(spec)(shell=self.shell)
+        self.registry[m.__class__.__name__] = m
+        for mtype in magic_kinds:
+            lazy = self.lazy_magics[mtype]
+            table = self.magics[mtype]
+            for name, func in m.magics[mtype].items():
+                if lazy.get(name) == spec:
+                    table[name] = func
+                else:
+                    # Don't clobber magics registered since the declaration
+                    table.setdefault(name, func)
+            for name in [n for n, s in lazy.items() if s == spec]:
+                del lazy[name]
+
+    def _forget_lazy(self, magic_kind, names):
+        """Drop lazy declarations overridden by explicitly registered magics."""
+        kinds = magic_kinds if magic_kind == 'line_cell' else [magic_kind]
+        for mtype in kinds:
+            for name in names:
+                self.lazy_magics[mtype].pop(name, None)
 
     def register_function(self, func, magic_kind='line', magic_name=None):
         """Expose a standalone function as magic function for IPython.
@@ -424,6 +519,7 @@ def register_function(self, func, magic_kind='line', magic_name=None):
         magic_name = func.__name__ if magic_name is None else magic_name
         setattr(self.user_magics, magic_name, func)
         record_magic(self.magics, magic_kind, magic_name, func)
+        self._forget_lazy(magic_kind, [magic_name])
 
     def register_alias(self, alias_name, magic_name, magic_kind='line', magic_params=None):
         """Register an alias to a magic function.
@@ -454,6 +550,7 @@ def register_alias(self, alias_name, magic_name, magic_kind='line', magic_params
         alias = MagicAlias(self.shell, magic_name, magic_kind, magic_params)
         setattr(self.user_magics, alias_name, alias)
         record_magic(self.magics, magic_kind, alias_name, alias)
+        self._forget_lazy(magic_kind, [alias_name])
 
 # Key base class that provides the central functionality for magics.
 
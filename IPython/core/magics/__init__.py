@@ -12,20 +12,59 @@
 # Imports
 #-----------------------------------------------------------------------------
 
+import os
+import sys
+
 from ..magic import Magics, magics_class
-from .auto import AutoMagics
-from .basic import BasicMagics
-from .code import CodeMagics, MacroToEdit
-from .config import ConfigMagics
-from .display import DisplayMagics
-from .execution import ExecutionMagics
-from .extension import ExtensionMagics
-from .history import HistoryMagics
-from .logging import LoggingMagics
-from .namespace import NamespaceMagics
-from .osm import OSMagics
-from .pylab import PylabMagics
-from .script import ScriptMagics
+
+# Submodule providing each of the classes exported here
+_class_modules = {
+    'AutoMagics': 'auto',
+    'BasicMagics': 'basic',
+    'CodeMagics': 'code',
+    'MacroToEdit': 'code',
+    'ConfigMagics': 'config',
+    'DisplayMagics': 'display',
+    'ExecutionMagics': 'execution',
+    'ExtensionMagics': 'extension',
+    'HistoryMagics': 'history',
+    'LoggingMagics': 'logging',
+    'NamespaceMagics': 'namespace',
+    'OSMagics': 'osm',
+    'PylabMagics': 'pylab',
+    'ScriptMagics': 'script',
+}
+
+if sys.version_info >= (3, 7):
+    # Import the submodules only when their classes are asked for, so that
+    # using one of them doesn't import all of the others (PEP 562).
+    def __getattr__(name):
+        try:
+            module = _class_modules[name]
+        except KeyError:
+            raise AttributeError("module %r has no attribute %r"
+                                 % (__name__, name))
+        from importlib import import_module
+        value = getattr(import_module('.' + module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()).union(_class_modules))
+else:
+    from .auto import AutoMagics
+    from .basic import BasicMagics
+    from .code import CodeMagics, MacroToEdit
+    from .config import ConfigMagics
+    from .display import DisplayMagics
+    from .execution import ExecutionMagics
+    from .extension import ExtensionMagics
+    from .history import HistoryMagics
+    from .logging import LoggingMagics
+    from .namespace import NamespaceMagics
+    from .osm import OSMagics
+    from .pylab import PylabMagics
+    from .script import ScriptMagics
 
 #-----------------------------------------------------------------------------
 # Magic implementation classes
@@ -39,3 +78,52 @@ class UserMagics(Magics):
     use this class to isolate the magics defined dynamically by the user into
     their own class.
     """
+
+#-----------------------------------------------------------------------------
+# Lazy registration
+#-----------------------------------------------------------------------------
+
+# The builtin magics classes, with the names of the line and cell magics each
+# of them provides. The shell registers them with
+# MagicsManager.register_lazy(), so a class is only imported and instantiated
+# when one of its magics is first used. These lists must be kept in sync with
+# the classes.
+_script_magics = ['sh', 'bash', 'perl', 'ruby', 'python', 'python2',
+                  'python3', 'pypy']
+if os.name == 'nt':
+    _script_magics.append('cmd')
+
+lazy_magics = [
+    ('IPython.core.magics.auto.AutoMagics',
+     ['autocall', 'automagic'], []),
+    ('IPython.core.magics.basic.BasicMagics',
+     ['alias_magic', 'colors', 'doctest_mode', 'gui', 'lsmagic', 'magic',
+      'notebook', 'page', 'pip', 'pprint', 'precision', 'profile', 'quickref',
+      'xmode'], []),
+    ('IPython.core.magics.code.CodeMagics',
+     ['edit', 'load', 'loadpy', 'pastebin', 'save'], []),
+    ('IPython.core.magics.config.ConfigMagics',
+     ['config'], []),
+    ('IPython.core.magics.display.DisplayMagics',
+     [], ['html', 'javascript', 'js', 'latex', 'markdown', 'svg']),
+    ('IPython.core.magics.execution.ExecutionMagics',
+     ['debug', 'macro', 'pdb', 'prun', 'run', 'tb', 'time', 'timeit'],
+     ['capture', 'debug', 'prun', 'time', 'timeit']),
+    ('IPython.core.magics.extension.ExtensionMagics',
+     ['load_ext', 'reload_ext', 'unload_ext'], []),
+    ('IPython.core.magics.history.HistoryMagics',
+     ['history', 'recall', 'rerun'], []),
+    ('IPython.core.magics.logging.LoggingMagics',
+     ['logoff', 'logon', 'logstart', 'logstate', 'logstop'], []),
+    ('IPython.core.magics.namespace.NamespaceMagics',
+     ['pdef', 'pdoc', 'pfile', 'pinfo', 'pinfo2', 'psearch', 'psource',
+      'reset', 'reset_selective', 'who', 'who_ls', 'whos', 'xdel'], []),
+    ('IPython.core.magics.osm.OSMagics',
+     ['alias', 'bookmark', 'cd', 'dhist', 'dirs', 'env', 'popd', 'pushd',
+      'pwd', 'pycat', 'rehashx', 'sc', 'set_env', 'sx', 'system', 'unalias'],
+     ['!', 'sx', 'system', 'writefile']),
+    ('IPython.core.magics.pylab.PylabMagics',
+     ['matplotlib', 'pylab'], []),
+    ('IPython.core.magics.script.ScriptMagics',
+     ['killbgscripts'], ['script'] + _script_magics),
+]
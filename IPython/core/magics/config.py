@@ -105,6 +105,8 @@ def config(self, s):
 
         """
         from traitlets.config.loader import Config
+        # Magics not used yet aren't instantiated: make them configurable too
+        self.shell.magics_manager.load_lazy()
         # some IPython objects are Configurable, but do not yet have
         # any configurable traits.  Exclude them from the effects of
         # this magic, as their presence is just noise:
@@ -10,6 +10,7 @@
 import builtins as builtin_mod
 import gc
 import itertools
+import json
 import os
 import shlex
 import sys
@@ -464,12 +465,51 @@ def _debug_exec(self, code, breakpoint):
             (filename, bp_line) = (None, None)
         self._run_with_debugger(code, self.shell.user_ns, filename, bp_line)
 
+    @magic_arguments.magic_arguments()
+    @magic_arguments.argument('--frame', '-f', type=int, action='append',
+        metavar='N',
+        help="""
+        Show frame N of the last traceback in full, with its context and
+        variables. Can be given several times.
+        """
+    )
+    @magic_arguments.argument('--json', action='store_true',
+        help="""
+        Print the last traceback as JSON, with the frames given by --frame
+        formatted in full.
+        """
+    )
     @line_magic
     def tb(self, s):
         """Print the last traceback with the currently active exception mode.
 
-        See %xmode for changing exception reporting modes."""
-        self.shell.showtraceback()
+        See %xmode for changing exception reporting modes. In the Collapsed
+        mode, tracebacks only list their frames, which can then be shown in
+        full with ``%tb --frame N``."""
+        args = magic_arguments.parse_argstring(self.tb, s)
+        if not (args.frame or args.json):
+            self.shell.showtraceback()
+            return
+
+        try:
+            etype, value, tb = self.shell._get_exc_info()
+        except ValueError:
+            print('No traceback available to show.', file=sys.stderr)
+            return
+        lazy_tb = self.shell.InteractiveTB.lazy_traceback(etype, value, tb)
+        frames = args.frame or []
+        for n in frames:
+            if not -len(lazy_tb) <= n < len(lazy_tb):
+                # Not an error, which would replace the last traceback
+                print('No frame %d in the last traceback, which has %d '
+                      'frames.' % (n, len(lazy_tb)), file=sys.stderr)
+                return
+        if args.json:
+            frames = [n % len(lazy_tb) for n in frames]
+            print(json.dumps(lazy_tb.to_dict(frames), indent=1))
+        else:
+            for n in frames:
+                print(lazy_tb.format_frame(n))
 
     @skip_doctest
     @line_magic
@@ -0,0 +1,208 @@
+# encoding: utf-8
+"""
+The output cache: the dict of results behind ``Out`` and ``_oh``.
+
+:class:`OutputCache` keeps track of the estimated memory footprint of the
+outputs it holds and of the order in which they were last used, so that the
+display hook can evict the least recently used outputs once they use too
+much memory. Evicted outputs can be moved to disk rather than dropped; they
+stay in the cache and are loaded back when accessed.
+"""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+from collections import OrderedDict
+from collections.abc import ItemsView, ValuesView
+import itertools
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+
+
+# Number of items of a container looked at to estimate its size
+_SAMPLE_SIZE = 64
+
+
+def estimate_size(obj, depth=2):
+    """Estimate the memory used by an object, in bytes.
+
+    This is meant to be fast rather than exact: it uses ``nbytes`` (NumPy
+    arrays, pandas series) or ``memory_usage()`` (pandas data frames) when
+    available, and otherwise adds to :func:`sys.getsizeof` the estimated size
+    of a sample of the items of containers and of the attributes of objects,
+    down to *depth* levels.
+    """
+    try:
+        size = sys.getsizeof(obj)
+    except Exception:
+        size = 0
+    if isinstance(obj, (str, bytes, bytearray, int, float, complex)):
+        return size
+
+    try:
+        nbytes = getattr(obj, 'nbytes', None)
+        if isinstance(nbytes, int):
+            return max(size, nbytes)
+        if type(obj).__module__.startswith('pandas'):
+            return max(size, int(obj.memory_usage(deep=False).sum()))
+    except Exception:
+        pass
+
+    if depth <= 0:
+        return size
+    if isinstance(obj, dict):
+        items = itertools.chain.from_iterable(obj.items())
+        count = 2 * len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj
+        count = len(obj)
+    else:
+        count = 0
+        attrs = getattr(obj, '__dict__', None)
+        if isinstance(attrs, dict):
+            size += estimate_size(attrs, depth - 1)
+    if count:
+        sampled = 0
+        for item in itertools.islice(items, _SAMPLE_SIZE):
+            sampled += estimate_size(item, depth - 1)
+        size += sampled * count // min(count, _SAMPLE_SIZE)
+    return size
+
+
+class _SpilledOutput(object):
+    """Placeholder for an output moved to disk by OutputCache.spill()"""
+    __slots__ = ('path',)
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, 'rb') as f:
+            return pickle.load(f)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __repr__(self):
+        return '<output saved to %s>' % self.path
+
+
+class OutputCache(dict):
+    """A dict of outputs, tracking their size and use, which can move values
+    to disk.
+
+    Values moved to disk by :meth:`spill` remain keys of the dict, and are
+    loaded back from disk each time they are looked up, without being kept
+    in memory. The files are removed along with the entries, or when the
+    cache is garbage collected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(OutputCache, self).__init__(*args, **kwargs)
+        # Estimated sizes of the values held in memory, least recently used
+        # first. Only values whose size was recorded are listed.
+        self._sizes = OrderedDict()
+        self.memory_size = 0
+        self._spill_dir = None
+        self._spill_count = 0
+
+    def record_size(self, key, size):
+        """Record the estimated size of the value of key, and mark it as the
+        most recently used."""
+        self._forget_size(key)
+        self._sizes[key] = size
+        self.memory_size += size
+
+    def _forget_size(self, key):
+        self.memory_size -= self._sizes.pop(key, 0)
+
+    def least_recently_used(self):
+        """The keys whose size was recorded, least recently used first."""
+        return list(self._sizes)
+
+    def spill(self, key):
+        """Move the value of key to disk.
+
+        Returns False, leaving the value in memory, if it can't be pickled.
+        """
+        value = dict.__getitem__(self, key)
+        if isinstance(value, _SpilledOutput):
+            return True
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='ipython-outputs-')
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        self._spill_count += 1
+        spilled = _SpilledOutput(os.path.join(
+            self._spill_dir, '%d.pickle' % self._spill_count))
+        try:
+            with open(spilled.path, 'wb') as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            spilled.remove()
+            return False
+        dict.__setitem__(self, key, spilled)
+        self._forget_size(key)
+        return True
+
+    def is_spilled(self, key):
+        """Whether the value of key has been moved to disk."""
+        return isinstance(dict.get(self, key), _SpilledOutput)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, _SpilledOutput):
+            return value.load()
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def __setitem__(self, key, value):
+        old = dict.get(self, key)
+        if isinstance(old, _SpilledOutput):
+            old.remove()
+        self._forget_size(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        value = dict.pop(self, key)
+        if isinstance(value, _SpilledOutput):
+            value.remove()
+        self._forget_size(key)
+
+    _marker = object()
+
+    def pop(self, key, default=_marker):
+        if key not in self:
+            if default is self._marker:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def clear(self):
+        for value in dict.values(self):
+            if isinstance(value, _SpilledOutput):
+                value.remove()
+        dict.clear(self)
+        self._sizes.clear()
+        self.memory_size = 0
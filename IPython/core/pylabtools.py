@@ -4,7 +4,12 @@
 # Copyright (c) IPython Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+import atexit
+from collections import OrderedDict
 from io import BytesIO
+import os
+import pickle
+import sys
 
 from IPython.core.display import _pngxy
 from IPython.utils.decorators import flag_calls
@@ -91,25 +96,93 @@ def figsize(sizex, sizey):
     matplotlib.rcParams['figure.figsize'] = [sizex, sizey]
 
 
-def print_figure(fig, fmt='png', bbox_inches='tight', **kwargs):
-    """Print a figure to an image, and return the resulting file data
-    
-    Returned data will be bytes unless ``fmt='svg'``,
-    in which case it will be unicode.
-    
-    Any keyword args are passed to fig.canvas.print_figure,
-    such as ``quality`` or ``bbox_inches``.
+class _FigureRevision(object):
+    """The ``stale_callback`` of a figure, counting the changes to the figure.
+
+    It keeps the images of the current revision of the figure printed by
+    :func:`print_figure`, and calls the callback it replaced.
     """
-    # When there's an empty figure, we shouldn't return anything, otherwise we
-    # get big blank areas in the qt console.
-    if not fig.axes and not fig.lines:
-        return
 
+    # Number of images kept for a revision, for different formats or options
+    max_renders = 8
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.revision = 0
+        self.renders = OrderedDict()
+        # Changes made while printing the figure are not counted
+        self.printing = False
+
+    def add_render(self, key, data):
+        self.renders[key] = data
+        while len(self.renders) > self.max_renders:
+            self.renders.popitem(last=False)
+
+    def invalidate(self):
+        """Start a new revision, for changes the figure doesn't report.
+
+        Changing the data of an artist in place, such as
+        ``im.get_array()[:] = ...``, doesn't mark the figure as stale, so
+        the images cached for the previous revision would be reused.
+        """
+        self.revision += 1
+        self.renders.clear()
+
+    def __call__(self, fig, val):
+        if not self.printing:
+            self.invalidate()
+        if self.callback is not None:
+            self.callback(fig, val)
+
+
+def figure_revision(fig):
+    """Return the revision tracker of a figure, installing it if needed.
+
+    Call its ``invalidate()`` method after modifying the figure in a way
+    matplotlib doesn't report, so that it is printed again.
+
+    Returns None for figures which don't report their changes (matplotlib
+    older than 1.5).
+    """
+    if not hasattr(fig, 'stale_callback'):
+        return None
+    tracker = fig.stale_callback
+    if not isinstance(tracker, _FigureRevision):
+        # Either new, or replaced: previous images can't be trusted.
+        tracker = fig.stale_callback = _FigureRevision(tracker)
+    return tracker
+
+
+def _cached_revision(fig):
+    """The revision tracker of a figure whose images can be cached, or None.
+
+    Animated artists don't report their changes, so the images of figures
+    having some aren't cached.
+    """
+    tracker = figure_revision(fig)
+    if tracker is None:
+        return None
+    if any(artist.get_animated() for artist in fig.findobj()):
+        tracker.renders.clear()
+        return None
+    return tracker
+
+
+def _render_key(kw):
+    """Key of the images printed with the print_figure arguments kw"""
+    from matplotlib import rcParams
+    # rcParams are used when drawing, and aren't tracked by the figure. Read
+    # them without the side effects of RcParams.__getitem__.
+    return repr(sorted(kw.items())), repr(sorted(dict.items(rcParams)))
+
+
+def _print_figure_kwargs(fig, fmt, bbox_inches, kwargs):
+    """The arguments of fig.canvas.print_figure for print_figure()"""
     dpi = fig.dpi
     if fmt == 'retina':
         dpi = dpi * 2
         fmt = 'png'
-    
+
     # build keyword args
     kw = {
         "format":fmt,
@@ -120,12 +193,54 @@ def print_figure(fig, fmt='png', bbox_inches='tight', **kwargs):
     }
     # **kwargs get higher priority
     kw.update(kwargs)
+    return kw
+
+
+def print_figure(fig, fmt='png', bbox_inches='tight', **kwargs):
+    """Print a figure to an image, and return the resulting file data
     
+    Returned data will be bytes unless ``fmt='svg'``,
+    in which case it will be unicode.
+    
+    Any keyword args are passed to fig.canvas.print_figure,
+    such as ``quality`` or ``bbox_inches``.
+
+    The images are cached with the figure, and reused until the figure is
+    modified (see :func:`figure_revision`) or the rcParams change. Figures
+    having animated artists aren't cached.
+    """
+    # When there's an empty figure, we shouldn't return anything, otherwise we
+    # get big blank areas in the qt console.
+    if not fig.axes and not fig.lines:
+        return
+
+    kw = _print_figure_kwargs(fig, fmt, bbox_inches, kwargs)
+    fmt = kw['format']
+    tracker = _cached_revision(fig)
+    if tracker is not None:
+        key = _render_key(kw)
+        try:
+            data = tracker.renders[key]
+        except KeyError:
+            pass
+        else:
+            tracker.renders.move_to_end(key)
+            return data
+
     bytes_io = BytesIO()
-    fig.canvas.print_figure(bytes_io, **kw)
+    if tracker is not None:
+        tracker.printing = True
+    try:
+        fig.canvas.print_figure(bytes_io, **kw)
+    finally:
+        if tracker is not None:
+            tracker.printing = False
     data = bytes_io.getvalue()
     if fmt == 'svg':
         data = data.decode('utf-8')
+
+    if tracker is not None:
+        tracker.add_render(key, data)
     return data
     
 def retina_figure(fig, **kwargs):
@@ -139,6 +254,117 @@ def retina_figure(fig, **kwargs):
     metadata = {"width": w//2, "height":h//2}
     return pngdata, metadata
 
+# Process pool rendering figures for print_figures(), and its size
+_render_pool = None
+_render_pool_size = 0
+
+# rcParams not passed to the processes rendering figures
+_local_rcparams = {'backend', 'backend_fallback', 'interactive'}
+
+
+def _get_render_pool(processes):
+    global _render_pool, _render_pool_size
+    if _render_pool is None or _render_pool_size != processes:
+        from concurrent.futures import ProcessPoolExecutor
+        if _render_pool is not None:
+            atexit.unregister(_render_pool.shutdown)
+            _render_pool.shutdown(wait=False)
+        kwargs = {}
+        if sys.version_info >= (3, 7):
+            # Forking a process with threads (history, kernel) isn't safe
+            import multiprocessing
+            kwargs['mp_context'] = multiprocessing.get_context('spawn')
+        _render_pool = ProcessPoolExecutor(processes, **kwargs)
+        _render_pool_size = processes
+        atexit.register(_render_pool.shutdown)
+    return _render_pool
+
+
+def _print_pickled_figure(pickled, kw, rc):
+    """Print a pickled figure in a worker process of print_figures()"""
+    import matplotlib
+    if matplotlib.get_backend().lower() != 'agg':
+        matplotlib.use('Agg')
+    fig = pickle.loads(pickled)
+    try:
+        with matplotlib.rc_context(rc):
+            bytes_io = BytesIO()
+            fig.canvas.print_figure(bytes_io, **kw)
+        return bytes_io.getvalue()
+    finally:
+        plt = sys.modules.get('matplotlib.pyplot')
+        if plt is not None:
+            plt.close(fig)
+
+
+def print_figures(fig, formats, processes=None, bbox_inches='tight',
+                  **kwargs):
+    """Print a figure to several formats concurrently.
+
+    The first format is printed by :func:`print_figure`, while worker
+    processes print the others from copies of the (pickled) figure. The
+    images are cached, so that the calls to :func:`print_figure` which
+    follow, with the same arguments, return them immediately. Nothing is
+    done for figures which can't be pickled or aren't cached (see
+    :func:`print_figure`); print_figure prints them.
+
+    Parameters
+    ----------
+    fig : Figure
+        The figure to print.
+    formats : list of str
+        Formats understood by :func:`print_figure`, such as 'png', 'retina'
+        or 'svg'.
+    processes : int, optional
+        Number of worker processes. Defaults to the number of formats but
+        one, within the number of CPUs but one; nothing is done on a single
+        CPU.
+    **kwargs : any
+        Passed to :func:`print_figure`.
+    """
+    tracker = _cached_revision(fig)
+    if tracker is None or (not fig.axes and not fig.lines):
+        return
+    todo = []
+    for fmt in formats:
+        kw = _print_figure_kwargs(fig, fmt, bbox_inches, kwargs)
+        if _render_key(kw) not in tracker.renders:
+            todo.append((fmt, kw))
+    if len(todo) < 2:
+        return
+    try:
+        pickled = pickle.dumps(fig, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return
+
+    if processes is None:
+        # This process prints a format too
+        processes = min(len(todo) - 1, (os.cpu_count() or 1) - 1)
+        if processes < 1:
+            return
+
+    from matplotlib import rcParams
+    rc = {k: v for k, v in dict.items(rcParams) if k not in _local_rcparams}
+    pool = _get_render_pool(processes)
+    try:
+        futures = [(kw, pool.submit(_print_pickled_figure, pickled, kw, rc))
+                   for fmt, kw in todo[1:]]
+    except Exception:
+        # e.g. a broken pool; the formats will be printed one by one
+        return
+    fmt, kw = todo[0]
+    print_figure(fig, fmt, bbox_inches, **kwargs)
+    for kw, future in futures:
+        try:
+            data = future.result()
+        except Exception:
+            # print_figure will print it again, reporting the error
+            continue
+        if kw['format'] == 'svg':
+            data = data.decode('utf-8')
+        tracker.add_render(_render_key(kw), data)
+
+
 # We need a little factory function here to create the closure where
 # safe_execfile can live.
 def mpl_runner(safe_execfile):
@@ -199,7 +425,7 @@ def _reshow_nbagg_figure(fig):
         reshow()
 
 
-def select_figure_formats(shell, formats, **kwargs):
+def select_figure_formats(shell, formats, parallel=False, **kwargs):
     """Select figure formats for the inline backend.
 
     Parameters
@@ -208,6 +434,10 @@ def select_figure_formats(shell, formats, **kwargs):
         The main IPython instance.
     formats : str or set
         One or a set of figure formats to enable: 'png', 'retina', 'jpeg', 'svg', 'pdf'.
+    parallel : bool or int
+        Print the formats of a figure concurrently, in worker processes (see
+        :func:`print_figures`), when there are several. An int gives the
+        number of processes.
     **kwargs : any
         Extra keyword arguments to be passed to fig.canvas.print_figure.
     """
@@ -237,16 +467,30 @@ def select_figure_formats(shell, formats, **kwargs):
         gs = "%s" % ','.join([repr(f) for f in supported])
         raise ValueError("supported formats are: %s not %s" % (gs, bs))
     
+    # The formats printed, once one format replaces png with retina
+    printed = []
+    processes = None if isinstance(parallel, bool) else int(parallel)
+    def prefetch(fig):
+        # Print all the formats at once, when the first one is asked for
+        if parallel and len(printed) > 1:
+            print_figures(fig, printed, processes, **kwargs)
+        return fig
+
     if 'png' in formats:
-        png_formatter.for_type(Figure, lambda fig: print_figure(fig, 'png', **kwargs))
+        printed.append('png')
+        png_formatter.for_type(Figure, lambda fig: print_figure(prefetch(fig), 'png', **kwargs))
     if 'retina' in formats or 'png2x' in formats:
-        png_formatter.for_type(Figure, lambda fig: retina_figure(fig, **kwargs))
+        printed[:] = ['retina']
+        png_formatter.for_type(Figure, lambda fig: retina_figure(prefetch(fig), **kwargs))
     if 'jpg' in formats or 'jpeg' in formats:
-        jpg_formatter.for_type(Figure, lambda fig: print_figure(fig, 'jpg', **kwargs))
+        printed.append('jpg')
+        jpg_formatter.for_type(Figure, lambda fig: print_figure(prefetch(fig), 'jpg', **kwargs))
     if 'svg' in formats:
-        svg_formatter.for_type(Figure, lambda fig: print_figure(fig, 'svg', **kwargs))
+        printed.append('svg')
+        svg_formatter.for_type(Figure, lambda fig: print_figure(prefetch(fig), 'svg', **kwargs))
     if 'pdf' in formats:
-        pdf_formatter.for_type(Figure, lambda fig: print_figure(fig, 'pdf', **kwargs))
+        printed.append('pdf')
+        pdf_formatter.for_type(Figure, lambda fig: print_figure(prefetch(fig), 'pdf', **kwargs))
 
 #-----------------------------------------------------------------------------
 # Code for initializing matplotlib and importing pylab
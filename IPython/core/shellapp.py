@@ -16,7 +16,9 @@
 from traitlets.config.configurable import Configurable
 from traitlets.config.loader import Config
 from IPython.core.application import SYSTEM_CONFIG_DIRS, ENV_CONFIG_DIRS
+from IPython.core.compilerop import BytecodeCache
 from IPython.core import pylabtools
+from IPython.core.startupprofile import startup_step
 from IPython.utils.contexts import preserve_keys
 from IPython.utils.path import filefind
 from traitlets import (
@@ -133,6 +135,11 @@ class InteractiveShellApp(Configurable):
     exec_files = List(Unicode(),
         help="""List of files to run at IPython startup."""
     ).tag(config=True)
+    cache_startup_bytecode = Bool(True,
+        help="""Cache the code compiled from the startup files and exec_files in
+        the profile directory, so that unchanged files aren't transformed and
+        compiled again at each startup."""
+    ).tag(config=True)
     exec_PYTHONSTARTUP = Bool(True,
         help="""Run the file referenced by the PYTHONSTARTUP environment
         variable at IPython startup."""
@@ -172,6 +179,9 @@ class InteractiveShellApp(Configurable):
                      allow_none=True)
     # whether interact-loop should start
     interact = Bool(True)
+    # StartupProfiler timing the startup steps, if it is being profiled
+    startup_profiler = Instance('IPython.core.startupprofile.StartupProfiler',
+                                allow_none=True)
 
     user_ns = Instance(dict, args=None, allow_none=True)
     @observe('user_ns')
@@ -241,7 +251,8 @@ def init_extensions(self):
             for ext in extensions:
                 try:
                     self.log.info("Loading IPython extension: %s" % ext)
-                    self.shell.extension_manager.load_extension(ext)
+                    with startup_step(self.startup_profiler, ext, 'extension'):
+                        self.shell.extension_manager.load_extension(ext)
                 except:
                     if self.reraise_ipython_extension_failures:
                         raise
@@ -258,9 +269,12 @@ def init_extensions(self):
 
     def init_code(self):
         """run the pre-flight code, specified via exec_lines"""
-        self._run_startup_files()
-        self._run_exec_lines()
-        self._run_exec_files()
+        with startup_step(self.startup_profiler, '_run_startup_files'):
+            self._run_startup_files()
+        with startup_step(self.startup_profiler, '_run_exec_lines'):
+            self._run_exec_lines()
+        with startup_step(self.startup_profiler, '_run_exec_files'):
+            self._run_exec_files()
 
         # Hide variables defined here from %who etc.
         if self.hide_initial_ns:
@@ -294,6 +308,13 @@ def _run_exec_lines(self):
             self.log.warning("Unknown error in handling IPythonApp.exec_lines:")
             self.shell.showtraceback()
 
+    def _bytecode_cache(self):
+        """The cache of the code compiled from startup files, if enabled."""
+        if not self.cache_startup_bytecode:
+            return None
+        return BytecodeCache(os.path.join(self.profile_dir.location,
+                                          'bytecode_cache'))
+
     def _exec_file(self, fname, shell_futures=False):
         try:
             full_filename = filefind(fname, [u'.', self.ipython_dir])
@@ -310,17 +331,22 @@ def _exec_file(self, fname, shell_futures=False):
                               full_filename)
                 # Ensure that __file__ is always defined to match Python
                 # behavior.
-                with preserve_keys(self.shell.user_ns, '__file__'):
+                with preserve_keys(self.shell.user_ns, '__file__'), \
+                        startup_step(self.startup_profiler, full_filename,
+                                     'file'):
                     self.shell.user_ns['__file__'] = fname
+                    cache = None if shell_futures else self._bytecode_cache()
                     if full_filename.endswith('.ipy'):
                         self.shell.safe_execfile_ipy(full_filename,
-                                                     shell_futures=shell_futures)
+                                                     shell_futures=shell_futures,
+                                                     cache=cache)
                     else:
                         # default to python, even without extension
                         self.shell.safe_execfile(full_filename,
                                                  self.shell.user_ns,
                                                  shell_futures=shell_futures,
-                                                 raise_exceptions=True)
+                                                 raise_exceptions=True,
+                                                 cache=cache)
         finally:
             sys.argv = save_argv
 
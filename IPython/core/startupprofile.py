@@ -0,0 +1,229 @@
+# encoding: utf-8
+"""
+Profiling of the time spent starting IPython.
+
+:class:`StartupProfiler` records a tree of timed steps: the phases of the
+application initialisation, the startup files and extensions run during
+them, and every module imported while the profiler is running, nested like
+the output of ``python -X importtime``.
+
+It is enabled with ``ipython --startup-profile``.
+"""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+from contextlib import contextmanager
+import json
+import sys
+import threading
+import time
+
+from IPython.core import release
+
+_clock = time.perf_counter
+
+
+class _TimedLoader(object):
+    """Wrap a module loader to time the execution of the module it loads.
+
+    The wrapper only lives while the module is created and executed: it puts
+    the real loader back on the module and its spec before running the
+    module's code, so nothing outside the import machinery ever sees it.
+    """
+
+    def __init__(self, loader, profiler, name):
+        self.loader = loader
+        self.profiler = profiler
+        self.name = name
+        self.create_time = 0.
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+    def create_module(self, spec):
+        create_module = getattr(self.loader, 'create_module', None)
+        if create_module is None:
+            return None
+        # Extension modules do all of their work here.
+        start = _clock()
+        try:
+            return create_module(spec)
+        finally:
+            self.create_time = _clock() - start
+
+    def exec_module(self, module):
+        if getattr(module, '__loader__', None) is self:
+            module.__loader__ = self.loader
+        spec = getattr(module, '__spec__', None)
+        if spec is not None and spec.loader is self:
+            spec.loader = self.loader
+        with self.profiler.timed(self.name, 'import') as entry:
+            self.loader.exec_module(module)
+        if entry is not None:
+            entry['duration'] += self.create_time
+
+
+class _TimingFinder(object):
+    """A :data:`sys.meta_path` finder timing the modules found by the others."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Builtin and frozen modules are loaded by the importer class itself,
+        # and legacy loaders don't have exec_module; leave those alone.
+        if (loader is None or isinstance(loader, type)
+                or not hasattr(loader, 'exec_module')):
+            return spec
+        spec.loader = _TimedLoader(loader, self.profiler, fullname)
+        return spec
+
+
+class StartupProfiler(object):
+    """Record the time spent in the steps of IPython's startup.
+
+    Steps are timed with the :meth:`timed` context manager, and nest. Between
+    :meth:`start` and :meth:`stop`, the execution of every newly imported
+    module is recorded as a step of kind ``'import'``, nested in the step
+    which imported it.
+
+    Only the thread which started the profiler is recorded.
+    """
+
+    def __init__(self):
+        self.root = {'name': 'ipython', 'kind': 'total', 'duration': 0.,
+                     'children': []}
+        self._stack = [self.root]
+        self._finder = None
+        self._thread = None
+        self._start = None
+        self.running = False
+
+    def start(self):
+        """Start recording, including the imports."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.current_thread()
+        self._start = _clock()
+        if sys.version_info >= (3, 4):
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def stop(self):
+        """Stop recording, and uninstall the import hook."""
+        if not self.running:
+            return
+        self.running = False
+        self.root['duration'] = _clock() - self._start
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    @contextmanager
+    def timed(self, name, kind='phase'):
+        """Time the code run in the context as a step of the startup.
+
+        Yields the dict recording the step, or None when the step is not
+        recorded (profiler not running, or running in another thread).
+        """
+        if not self.running or threading.current_thread() is not self._thread:
+            yield None
+            return
+        entry = {'name': name, 'kind': kind, 'duration': 0., 'children': []}
+        self._stack[-1]['children'].append(entry)
+        self._stack.append(entry)
+        start = _clock()
+        try:
+            yield entry
+        finally:
+            entry['duration'] = _clock() - start
+            self._stack.pop()
+
+    def to_dict(self):
+        """Return the recorded steps as a JSON-able dict.
+
+        Each step has a ``name``, a ``kind``, its total ``duration`` and the
+        ``self`` time not spent in its children, in seconds, and the list of
+        its ``children``.
+        """
+        def convert(entry):
+            children = [convert(c) for c in entry['children']]
+            return {
+                'name': entry['name'],
+                'kind': entry['kind'],
+                'duration': entry['duration'],
+                'self': max(0., entry['duration']
+                            - sum(c['duration'] for c in children)),
+                'children': children,
+            }
+        data = convert(self.root)
+        data['ipython_version'] = release.version
+        data['python_version'] = sys.version.split()[0]
+        return data
+
+    def format_report(self, min_duration=0.001):
+        """Return a plain text report of the steps.
+
+        Imports which took less than *min_duration* seconds are summarised
+        rather than listed.
+        """
+        lines = ['IPython startup profile (ms, total / self):']
+        hidden = [0]
+
+        def add(entry, depth):
+            for child in entry['children']:
+                if (child['kind'] == 'import'
+                        and child['duration'] < min_duration):
+                    hidden[0] += 1
+                    continue
+                label = child['name']
+                if child['kind'] not in ('phase', 'import'):
+                    label = '%s %s' % (child['kind'], label)
+                elif child['kind'] == 'import':
+                    label = 'import %s' % label
+                lines.append('%9.1f %9.1f  %s%s' % (
+                    child['duration'] * 1e3, child['self'] * 1e3,
+                    '  ' * depth, label))
+                add(child, depth + 1)
+
+        data = self.to_dict()
+        add(data, 0)
+        lines.append('%9.1f %9s  total' % (data['duration'] * 1e3, ''))
+        if hidden[0]:
+            lines.append('(%d imports faster than %g ms not shown)'
+                         % (hidden[0], min_duration * 1e3))
+        return '\n'.join(lines)
+
+    def write_json(self, fname):
+        """Write the steps, as returned by :meth:`to_dict`, to a JSON file."""
+        with open(fname, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(), indent=1))
+
+
+@contextmanager
+def _not_timed():
+    yield None
+
+
+def startup_step(profiler, name, kind='phase'):
+    """Time a step with *profiler*, which may be None when not profiling."""
+    if profiler is None:
+        return _not_timed()
+    return profiler.timed(name, kind)
@@ -15,6 +15,7 @@
 
 # Stdlib imports
 import linecache
+import os
 import sys
 
 # Third-party imports
@@ -22,6 +23,7 @@
 
 # Our own imports
 from IPython.core import compilerop
+from IPython.utils.tempdir import TemporaryDirectory
 
 #-----------------------------------------------------------------------------
 # Test functions
@@ -71,3 +73,25 @@ def test_compiler_check_cache():
             break
     else:
         raise AssertionError('Entry for input-99 missing from linecache')
+
+def test_bytecode_cache():
+    with TemporaryDirectory() as td:
+        cache = compilerop.BytecodeCache(os.path.join(td, 'cache'))
+        nt.assert_is_none(cache.get('a.py', b'x = 1\n'))
+        cache.compile(b'x = 1\n', 'a.py')
+        ns = {}
+        exec(cache.get('a.py', b'x = 1\n'), ns)
+        nt.assert_equal(ns['x'], 1)
+        nt.assert_equal(cache.get('a.py', b'x = 1\n').co_filename, 'a.py')
+        # The key covers the file name, the source and the context
+        nt.assert_is_none(cache.get('b.py', b'x = 1\n'))
+        nt.assert_is_none(cache.get('a.py', b'x = 1\n', 'other'))
+        # A new version of the file replaces the old entry
+        cache.compile(b'x = 2\n', 'a.py')
+        nt.assert_is_none(cache.get('a.py', b'x = 1\n'))
+        nt.assert_equal(len(os.listdir(cache.directory)), 1)
+        # Corrupted entries are ignored
+        entry = os.path.join(cache.directory, os.listdir(cache.directory)[0])
+        with open(entry, 'wb') as f:
+            f.write(b'garbage')
+        nt.assert_is_none(cache.get('a.py', b'x = 2\n'))
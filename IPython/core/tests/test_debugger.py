@@ -4,12 +4,17 @@
 # Copyright (c) IPython Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+import io
+import json
+import os
+import re
 import sys
 import warnings
 
 import nose.tools as nt
 
 from IPython.core import debugger
+from IPython.utils.capture import capture_output
 
 #-----------------------------------------------------------------------------
 # Helper classes, from CPython's Pdb test suite
@@ -223,3 +228,200 @@ def can_exit():
 
     >>> sys.settrace(old_trace)
     '''
+
+
+#-----------------------------------------------------------------------------
+# Fast tracing
+#-----------------------------------------------------------------------------
+
+def _helper(i):
+    return i * 2
+
+def _work(n):
+    total = 0
+    for i in range(n):
+        total += _helper(i)
+    total = _done(total)
+    return json.dumps(total)
+
+def _done(total):
+    result = total + 1
+    return result
+
+
+class _CountingPdb(debugger.Pdb):
+    """Pdb recording the names of the functions it gets line events for."""
+
+    def dispatch_line(self, frame):
+        self.traced.add(frame.f_code.co_name)
+        return debugger.Pdb.dispatch_line(self, frame)
+
+
+def _run_debugger(commands, fast_tracing=True, **kwargs):
+    old_trace = sys.gettrace()
+    stdout = io.StringIO()
+    pdb = _CountingPdb(stdin=io.StringIO('\n'.join(commands) + '\n'),
+                       stdout=stdout, fast_tracing=fast_tracing, **kwargs)
+    pdb.traced = set()
+    try:
+        with capture_output() as captured:
+            result = pdb.runcall(_work, 5)
+    finally:
+        pdb.clear_all_breaks()
+        sys.settrace(old_trace)
+    return pdb, result, stdout.getvalue() + captured.stdout
+
+
+def test_fast_tracing_continue():
+    line = _done.__code__.co_firstlineno + 1
+    pdb, result, out = _run_debugger([
+        'break %s:%d' % (__file__, line),
+        'continue',
+        'p total',
+        'continue',
+    ])
+    nt.assert_equal(result, '21')
+    nt.assert_in('20', out)
+    # Functions without breakpoints, in the same file, aren't traced
+    nt.assert_not_in('_helper', pdb.traced)
+    nt.assert_in('_done', pdb.traced)
+
+    pdb, result, out = _run_debugger([
+        'break %s:%d' % (__file__, line),
+        'continue',
+        'continue',
+    ], fast_tracing=False)
+    nt.assert_in('_helper', pdb.traced)
+
+
+def test_fast_tracing_shell_option():
+    ip = get_ipython()
+    nt.assert_false(debugger.Pdb().fast_tracing)
+    ip.debugger_fast_tracing = True
+    try:
+        nt.assert_true(debugger.Pdb().fast_tracing)
+        nt.assert_true(ip.InteractiveTB.debugger_cls().fast_tracing)
+        # The argument still wins
+        nt.assert_false(debugger.Pdb(fast_tracing=False).fast_tracing)
+    finally:
+        ip.debugger_fast_tracing = False
+
+
+def test_fast_tracing_condition():
+    line = _helper.__code__.co_firstlineno + 1
+    pdb, result, out = _run_debugger([
+        'break %s:%d, i == 3' % (__file__, line),
+        'continue',
+        'p i * 100',
+        'continue',
+    ])
+    nt.assert_in('300', out)
+    nt.assert_not_in('200', out)
+
+
+def test_fast_tracing_step_back():
+    """Callers are traced again after stopping at a breakpoint"""
+    line = _done.__code__.co_firstlineno + 1
+    pdb, result, out = _run_debugger([
+        'break %s:%d' % (__file__, line),
+        'continue',
+        'return',
+        'next',
+        'p total',
+        'continue',
+    ])
+    nt.assert_in('_work', pdb.traced)
+    nt.assert_in('21', out)
+
+
+def test_fast_tracing_skip_paths():
+    # Stepping from _work skips json's code
+    line = _work.__code__.co_firstlineno + 5
+    pdb, result, out = _run_debugger([
+        'break %s:%d' % (__file__, line),
+        'continue',
+        'step',
+        'step',
+        'continue',
+    ], skip_paths=[os.path.join(os.path.dirname(json.__file__), '*')])
+    nt.assert_false(any(name in pdb.traced
+                        for name in ('dumps', 'encode', 'iterencode')),
+                    pdb.traced)
+    nt.assert_equal(result, '21')
+
+
+#-----------------------------------------------------------------------------
+# Stack listing
+#-----------------------------------------------------------------------------
+
+class _CountedRepr(object):
+    reprs = 0
+
+    def __repr__(self):
+        _CountedRepr.reprs += 1
+        return '<counted>'
+
+def _make_value():
+    value = _CountedRepr()
+    return value
+
+def _call_make_value():
+    return _make_value()
+
+
+def _list_stack(commands):
+    old_trace = sys.gettrace()
+    stdout = io.StringIO()
+    pdb = debugger.Pdb(stdin=io.StringIO('\n'.join(commands) + '\n'),
+                       stdout=stdout)
+    try:
+        with capture_output() as captured:
+            pdb.runcall(_call_make_value)
+    finally:
+        pdb.clear_all_breaks()
+        sys.settrace(old_trace)
+    return stdout.getvalue() + captured.stdout
+
+
+def test_stack_entries_cached():
+    _CountedRepr.reprs = 0
+    out = _list_stack([
+        'break %s:%d' % (__file__, _make_value.__code__.co_firstlineno + 2),
+        'continue',
+        'return',
+        'where',
+        'where',
+        'continue',
+    ])
+    nt.assert_equal(out.count('<counted>'), 3)
+    # The return value is formatted once for the stop, and reused by where
+    nt.assert_equal(_CountedRepr.reprs, 1)
+
+    # Breakpoints added while stopped show in the listing
+    line = _make_value.__code__.co_firstlineno + 1
+    out = _list_stack([
+        'break %s:%d' % (__file__, line + 1),
+        'continue',
+        'where',
+        'break %s:%d' % (__file__, line),
+        'where',
+        'continue',
+    ])
+    nt.assert_equal(len(re.findall(r'\d%6d ' % line, out)), 1)
+
+
+def test_stack_entry_repr_budget():
+    ip = get_ipython()
+    old = ip.InteractiveTB.repr_max_items
+    ip.InteractiveTB.repr_max_items = 10
+    pdb = debugger.Pdb(stdout=io.StringIO())
+    pdb.reset()
+    frame = sys._getframe()
+    try:
+        pdb.setup(frame, None)
+        frame.f_locals['__return__'] = list(range(100))
+        entry = pdb.format_stack_entry(pdb.stack[-1])
+    finally:
+        pdb.forget()
+        ip.InteractiveTB.repr_max_items = old
+    nt.assert_in('<list len=100>', entry)
@@ -1,6 +1,9 @@
 # Copyright (c) IPython Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+from contextlib import contextmanager
+from binascii import b2a_base64
+from io import BytesIO
 import json
 import os
 import warnings
@@ -10,6 +13,7 @@
 import nose.tools as nt
 
 from IPython.core import display
+from IPython.core.displaypub import DisplayPublisher
 from IPython.core.getipython import get_ipython
 from IPython.utils.io import capture_output
 from IPython.utils.tempdir import NamedFileInTemporaryDirectory
@@ -81,6 +85,51 @@ def test_retina_jpeg():
     nt.assert_equal(md['width'], 1)
     nt.assert_equal(md['height'], 1)
 
+def test_image_file_loaded_lazily():
+    here = os.path.dirname(__file__)
+    fname = os.path.join(here, "2x2.png")
+    with open(fname, 'rb') as f:
+        raw = f.read()
+    img = display.Image(fname, retina=True)
+    nt.assert_is_none(img._data)
+    nt.assert_equal(img.data, raw)
+    nt.assert_equal((img.width, img.height), (1, 1))
+    data, md = img._repr_png_()
+    nt.assert_equal(data, b2a_base64(raw).decode('ascii'))
+    # Missing files are reported when the image is built
+    with nt.assert_raises(FileNotFoundError):
+        display.Image(filename=os.path.join(here, 'missing.png'))
+
+    # memoryviews are used as they are
+    img = display.Image(memoryview(raw), retina=True)
+    nt.assert_equal(img._repr_png_()[0], data)
+    nt.assert_equal((img.width, img.height), (1, 1))
+
+def test_image_size_from_headers():
+    here = os.path.dirname(__file__)
+    for name, sniff in [("2x2.png", display._pngxy),
+                        ("2x2.jpg", display._jpegxy)]:
+        with open(os.path.join(here, name), 'rb') as f:
+            raw = f.read()
+        f = BytesIO(raw)
+        nt.assert_equal(sniff(f), (2, 2))
+        nt.assert_equal(sniff(raw), (2, 2))
+        nt.assert_less(f.tell(), len(raw))
+
+def test_b64encode_file():
+    with NamedFileInTemporaryDirectory('data.bin') as f:
+        raw = bytes(range(256)) * 7 + b'x'
+        f.write(raw)
+        f.close()
+        for newline in (False, True):
+            expected = b2a_base64(raw).decode('ascii')
+            if not newline:
+                expected = expected[:-1]
+            with mock.patch.object(display, '_B64_CHUNK_SIZE', 9):
+                nt.assert_equal(display._b64encode(filename=f.name,
+                                                   newline=newline), expected)
+            nt.assert_equal(display._b64encode(raw, newline=newline), expected)
+
 def test_base64image():
     display.Image("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABAQMAAAAl21bKAAAAA1BMVEUAAACnej3aAAAAAWJLR0QAiAUdSAAAAAlwSFlzAAALEwAACxMBAJqcGAAAAAd0SU1FB94BCRQnOqNu0b4AAAAKSURBVAjXY2AAAAACAAHiIbwzAAAAAElFTkSuQmCC")
 
@@ -202,14 +251,35 @@ def test_progress():
     p.progress = 5
     nt.assert_equal(p._repr_html_(), "<progress style='width:100%' max='10' value='5'></progress>")
 
+@contextmanager
+def _update_interval(pub, interval):
+    saved = pub.update_interval
+    pub.update_interval = interval
+    try:
+        yield
+    finally:
+        pub.flush_updates()
+        pub.update_interval = saved
+
 def test_progress_iter():
-    with capture_output(display=False) as captured:
+    pub = get_ipython().display_pub
+    with _update_interval(pub, 0), \
+            capture_output(display=False) as captured:
         for i in display.ProgressBar(5):
             out = captured.stdout
             nt.assert_in('{0}/5'.format(i), out)
     out = captured.stdout
     nt.assert_in('5/5', out)
 
+    # With coalesced updates, the final state is still published right away
+    with _update_interval(pub, 3600), \
+            capture_output(display=False) as captured:
+        for i in display.ProgressBar(5):
+            pass
+        out = captured.stdout
+    nt.assert_not_in('3/5', out)
+    nt.assert_in('5/5', out)
+
 def test_json():
     d = {'a': 5}
     lis = [d]
@@ -353,6 +423,40 @@ def test_update_display():
     })
 
 
+def test_update_display_coalesced():
+    ip = get_ipython()
+    pub = ip.display_pub
+    with mock.patch.object(pub, 'publish') as publish, \
+            _update_interval(pub, 3600):
+        for i in range(100):
+            display.update_display(i, display_id='c1')
+        # Only the first update is published right away
+        nt.assert_equal(publish.call_count, 1)
+        nt.assert_equal(publish.call_args[1]['data']['text/plain'], '0')
+        # Other messages publish the held updates first
+        display.display('new')
+        nt.assert_equal([c[1]['data']['text/plain'] for c in
+                         publish.call_args_list[1:]], ['99', repr('new')])
+        nt.assert_true(publish.call_args_list[1][1]['update'])
+        display.update_display('late', display_id='c1')
+        nt.assert_equal(publish.call_count, 3)
+        # and so does the end of the cell
+        ip.events.trigger('post_execute')
+        nt.assert_equal(publish.call_count, 4)
+        nt.assert_equal(publish.call_args[1]['data']['text/plain'],
+                        repr('late'))
+        display.update_display('next', display_id='c1')
+        nt.assert_equal(publish.call_count, 5)
+
+    # Updates aren't coalesced by default
+    nt.assert_equal(DisplayPublisher().update_interval, 0)
+    with mock.patch.object(pub, 'publish') as publish, \
+            _update_interval(pub, DisplayPublisher().update_interval):
+        for i in range(3):
+            display.update_display(i, display_id='c3')
+    nt.assert_equal(publish.call_count, 3)
+
+
 def test_display_handle():
     ip = get_ipython()
     handle = display.DisplayHandle()
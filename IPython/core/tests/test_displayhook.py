@@ -1,3 +1,5 @@
+import nose.tools as nt
+
 from IPython.testing.tools import AssertPrints, AssertNotPrints
 
 ip = get_ipython()
@@ -101,3 +103,51 @@ def test_interactivehooks_ast_modes_semi_supress():
 
     finally:
         ip.ast_node_interactivity = saved_mode
+
+
+def test_output_cache_max_bytes():
+    dh = ip.displayhook
+    oh = ip.user_ns['_oh']
+    save = dh.cache_max_bytes, dh.cache_spill
+    dh.cache_max_bytes, dh.cache_spill = 25000, True
+    try:
+        ip.run_cell("b'x' * 10000", store_history=True)
+        first = ip.execution_count - 1
+        ip.run_cell("(lambda: 0, b'y' * 10000)", store_history=True)
+        second = ip.execution_count - 1
+        ip.run_cell("b'z' * 10000", store_history=True)
+        # The oldest result was saved to disk, and loads back
+        nt.assert_true(oh.is_spilled(first))
+        nt.assert_not_in('_%i' % first, ip.user_ns)
+        nt.assert_equal(oh[first], b'x' * 10000)
+        ip.run_cell("b'w' * 10000", store_history=True)
+        # Results which can't be pickled are dropped
+        nt.assert_not_in(second, oh)
+        nt.assert_less_equal(oh.memory_size, 25000)
+    finally:
+        dh.cache_max_bytes, dh.cache_spill = save
+
+def test_compute_format_data_accepted_mimetypes():
+    calls = []
+    class HTMLish(object):
+        def _repr_html_(self):
+            calls.append('html')
+            return '<b>html</b>'
+
+    ip = get_ipython()
+    dh = ip.displayhook
+    html_formatter = ip.display_formatter.formatters['text/html']
+    save = dh.accepted_mimetypes, html_formatter.enabled
+    dh.accepted_mimetypes = ['text/plain']
+    html_formatter.enabled = True
+    try:
+        format_dict, md_dict = dh.compute_format_data(HTMLish())
+        nt.assert_equal(list(format_dict), ['text/plain'])
+        ip.user_ns['obj_html'] = HTMLish()
+        with AssertPrints('HTMLish at'):
+            ip.run_cell('obj_html')
+        nt.assert_equal(calls, [])
+        nt.assert_equal(format_dict['text/html'], '<b>html</b>')
+    finally:
+        dh.accepted_mimetypes, html_formatter.enabled = save
+        ip.user_ns.pop('obj_html', None)
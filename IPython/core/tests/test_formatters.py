@@ -13,7 +13,7 @@
 from traitlets.config import Config
 from IPython.core.formatters import (
     PlainTextFormatter, HTMLFormatter, PDFFormatter, _mod_name_key,
-    DisplayFormatter, JSONFormatter,
+    DisplayFormatter, JSONFormatter, LazyFormatDict,
 )
 from IPython.utils.io import capture_output
 
@@ -215,6 +215,32 @@ def test_pop():
         f.pop(A)
     nt.assert_is(f.pop(A, None), None)
 
+def test_lookup_by_type_cache():
+    f = HTMLFormatter()
+    # Negative results are cached, and dropped when printers are added
+    with nt.assert_raises(KeyError):
+        f.lookup_by_type(B)
+    f.for_type(A, foo_printer)
+    nt.assert_is(f.lookup_by_type(B), foo_printer)
+    f.for_type(B, lambda obj: 'B')
+    nt.assert_is_not(f.lookup_by_type(B), foo_printer)
+    f.pop(B)
+    nt.assert_is(f.lookup_by_type(B), foo_printer)
+    f.pop(A)
+    with nt.assert_raises(KeyError):
+        f.lookup_by_type(B)
+    f.for_type_by_name(A.__module__, 'A', foo_printer)
+    nt.assert_is(f.lookup_by_type(B), foo_printer)
+    # Changing the registries directly is also noticed
+    del f.type_printers[A]
+    with nt.assert_raises(KeyError):
+        f.lookup_by_type(B)
+    f.type_printers[A] = foo_printer
+    nt.assert_is(f.lookup_by_type(B), foo_printer)
+    f.type_printers = {}
+    with nt.assert_raises(KeyError):
+        f.lookup_by_type(B)
+
 def test_pop_string():
     f = PlainTextFormatter()
     type_str = '%s.%s' % (C.__module__, 'C')
@@ -388,6 +414,22 @@ def test_pretty_max_seq_length():
     lines = text.splitlines()
     nt.assert_equal(len(lines), 1024)
 
+def test_pretty_budget():
+    f = PlainTextFormatter(max_output_size=100)
+    text = f({i: 'x' * 20 for i in range(1000)})
+    nt.assert_true(text.endswith('...} <output truncated: longer than 100 characters>'))
+    nt.assert_less(len(text), 200)
+    text = f('y' * 10000)
+    nt.assert_equal(text, repr('y' * 10000)[:100] + '...'
+                    ' <output truncated: longer than 100 characters>')
+
+    f = PlainTextFormatter(max_depth=2)
+    nt.assert_equal(f([[[1]], {'a': {'b': 1}}, ((),)]), "[[[...]], {'a': {...}}, ((),)]")
+
+    f = PlainTextFormatter(max_time=1e-9)
+    text = f([list(range(10))] * 1000)
+    nt.assert_true(text.endswith('...] <output truncated: took longer than 1e-09s>'))
+
 
 def test_ipython_display_formatter():
     """Objects with _ipython_display_ defined bypass other formatters"""
@@ -435,6 +477,26 @@ def _repr_json_(self):
     nt.assert_equal(len(w), 1)
 
 
+
+def test_json_cleaned():
+    class Tuples(object):
+        def _repr_json_(self):
+            return {'a': (1, 2), 1: float('nan')}
+
+    class Circular(object):
+        def _repr_json_(self):
+            data = {}
+            data['self'] = data
+            return data
+
+    f = JSONFormatter()
+    nt.assert_equal(f(Tuples()), {'a': [1, 2], '1': 'nan'})
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        nt.assert_is_none(f(Circular()))
+    nt.assert_equal(len(w), 1)
+    nt.assert_in("can't be encoded in JSON", str(w[0].message))
+
 def test_repr_mime():
     class HasReprMime(object):
         def _repr_mimebundle_(self, include=None, exclude=None):
@@ -531,3 +593,48 @@ def _repr_mimebundle_(self, include=None, exclude=None):
     obj = BadReprMime()
     d, md = f.format(obj)
     nt.assert_in('text/plain', d)
+
+def test_format_accept():
+    calls = []
+    class Lazy(object):
+        def _repr_html_(self):
+            calls.append('html')
+            return '<b>lazy</b>'
+        def _repr_latex_(self):
+            calls.append('latex')
+            return r'$lazy$', {'isolated': True}
+        def _repr_mimebundle_(self, include=None, exclude=None):
+            calls.append(('bundle', include))
+            return {'application/x-lazy': 'lazy'}
+
+    f = DisplayFormatter()
+    d, md = f.format(Lazy(), accept=['text/plain'])
+    nt.assert_is_instance(d, LazyFormatDict)
+    nt.assert_equal(sorted(d), ['text/plain'])
+    nt.assert_equal(calls, [('bundle', ['text/plain'])])
+    nt.assert_is(md, d.metadata)
+
+    # other types are computed when looked up, once
+    nt.assert_equal(d['text/html'], '<b>lazy</b>')
+    nt.assert_equal(d['text/html'], '<b>lazy</b>')
+    nt.assert_equal(calls.count('html'), 1)
+    with nt.assert_raises(KeyError):
+        d['image/png']
+    nt.assert_not_in('latex', calls)
+
+    d.compute_all()
+    nt.assert_equal(sorted(d), ['application/x-lazy', 'text/html',
+                                'text/latex', 'text/plain'])
+    nt.assert_equal(md, {'text/latex': {'isolated': True}})
+    nt.assert_equal(calls.count('html'), 1)
+
+def test_format_accept_exclude():
+    f = DisplayFormatter()
+    class HTMLish(object):
+        def _repr_html_(self):
+            return '<b>html</b>'
+
+    d, md = f.format(HTMLish(), accept=['text/plain'], exclude=['text/html'])
+    with nt.assert_raises(KeyError):
+        d['text/html']
+    nt.assert_equal(sorted(d.compute_all()), ['text/plain'])
@@ -639,3 +639,52 @@ def test_find_next_indent():
         res = isp.find_next_indent(code)
         msg = "{!r} != {!r} (expected)\n Code: {!r}".format(res, exp, code)
         assert res == exp, msg
+
+
+def test_incremental_check_complete():
+    # Every query must agree with a from-scratch check_complete, whether the
+    # cell grows line by line, shrinks, or has an earlier line edited.
+    cells = [
+        'a = 1',
+        'for a in range(5):\n    b = a\n    if b:\n        pass\n\n',
+        'def f(x):\n    return x\n',
+        'x = [1,\n2,\n3]\n',
+        's = """abc\ndef\n"""\n',
+        '%%cellm a\nfoo\n\n',
+        '%ls\nx = !ls\n',
+        'def a():\n x=1\n global x\n',
+        'raise = 2\nx = 1\n',
+        'if True:\n    a = (1 +\n         2)\n',
+    ]
+    for splitter in (isp.InputSplitter(), isp.IPythonInputSplitter()):
+        checker = isp.IncrementalCompleteChecker(splitter)
+        reference = type(splitter)()
+        queries = []
+        for cell in cells:
+            lines = cell.splitlines(True)
+            # Grow, then shrink back, then edit the first line.
+            queries.extend(''.join(lines[:i]) for i in range(1, len(lines) + 1))
+            queries.extend(''.join(lines[:i]) for i in range(len(lines), 0, -1))
+            queries.append('#\n' + cell)
+        for src in queries:
+            nt.assert_equal(checker.check_complete(src),
+                            reference.check_complete(src), src)
+
+        # Someone else using the splitter must not confuse the checker
+        checker.check_complete('if a:\n')
+        splitter.reset()
+        splitter.push('x = 1')
+        nt.assert_equal(checker.check_complete('if a:\n    b\n'),
+                        ('incomplete', 4))
+
+
+def test_find_next_indent_resume():
+    # Resuming from the point returned for a prefix gives the same answer as
+    # scanning the whole code.
+    code = ''.join(c + '\n' for c, _ in indentation_samples)
+    lines = code.splitlines(True)
+    resume = 0, (0,)
+    for i in range(1, len(lines) + 1):
+        prefix = ''.join(lines[:i])[:-1]
+        n, resume = isp._find_next_indent(prefix, resume)
+        nt.assert_equal(n, isp.find_next_indent(prefix), prefix)
@@ -22,8 +22,10 @@
 
 import nose.tools as nt
 
+from IPython.core.compilerop import BytecodeCache
 from IPython.core.error import InputRejected
 from IPython.core.inputtransformer import InputTransformer
+from IPython.core.interactiveshell import ExecutionInfo, ExecutionResult
 from IPython.testing.decorators import (
     skipif, skip_win32, onlyif_unicode_paths, onlyif_cmds_exist,
 )
@@ -333,6 +335,31 @@ def failing_hook(*args, **kwargs):
         finally:
             trap.hook = save_hook
 
+    def test_show_silent_tracebacks(self):
+        """show_silent_tracebacks=False skips the tracebacks of silent runs"""
+        code = compile("1/0", "<silent>", "exec")
+
+        def run(silent):
+            result = ExecutionResult(ExecutionInfo("1/0", False, silent, True))
+            ip.run_code(code, result)
+            return result
+
+        ip.show_silent_tracebacks = False
+        try:
+            with mock.patch.object(ip.InteractiveTB, 'structured_traceback'
+                                   ) as structured_traceback:
+                res = run(silent=True)
+            structured_traceback.assert_not_called()
+            self.assertIsInstance(res.error_in_exec, ZeroDivisionError)
+            # The exception is still there for %debug
+            self.assertIs(sys.last_value, res.error_in_exec)
+            with tt.AssertPrints('ZeroDivisionError'):
+                run(silent=False)
+        finally:
+            ip.show_silent_tracebacks = True
+        with tt.AssertPrints('ZeroDivisionError'):
+            run(silent=True)
+
     def test_ofind_line_magic(self):
         from IPython.core.magic import register_line_magic
         
@@ -517,6 +544,64 @@ def test_1(self):
         """
         ip.safe_execfile(self.fname, {}, raise_exceptions=True)
 
+
+class TestSafeExecfileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = BytecodeCache(join(self.tmpdir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_py(self):
+        fname = join(self.tmpdir, 'cached.py')
+        with open(fname, 'w') as f:
+            f.write("ran = ran + 1\n")
+        ns = {'ran': 0}
+        for i in range(2):
+            ip.safe_execfile(fname, ns, raise_exceptions=True,
+                             cache=self.cache)
+        self.assertEqual(ns['ran'], 2)
+        with open(fname) as f:
+            self.assertIsNotNone(self.cache.get(fname, f.read().encode()))
+
+    def test_ipy(self):
+        fname = join(self.tmpdir, 'cached.ipy')
+        with open(fname, 'w') as f:
+            f.write("x = !echo ok\n"
+                    "cached_ipy_result = x[0]\n")
+        ip.safe_execfile_ipy(fname, raise_exceptions=True, cache=self.cache)
+        self.assertEqual(ip.user_ns.pop('cached_ipy_result'), 'ok')
+        # The second run neither transforms nor compiles the file
+        transformer = ip.input_transformer_manager
+        with mock.patch.object(transformer, 'transform_cell') as transform:
+            ip.safe_execfile_ipy(fname, raise_exceptions=True,
+                                 cache=self.cache)
+            self.assertFalse(transform.called)
+        self.assertEqual(ip.user_ns.pop('cached_ipy_result'), 'ok')
+
+    def test_ipy_single_line(self):
+        # A single line with blank lines is prefiltered like a cell, so
+        # automagics work.
+        fname = join(self.tmpdir, 'automagic.ipy')
+        source = "pwd\n\n"
+        self.assertIsNone(ip._compile_ipy_file(fname, source, self.cache))
+        self.assertIsNone(self.cache.get(fname, source))
+        # Several lines are compiled as a whole, without prefiltering
+        source = "a = 1\npwd\n"
+        self.assertIsNotNone(ip._compile_ipy_file(fname, source, self.cache))
+
+    def test_ipy_error(self):
+        fname = join(self.tmpdir, 'error.ipy')
+        with open(fname, 'w') as f:
+            f.write("a = 1\n"
+                    "1/0\n")
+        with self.assertRaises(ZeroDivisionError):
+            ip.safe_execfile_ipy(fname, raise_exceptions=True,
+                                 cache=self.cache)
+
+
 class ExitCodeChecks(tt.TempFileMixin):
     def test_exit_code_ok(self):
         self.system('exit 0')
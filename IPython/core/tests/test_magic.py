@@ -7,6 +7,7 @@
 import io
 import os
 import re
+import subprocess
 import sys
 import warnings
 from unittest import TestCase
@@ -456,9 +457,9 @@ def test_dirops():
 
 
 def test_xmode():
-    # Calling xmode three times should be a no-op
+    # Calling xmode five times should be a no-op
     xmode = _ip.InteractiveTB.mode
-    for i in range(3):
+    for i in range(5):
         _ip.magic("xmode")
     nt.assert_equal(_ip.InteractiveTB.mode, xmode)
     
@@ -860,7 +861,7 @@ def test_script_defaults():
         except Exception:
             pass
         else:
-            nt.assert_in(cmd, ip.magics_manager.magics['cell'])
+            nt.assert_is_not_none(ip.find_cell_magic(cmd))
 
 
 @magics_class
@@ -894,6 +895,57 @@ def test_line_cell_info():
     nt.assert_true(oinfo['ismagic'])
     nt.assert_equal(oinfo['docstring'], FooFoo.line_foo.__doc__)
 
+def test_lazy_magics_table():
+    # The names declared for lazy registration match the classes
+    from IPython.core.magics import lazy_magics
+    from IPython.utils.importstring import import_item
+    for class_name, line, cell in lazy_magics:
+        cls = import_item(class_name)
+        nt.assert_equal(sorted(cls.magics['line']), sorted(line))
+        if cls.__name__ == 'ScriptMagics':
+            # The script magics are generated at instantiation
+            nt.assert_equal(sorted(cls.magics['cell']), ['script'])
+        else:
+            nt.assert_equal(sorted(cls.magics['cell']), sorted(cell))
+
+def test_lazy_magics():
+    ip = get_ipython()
+    mm = magic.MagicsManager(shell=ip, user_magics=ip.magics_manager.user_magics)
+    mm.register_lazy('IPython.core.tests.test_magic.FooFoo',
+                     line=['foo'], cell=['foo'])
+    nt.assert_not_in('FooFoo', mm.registry)
+    nt.assert_in('foo', mm.magic_names()['line'])
+    nt.assert_in('foo', mm.magic_names()['cell'])
+
+    # Looking one magic up loads all the magics of the class
+    cell_foo = mm.find_magic('foo', 'cell')
+    nt.assert_equal(cell_foo.__doc__, FooFoo.cell_foo.__doc__)
+    nt.assert_is(mm.magics['line']['foo'].__self__, mm.registry['FooFoo'])
+    nt.assert_equal(mm.lazy_magics, dict(line={}, cell={}))
+
+    # Magics registered before the class is loaded aren't clobbered
+    mm = magic.MagicsManager(shell=ip, user_magics=ip.magics_manager.user_magics)
+    mm.register_lazy('IPython.core.tests.test_magic.FooFoo',
+                     line=['foo'], cell=['foo'])
+    func = lambda line: line
+    mm.register_function(func, 'line', 'foo')
+    nt.assert_is(mm.find_magic('foo', 'line'), func)
+    mm.load_lazy('FooFoo')
+    nt.assert_is(mm.find_magic('foo', 'line'), func)
+    nt.assert_is(mm.find_magic('foo', 'cell').__self__, mm.registry['FooFoo'])
+
+def test_startup_loads_no_magics():
+    # A new shell, with its colors set up, hasn't loaded any builtin magics
+    code = ('from IPython.core.interactiveshell import InteractiveShell\n'
+            'ip = InteractiveShell.instance(colors="Linux")\n'
+            'print(sorted(ip.magics_manager.registry))\n'
+            'print(ip.InteractiveTB.color_scheme_table.active_scheme_name)\n')
+    import IPython
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(
+        os.path.dirname(os.path.abspath(IPython.__file__))))
+    out = subprocess.check_output([sys.executable, '-c', code], env=env)
+    nt.assert_equal(out.decode().split(), ["['UserMagics']", 'Linux'])
+
 def test_multiple_magics():
     ip = get_ipython()
     foo1 = FooFoo(ip)
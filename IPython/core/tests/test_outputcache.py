@@ -0,0 +1,74 @@
+# coding: utf-8
+"""Tests for the output cache."""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+import os
+import sys
+
+import nose.tools as nt
+
+from IPython.core.outputcache import OutputCache, estimate_size
+from IPython.testing.decorators import skipif_not_numpy
+
+
+def test_estimate_size():
+    nt.assert_equal(estimate_size(b'x' * 1000), sys.getsizeof(b'x' * 1000))
+    strings = ['x' * 1000 for i in range(10)]
+    nt.assert_greater(estimate_size(strings), 10000)
+    nt.assert_greater(estimate_size({'a': strings}), 10000)
+
+    class Holder(object):
+        pass
+    h = Holder()
+    h.data = b'x' * 10000
+    nt.assert_greater(estimate_size(h), 10000)
+
+
+@skipif_not_numpy
+def test_estimate_size_numpy():
+    import numpy
+    a = numpy.zeros(10000)
+    nt.assert_greater_equal(estimate_size(a), a.nbytes)
+    nt.assert_greater_equal(estimate_size(a[:5000]), a.nbytes // 2)
+
+
+def test_output_cache_lru():
+    oh = OutputCache()
+    for n in range(1, 4):
+        oh[n] = str(n)
+        oh.record_size(n, 10)
+    nt.assert_equal(oh.memory_size, 30)
+    nt.assert_equal(oh[1], '1')
+    nt.assert_equal(oh.least_recently_used(), [2, 3, 1])
+    del oh[3]
+    nt.assert_equal(oh.memory_size, 20)
+    nt.assert_equal(oh.pop(2), '2')
+    nt.assert_equal(oh.pop(2, None), None)
+    nt.assert_equal(oh.least_recently_used(), [1])
+
+
+def test_output_cache_spill():
+    oh = OutputCache()
+    oh[1] = list(range(10))
+    oh.record_size(1, 100)
+    oh[2] = lambda: None
+    nt.assert_true(oh.spill(1))
+    nt.assert_false(oh.spill(2))
+    nt.assert_true(oh.is_spilled(1))
+    nt.assert_false(oh.is_spilled(2))
+    nt.assert_equal(oh.memory_size, 0)
+    # Spilled values are loaded back transparently
+    nt.assert_equal(oh[1], list(range(10)))
+    nt.assert_equal(oh.get(1), list(range(10)))
+    nt.assert_equal(dict(oh.items())[1], list(range(10)))
+    nt.assert_in(1, oh)
+    path = dict.__getitem__(oh, 1).path
+    nt.assert_true(os.path.exists(path))
+    oh[1] = 'new'
+    nt.assert_false(os.path.exists(path))
+    oh.spill(1)
+    path = dict.__getitem__(oh, 1).path
+    oh.clear()
+    nt.assert_false(os.path.exists(path))
@@ -6,6 +6,7 @@
 
 
 from io import UnsupportedOperation, BytesIO
+from unittest import mock
 
 import matplotlib
 matplotlib.use('Agg')
@@ -79,6 +80,49 @@ def test_retina_figure():
     nt.assert_in('width', md)
     nt.assert_in('height', md)
 
+def test_print_figure_cached():
+    fig = plt.figure()
+    ax = fig.add_subplot(1,1,1)
+    ax.plot([1,2,3])
+    with mock.patch.object(fig.canvas, 'print_figure',
+                           wraps=fig.canvas.print_figure) as printer:
+        png = pt.print_figure(fig, 'png')
+        nt.assert_equal(pt.print_figure(fig, 'png'), png)
+        nt.assert_equal(printer.call_count, 1)
+        pt.print_figure(fig, 'svg')
+        nt.assert_equal(printer.call_count, 2)
+        # Modifying the figure makes a new revision
+        revision = pt.figure_revision(fig).revision
+        ax.plot([3,2,1])
+        nt.assert_greater(pt.figure_revision(fig).revision, revision)
+        nt.assert_not_equal(pt.print_figure(fig, 'png'), png)
+        nt.assert_equal(printer.call_count, 3)
+        with matplotlib.rc_context({'lines.linewidth': 5}):
+            pt.print_figure(fig, 'png')
+        nt.assert_equal(printer.call_count, 4)
+    plt.close('all')
+
+def test_print_figure_invalidate():
+    fig = plt.figure()
+    ax = fig.add_subplot(1,1,1)
+    im = ax.imshow([[0., 1.], [1., 0.]])
+    with mock.patch.object(fig.canvas, 'print_figure',
+                           wraps=fig.canvas.print_figure) as printer:
+        png = pt.print_figure(fig, 'png')
+        # In place changes aren't reported by the figure
+        im.get_array()[:] = 0.5
+        nt.assert_equal(pt.print_figure(fig, 'png'), png)
+        pt.figure_revision(fig).invalidate()
+        nt.assert_not_equal(pt.print_figure(fig, 'png'), png)
+        nt.assert_equal(printer.call_count, 2)
+
+        # Figures with animated artists aren't cached
+        ax.plot([1,2,3], animated=True)
+        pt.print_figure(fig, 'png')
+        pt.print_figure(fig, 'png')
+        nt.assert_equal(printer.call_count, 4)
+    plt.close('all')
+
 _fmt_mime_map = {
     'png': 'image/png',
     'jpeg': 'image/jpeg',
@@ -140,6 +184,34 @@ def test_select_figure_formats_bad():
     with nt.assert_raises(ValueError):
         pt.select_figure_formats(ip, ['retina', 'pdf', 'bar', 'bad'])
 
+def test_select_figure_formats_parallel():
+    ip = get_ipython()
+    formatters = ip.display_formatter.formatters
+    fig = plt.figure()
+    ax = fig.add_subplot(1,1,1)
+    ax.plot([1,2,3])
+    mimes = ['image/png', 'image/svg+xml', 'application/pdf']
+    enabled = [formatters[mime].enabled for mime in mimes]
+    try:
+        pt.select_figure_formats(ip, {'png', 'svg', 'pdf'}, parallel=2)
+        for mime in mimes:
+            formatters[mime].enabled = True
+        png = formatters['image/png'](fig)
+        assert png.startswith(_PNG)
+        # The other formats were printed along with png
+        nt.assert_equal(len(pt.figure_revision(fig).renders), 3)
+        with mock.patch.object(fig.canvas, 'print_figure') as printer:
+            svg = formatters['image/svg+xml'](fig)
+            pdf = formatters['application/pdf'](fig)
+        nt.assert_false(printer.called)
+        nt.assert_in('<svg', svg)
+        assert pdf.startswith(b'%PDF')
+    finally:
+        for mime, was_enabled in zip(mimes, enabled):
+            formatters[mime].enabled = was_enabled
+        pt.select_figure_formats(ip, 'png')
+        plt.close('all')
+
 def test_import_pylab():
     ns = {}
     pt.import_pylab(ns, import_all=False)
@@ -0,0 +1,70 @@
+# coding: utf-8
+"""Tests for the startup profiler."""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+import json
+import os
+import sys
+
+import nose.tools as nt
+
+from IPython.core.startupprofile import StartupProfiler, startup_step
+from IPython.utils.tempdir import TemporaryDirectory
+
+
+def _names(entry):
+    return [c['name'] for c in entry['children']]
+
+
+def test_startup_profiler():
+    with TemporaryDirectory() as td:
+        with open(os.path.join(td, 'sp_outer.py'), 'w') as f:
+            f.write('import sp_inner\n')
+        with open(os.path.join(td, 'sp_inner.py'), 'w') as f:
+            f.write('x = 1\n')
+        sys.path.insert(0, td)
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            with profiler.timed('phase'):
+                with startup_step(profiler, 'ext', 'extension'):
+                    import sp_outer
+        finally:
+            profiler.stop()
+            sys.path.remove(td)
+            sys.modules.pop('sp_outer', None)
+            sys.modules.pop('sp_inner', None)
+
+    nt.assert_not_in(profiler._finder, sys.meta_path)
+    # The real loader is left on the imported module
+    nt.assert_equal(type(sp_outer.__loader__).__name__, 'SourceFileLoader')
+
+    data = profiler.to_dict()
+    nt.assert_equal(_names(data), ['phase'])
+    phase = data['children'][0]
+    nt.assert_equal(_names(phase), ['ext'])
+    ext = phase['children'][0]
+    nt.assert_equal(ext['kind'], 'extension')
+    nt.assert_equal(_names(ext), ['sp_outer'])
+    outer = ext['children'][0]
+    nt.assert_equal(outer['kind'], 'import')
+    nt.assert_equal(_names(outer), ['sp_inner'])
+    nt.assert_true(data['duration'] >= phase['duration'] >= outer['duration'])
+    json.dumps(data)
+
+    report = profiler.format_report(min_duration=0)
+    nt.assert_in('  phase', report)
+    nt.assert_in('extension ext', report)
+    nt.assert_in('import sp_inner', report)
+
+    # Nothing is recorded once stopped
+    with profiler.timed('late') as entry:
+        nt.assert_is_none(entry)
+    nt.assert_equal(_names(profiler.to_dict()), ['phase'])
+
+
+def test_startup_step_without_profiler():
+    with startup_step(None, 'phase') as entry:
+        nt.assert_is_none(entry)
@@ -2,19 +2,24 @@
 """Tests for IPython.core.ultratb
 """
 import io
+import json
+import linecache
 import logging
 import sys
 import os.path
+import time
 from textwrap import dedent
 import traceback
 import unittest
 from unittest import mock
 
-from ..ultratb import ColorTB, VerboseTB, find_recursion
+from ..ultratb import (ColorTB, ReprBudget, SourceIndex, VerboseTB,
+                       find_recursion)
 
 
 from IPython.testing import tools as tt
 from IPython.testing.decorators import onlyif_unicode_paths
+from IPython.utils.capture import capture_output
 from IPython.utils.syspathcontext import prepended_to_syspath
 from IPython.utils.tempdir import TemporaryDirectory
 
@@ -329,6 +334,30 @@ def capture_exc(*args, **kwargs):
         self.assertEqual(last_unique, 2)
         self.assertEqual(repeat_length, 3)
 
+    def test_recursion_records_not_extracted(self):
+        """Only the records of the frames shown are extracted"""
+        try:
+            _recurse_a()
+        except RecursionError:
+            etype, evalue, tb = sys.exc_info()
+        n_frames = len(traceback.extract_tb(tb))
+        vtb = VerboseTB(color_scheme='NoColor')
+        with mock.patch.object(vtb, 'get_records', wraps=vtb.get_records) as m:
+            text = vtb.text(etype, evalue, tb)
+        self.assertIn('2 frames repeated', text)
+        limit = m.call_args[0][3]
+        # The test's frame, _recurse_a, _recurse_b, and _recurse_a again
+        self.assertEqual(limit, 4)
+        self.assertLess(limit, n_frames)
+        self.assertEqual(len(vtb.get_records(tb, 5, 0, limit)), limit)
+
+
+def _recurse_a():
+    _recurse_b()
+
+def _recurse_b():
+    _recurse_a()
+
 
 #----------------------------------------------------------------------------
 
@@ -374,6 +403,192 @@ def eggs(f, g, z=globals()):
     buff.write('')
 
 
+class SlowRepr(object):
+    calls = 0
+
+    def __repr__(self):
+        SlowRepr.calls += 1
+        time.sleep(0.01)
+        return 'slow' * 1000
+
+
+class ReprBudgetTest(unittest.TestCase):
+    def test_limits(self):
+        budget = ReprBudget(max_size=10, max_items=5, max_time=0)
+        self.assertEqual(budget([1, 2]), '[1, 2]')
+        self.assertEqual(budget(list(range(6))), '<list len=6>')
+        self.assertEqual(budget('x' * 20, repr), "'xxxxxxxxx...")
+        self.assertEqual(budget({'a': 1}), "{'a': 1}")
+        # Strings are cut before their repr is made
+        reprs = []
+        def recording_repr(value):
+            reprs.append(value)
+            return repr(value)
+        self.assertEqual(budget(b'y' * 10**6, recording_repr), "b'yyyyyyyy...")
+        self.assertEqual(reprs, [b'y' * 10])
+
+    def test_array_summary(self):
+        try:
+            import numpy as np
+        except ImportError:
+            raise unittest.SkipTest("requires numpy")
+        budget = ReprBudget(max_items=100)
+        self.assertEqual(budget(np.zeros((20, 10))),
+                         '<ndarray shape=(20, 10) dtype=float64>')
+        self.assertIn('0.', budget(np.zeros(3)))
+
+    def test_time_budget(self):
+        budget = ReprBudget(max_size=20, max_time=1e-9)
+        SlowRepr.calls = 0
+        value = SlowRepr()
+        self.assertEqual(budget(value, repr), 'slow' * 5 + '...')
+        # Formatted values are remembered
+        self.assertEqual(budget(value, repr), 'slow' * 5 + '...')
+        self.assertEqual(SlowRepr.calls, 1)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(budget(SlowRepr(), repr),
+                         '<SlowRepr; repr skipped>')
+        self.assertEqual(SlowRepr.calls, 1)
+
+    def test_verbose_tb(self):
+        def fail(big, slow):
+            other = SlowRepr()
+            return big[0] / 0 + slow + other
+
+        handler = VerboseTB(color_scheme='NoColor', ostream=io.StringIO())
+        handler.repr_time_budget = 0.005
+        SlowRepr.calls = 0
+        try:
+            fail(list(range(2000)), SlowRepr())
+        except ZeroDivisionError:
+            text = handler.text(*sys.exc_info())
+        self.assertIn('big=<list len=2000>', text)
+        self.assertIn('slow=slowslow', text)
+        self.assertIn('other = <SlowRepr; repr skipped>', text)
+        self.assertEqual(SlowRepr.calls, 1)
+        self.assertLess(len(text), 3000)
+
+
+class SourceIndexTest(unittest.TestCase):
+    def test_names(self):
+        with TemporaryDirectory() as td:
+            fname = os.path.join(td, 'src.py')
+            with open(fname, 'w') as f:
+                f.write('x = foo.bar(y)\n')
+            index = SourceIndex()
+            index.begin()
+            self.assertEqual(index.names(fname, 1), ['x', 'foo.bar', 'y'])
+            with mock.patch('IPython.core.ultratb._names_on_line') as names:
+                self.assertEqual(index.names(fname, 1), ['x', 'foo.bar', 'y'])
+            names.assert_not_called()
+
+            # Modified files are tokenized again, in the next traceback
+            with open(fname, 'w') as f:
+                f.write('z = 1\n')
+            os.utime(fname, (0, 0))
+            linecache.checkcache(fname)
+            index.begin()
+            self.assertEqual(index.names(fname, 1), ['z'])
+
+    def test_line_format(self):
+        index = SourceIndex()
+        calls = []
+
+        def make_format():
+            calls.append(1)
+            return lambda line, out: (line.upper(), False)
+
+        line_format = index.line_format('Linux', make_format)
+        self.assertEqual(line_format('a = 1\n', 'str'), ('A = 1\n', False))
+        self.assertEqual(line_format('a = 1\n', 'str'), ('A = 1\n', False))
+        line_format = index.line_format('Linux', make_format)
+        self.assertEqual(line_format('a = 1\n', 'str'), ('A = 1\n', False))
+        self.assertEqual(len(calls), 1)
+
+    def test_abspath(self):
+        index = SourceIndex()
+        with TemporaryDirectory() as td:
+            with open(os.path.join(td, 'rel.py'), 'w') as f:
+                f.write('pass\n')
+            self.assertEqual(index.abspath('rel.py'), 'rel.py')
+            with prepended_to_syspath(td):
+                self.assertEqual(index.abspath('rel.py'),
+                                 os.path.join(os.path.abspath(td), 'rel.py'))
+            self.assertEqual(index.abspath('rel.py'), 'rel.py')
+
+
+def inner(x):
+    return 1 / x
+
+def outer(y):
+    return inner(y - 1)
+
+def chain():
+    try:
+        raise ValueError('first')
+    except ValueError as e:
+        raise RuntimeError('second') from e
+
+
+class CollapsedTest(unittest.TestCase):
+    def setUp(self):
+        ip.push({'inner': inner, 'outer': outer, 'chain': chain})
+        self.mode = ip.InteractiveTB.mode
+        ip.InteractiveTB.set_mode('Collapsed')
+
+    def tearDown(self):
+        ip.InteractiveTB.set_mode(self.mode)
+
+    def test_summary(self):
+        with tt.AssertPrints(['[2]', 'in inner', 'return 1 / x',
+                              'ZeroDivisionError', '%tb --frame N']):
+            ip.run_cell("outer(1)")
+        # Only the frames are listed
+        with tt.AssertNotPrints('x = 0'):
+            ip.run_cell("outer(1)")
+
+    def test_frame(self):
+        ip.run_cell("outer(1)")
+        with tt.AssertPrints(['in inner(x=0)', '--> ', 'x = 0']):
+            ip.run_cell("%tb --frame 2")
+        with tt.AssertPrints('in outer(y=1)'):
+            ip.run_cell("%tb -f -2")
+        with tt.AssertPrints('No frame 3', channel='stderr'):
+            ip.run_cell("%tb --frame 3")
+        # The traceback shown is still the last one
+        with tt.AssertPrints('in inner(x=0)'):
+            ip.run_cell("%tb --frame 2")
+
+    def test_json(self):
+        ip.run_cell("outer(1)")
+        with capture_output() as captured:
+            ip.run_cell("%tb --json --frame -1")
+        data = json.loads(captured.stdout)
+        self.assertEqual(data['ename'], 'ZeroDivisionError')
+        self.assertEqual([f['name'] for f in data['frames']],
+                         ['<module>', 'outer', 'inner'])
+        self.assertEqual(data['frames'][2]['line'], 'return 1 / x')
+        self.assertIn('x = 0', data['frames'][2]['formatted'])
+        self.assertNotIn('formatted', data['frames'][1])
+
+    def test_chained(self):
+        with tt.AssertPrints(['ValueError: first', 'direct cause', '[1]',
+                              'RuntimeError: second']):
+            ip.run_cell("chain()")
+
+
+def test_minimal_mode():
+    mode = ip.InteractiveTB.mode
+    ip.InteractiveTB.set_mode('Minimal')
+    try:
+        ip.push({'outer': outer})
+        with capture_output() as captured:
+            ip.run_cell("outer(1)")
+    finally:
+        ip.InteractiveTB.set_mode(mode)
+    assert captured.stdout.strip() == 'ZeroDivisionError: division by zero'
+
+
 class TokenizeFailureTest(unittest.TestCase):
     """Tests related to https://github.com/ipython/ipython/issues/6864."""
 
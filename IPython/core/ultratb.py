@@ -38,6 +38,10 @@
   variables (but otherwise includes the information and context given by
   Verbose).
 
+  The Collapsed mode only lists the frames, one line each; frames are then
+  formatted in full on demand (see :class:`LazyTraceback`, and ``%tb
+  --frame N`` in IPython).
+
 .. note::
 
   The verbose mode print all variables in the stack, which means it can
@@ -123,6 +127,8 @@
 from IPython.utils.terminal import get_terminal_size
 from logging import info, error, debug
 
+from traitlets import Bool, Float, Integer
+
 import IPython.utils.colorable as colorable
 
 # Globals
@@ -339,10 +345,24 @@ def fix_frame_records_filenames(records):
 
 
 @with_patch_inspect
-def _fixed_getinnerframes(etb, context=1, tb_offset=0):
+def _fixed_getinnerframes(etb, context=1, tb_offset=0, limit=None):
+    """Records of the frames of a traceback, with their source context.
+
+    Only the first *limit* frames after *tb_offset* are looked at, if given.
+    """
     LNUM_POS, LINES_POS, INDEX_POS = 2, 4, 5
 
-    records = fix_frame_records_filenames(inspect.getinnerframes(etb, context))
+    if limit is None:
+        records = inspect.getinnerframes(etb, context)
+    else:
+        limit += tb_offset
+        records = []
+        tb = etb
+        while tb is not None and len(records) < limit:
+            records.append((tb.tb_frame,) + tuple(
+                inspect.getframeinfo(tb, context))[:5])
+            tb = tb.tb_next
+    records = fix_frame_records_filenames(records)
     # If the error is at the console, don't build any context, since it would
     # otherwise produce 5 blank lines printed out (there is no file at the
     # console)
@@ -354,7 +374,7 @@ def _fixed_getinnerframes(etb, context=1, tb_offset=0):
     except IndexError:
         pass
 
-    aux = traceback.extract_tb(etb)
+    aux = traceback.extract_tb(etb, limit)
     assert len(records) == len(aux)
     for i, (file, lnum, _, _) in enumerate(aux):
         maybeStart = lnum - 1 - context // 2
@@ -368,6 +388,172 @@ def _fixed_getinnerframes(etb, context=1, tb_offset=0):
         records[i] = tuple(buf)
     return records[tb_offset:]
 
+def _names_on_line(file, lnum):
+    """The names used in the statement starting at line lnum of file.
+
+    Returns the unique names, dotted names joined, in order, and whether the
+    statement could be tokenized.
+    """
+    def linereader(file=file, lnum=[lnum], getline=linecache.getline):
+        line = getline(file, lnum[0])
+        lnum[0] += 1
+        return line
+
+    ok = True
+    try:
+        names = []
+        name_cont = False
+
+        for token_type, token, start, end, line in generate_tokens(linereader):
+            # build composite names
+            if token_type == tokenize.NAME and token not in keyword.kwlist:
+                if name_cont:
+                    # Continuation of a dotted name
+                    try:
+                        names[-1].append(token)
+                    except IndexError:
+                        names.append([token])
+                    name_cont = False
+                else:
+                    # Regular new names.  We append everything, the caller
+                    # will be responsible for pruning the list later.  It's
+                    # very tricky to try to prune as we go, b/c composite
+                    # names can fool us.  The pruning at the end is easy
+                    # to do (or the caller can print a list with repeated
+                    # names if so desired.
+                    names.append([token])
+            elif token == '.':
+                name_cont = True
+            elif token_type == tokenize.NEWLINE:
+                break
+
+    except (IndexError, UnicodeDecodeError, SyntaxError):
+        # signals exit of tokenizer
+        # SyntaxError can occur if the file is not actually Python
+        #  - see gh-6300
+        pass
+    except tokenize.TokenError as msg:
+        # Tokenizing may fail for various reasons, many of which are
+        # harmless. (A good example is when the line in question is the
+        # close of a triple-quoted string, cf gh-6864). We don't want to
+        # show this to users, but want make it available for debugging
+        # purposes.
+        _m = ("An unexpected error occurred while tokenizing input\n"
+              "The following traceback may be corrupted or invalid\n"
+              "The error message is: %s\n" % msg)
+        debug(_m)
+        ok = False
+
+    # Join composite names (e.g. "dict.fromkeys")
+    names = ['.'.join(n) for n in names]
+    # prune names list of duplicates, but keep the right order
+    return uniq_stable(names), ok
+
+
+class SourceIndex(object):
+    """What VerboseTB works out from the source files of the frames.
+
+    Keeps the absolute paths found for relative file names, the names used on
+    the line of each frame, and highlighted source lines, so that frames in
+    files seen before, as in deep or recursive tracebacks, cost little more
+    than their variables. Names are kept per file, modification time and
+    line; :meth:`begin` is called for each traceback, to check modification
+    times again. At most *max_entries* lines and names are kept.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.clear()
+
+    def clear(self):
+        self._paths = {}
+        self._sys_path = None
+        self._names = {}
+        self._lines = {}
+        self._mtimes = {}
+
+    def begin(self):
+        """Start a new traceback."""
+        self._mtimes = {}
+
+    def _mtime(self, file):
+        try:
+            return self._mtimes[file]
+        except KeyError:
+            pass
+        try:
+            mtime = os.stat(file).st_mtime
+        except (OSError, ValueError):
+            mtime = None
+        self._mtimes[file] = mtime
+        return mtime
+
+    def abspath(self, file):
+        """Make file absolute by looking for it in sys.path entries, which is
+        also what linecache does. Returns file if it isn't found."""
+        if self._sys_path != sys.path:
+            self._paths = {}
+            self._sys_path = list(sys.path)
+        try:
+            return self._paths[file]
+        except KeyError:
+            pass
+        found = file
+        for dirname in sys.path:
+            try:
+                fullname = os.path.join(dirname, file)
+                if os.path.isfile(fullname):
+                    found = os.path.abspath(fullname)
+                    break
+            except Exception:
+                # Just in case that sys.path contains very
+                # strange entries...
+                pass
+        self._paths[file] = found
+        return found
+
+    def names(self, file, lnum):
+        """The unique names used in the statement at line lnum of file."""
+        # The line itself is part of the key for files which can't be
+        # stat'ed, like the cells of a kernel.
+        key = (file, self._mtime(file), lnum, linecache.getline(file, lnum))
+        try:
+            return list(self._names[key])
+        except KeyError:
+            pass
+        names, ok = _names_on_line(file, lnum)
+        if ok:
+            if len(self._names) >= self.max_entries:
+                self._names.clear()
+            self._names[key] = names
+        return list(names)
+
+    def line_format(self, scheme, make_format):
+        """A function formatting lines like PyColorize.Parser.format2, which
+        remembers the highlighted lines.
+
+        make_format is only called, once, if a line hasn't been seen before.
+        """
+        cache = self._lines.setdefault(scheme, {})
+        formats = []
+
+        def line_format(line, out):
+            key = (line, out)
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+            if not formats:
+                formats.append(make_format())
+            result = formats[0](line, out)
+            if len(cache) >= self.max_entries:
+                cache.clear()
+            cache[key] = result
+            return result
+
+        return line_format
+
+
 # Helper function -- largely belongs to VerboseTB, but we need the same
 # functionality to produce a pseudo verbose TB for SyntaxErrors, so that they
 # can be recognized properly by ipython.el's py-traceback-line-re
@@ -402,6 +588,16 @@ def _format_traceback_lines(lnum, index, lines, Colors, lvals=None,  _line_forma
         i = i + 1
     return res
 
+def _tb_frames(etb, tb_offset=0):
+    """The code objects and line numbers of the frames of a traceback, which
+    identify the frames for find_recursion() without extracting records."""
+    frames = []
+    while etb is not None:
+        frames.append((etb.tb_frame.f_code, etb.tb_lineno))
+        etb = etb.tb_next
+    return frames[tb_offset:]
+
+
 def is_recursion_error(etype, value, records):
     try:
         # RecursionError is new in Python 3.5
@@ -431,7 +627,11 @@ def find_recursion(etype, value, records):
         return len(records), 0
 
     # Select filename, lineno, func_name to track frames with
-    records = [r[1:4] for r in records]
+    return _find_repeat([r[1:4] for r in records])
+
+
+def _find_repeat(records):
+    """find_recursion() for a list of hashable keys identifying the frames."""
     inner_frames = records[-(len(records)//4):]
     frames_repeated = set(inner_frames)
 
@@ -784,6 +984,29 @@ class VerboseTB(TBTools):
     traceback, to be used with alternate interpreters (because their own code
     would appear in the traceback)."""
 
+    repr_max_size = Integer(1000,
+        help="Maximum length of the repr of a variable shown in a verbose "
+             "traceback; longer reprs are truncated."
+    ).tag(config=True)
+
+    repr_max_items = Integer(1000,
+        help="Containers and arrays with more items than this are shown as a "
+             "summary (type, length or shape and dtype) rather than a repr."
+    ).tag(config=True)
+
+    cache_source = Bool(True,
+        help="Keep what is worked out from the source files of the frames "
+             "(paths, names, highlighted lines) from one traceback to the "
+             "next, rather than only within a traceback."
+    ).tag(config=True)
+
+    repr_time_budget = Float(1.0,
+        help="Time, in seconds, spent on the reprs of the variables of a "
+             "traceback. Once it is spent, the remaining variables are only "
+             "summarised. It is checked between reprs, so it can't "
+             "interrupt a slow repr already running. 0 means no limit."
+    ).tag(config=True)
+
     def __init__(self, color_scheme='Linux', call_pdb=False, ostream=None,
                  tb_offset=0, long_header=False, include_vars=True,
                  check_cache=None, debugger_cls = None,
@@ -809,9 +1032,19 @@ def __init__(self, color_scheme='Linux', call_pdb=False, ostream=None,
         self.check_cache = check_cache
 
         self.debugger_cls = debugger_cls or debugger.Pdb
+        self._repr_budget = None
+        self.source_index = SourceIndex()
+
+    def new_repr_budget(self):
+        """A ReprBudget for the variables of one traceback."""
+        return ReprBudget(self.repr_max_size, self.repr_max_items,
+                          self.repr_time_budget)
 
     def format_records(self, records, last_unique, recursion_repeat):
         """Format the stack frames of the traceback"""
+        if not self.cache_source:
+            self.source_index.clear()
+        self.source_index.begin()
         frames = []
         for r in records[:last_unique+recursion_repeat+1]:
             #print '*** record:',file,lnum,func,lines,index  # dbg
@@ -854,28 +1087,23 @@ def format_record(self, frame, file, lnum, func, lines, index):
             # Not a real filename, no problem...
             pass
         elif not os.path.isabs(file):
-            # Try to make the filename absolute by trying all
-            # sys.path entries (which is also what linecache does)
-            for dirname in sys.path:
-                try:
-                    fullname = os.path.join(dirname, file)
-                    if os.path.isfile(fullname):
-                        file = os.path.abspath(fullname)
-                        break
-                except Exception:
-                    # Just in case that sys.path contains very
-                    # strange entries...
-                    pass
+            file = self.source_index.abspath(file)
 
         file = py3compat.cast_unicode(file, util_path.fs_encoding)
         link = tpl_link % util_path.compress_user(file)
         args, varargs, varkw, locals = inspect.getargvalues(frame)
 
+        # Shared by all the frames of the traceback being formatted
+        budget = self._repr_budget or self.new_repr_budget()
+
         if func == '?':
             call = ''
         else:
             # Decide whether to include variable details or not
-            var_repr = self.include_vars and eqrepr or nullrepr
+            if self.include_vars:
+                var_repr = lambda value: '=%s' % budget(value)
+            else:
+                var_repr = nullrepr
             try:
                 call = tpl_call % (func, inspect.formatargvalues(args,
                                                                  varargs, varkw,
@@ -912,60 +1140,9 @@ def format_record(self, frame, file, lnum, func, lines, index):
                 # E.g. https://github.com/ipython/ipython/issues/9486
                 return '%s %s\n' % (link, call)
 
-        def linereader(file=file, lnum=[lnum], getline=linecache.getline):
-            line = getline(file, lnum[0])
-            lnum[0] += 1
-            return line
-
         # Build the list of names on this line of code where the exception
         # occurred.
-        try:
-            names = []
-            name_cont = False
-
-            for token_type, token, start, end, line in generate_tokens(linereader):
-                # build composite names
-                if token_type == tokenize.NAME and token not in keyword.kwlist:
-                    if name_cont:
-                        # Continuation of a dotted name
-                        try:
-                            names[-1].append(token)
-                        except IndexError:
-                            names.append([token])
-                        name_cont = False
-                    else:
-                        # Regular new names.  We append everything, the caller
-                        # will be responsible for pruning the list later.  It's
-                        # very tricky to try to prune as we go, b/c composite
-                        # names can fool us.  The pruning at the end is easy
-                        # to do (or the caller can print a list with repeated
-                        # names if so desired.
-                        names.append([token])
-                elif token == '.':
-                    name_cont = True
-                elif token_type == tokenize.NEWLINE:
-                    break
-
-        except (IndexError, UnicodeDecodeError, SyntaxError):
-            # signals exit of tokenizer
-            # SyntaxError can occur if the file is not actually Python
-            #  - see gh-6300
-            pass
-        except tokenize.TokenError as msg:
-            # Tokenizing may fail for various reasons, many of which are
-            # harmless. (A good example is when the line in question is the
-            # close of a triple-quoted string, cf gh-6864). We don't want to
-            # show this to users, but want make it available for debugging
-            # purposes.
-            _m = ("An unexpected error occurred while tokenizing input\n"
-                  "The following traceback may be corrupted or invalid\n"
-                  "The error message is: %s\n" % msg)
-            debug(_m)
-
-        # Join composite names (e.g. "dict.fromkeys")
-        names = ['.'.join(n) for n in names]
-        # prune names list of duplicates, but keep the right order
-        unique_names = uniq_stable(names)
+        unique_names = self.source_index.names(file, lnum)
 
         # Start loop over vars
         lvals = []
@@ -975,7 +1152,7 @@ def linereader(file=file, lnum=[lnum], getline=linecache.getline):
                 if name_base in frame.f_code.co_varnames:
                     if name_base in locals:
                         try:
-                            value = repr(eval(name_full, locals))
+                            value = budget(eval(name_full, locals), repr)
                         except:
                             value = undefined
                     else:
@@ -984,7 +1161,7 @@ def linereader(file=file, lnum=[lnum], getline=linecache.getline):
                 else:
                     if name_base in frame.f_globals:
                         try:
-                            value = repr(eval(name_full, frame.f_globals))
+                            value = budget(eval(name_full, frame.f_globals), repr)
                         except:
                             value = undefined
                     else:
@@ -1001,7 +1178,9 @@ def linereader(file=file, lnum=[lnum], getline=linecache.getline):
         if index is None:
             return level
         else:
-            _line_format = PyColorize.Parser(style=col_scheme, parent=self).format2
+            _line_format = self.source_index.line_format(
+                col_scheme,
+                lambda: PyColorize.Parser(style=col_scheme, parent=self).format2)
             return '%s%s' % (level, ''.join(
                 _format_traceback_lines(lnum, index, lines, Colors, lvals,
                                          _line_format)))
@@ -1068,18 +1247,34 @@ def format_exception_as_a_whole(self, etype, evalue, etb, number_of_lines_of_con
 
         tb_offset = self.tb_offset if tb_offset is None else tb_offset
         head = self.prepare_header(etype, self.long_header)
-        records = self.get_records(etb, number_of_lines_of_context, tb_offset)
+
+        # Look for a recursion in the raw traceback, so that the records of
+        # the thousands of repeated frames aren't extracted.
+        tb_frames = _tb_frames(etb, tb_offset)
+        if is_recursion_error(orig_etype, evalue, tb_frames):
+            last_unique, recursion_repeat = _find_repeat(tb_frames)
+            limit = last_unique + recursion_repeat + 2
+        else:
+            last_unique, recursion_repeat = len(tb_frames), 0
+            limit = None
+        records = self.get_records(etb, number_of_lines_of_context, tb_offset,
+                                   limit)
 
         if records is None:
             return ""
 
-        last_unique, recursion_repeat = find_recursion(orig_etype, evalue, records)
-
         frames = self.format_records(records, last_unique, recursion_repeat)
 
         formatted_exception = self.format_exception(etype, evalue)
         if records:
-            filepath, lnum = records[-1][1:3]
+            if limit is None:
+                filepath, lnum = records[-1][1:3]
+            else:
+                # The innermost frame is past the records of a recursion
+                last = etb
+                while last.tb_next is not None:
+                    last = last.tb_next
+                filepath, lnum = _frame_records(last)[0][1:3]
             filepath = os.path.abspath(filepath)
             ipinst = get_ipython()
             if ipinst is not None:
@@ -1087,12 +1282,14 @@ def format_exception_as_a_whole(self, etype, evalue, etb, number_of_lines_of_con
 
         return [[head] + frames + [''.join(formatted_exception[0])]]
 
-    def get_records(self, etb, number_of_lines_of_context, tb_offset):
+    def get_records(self, etb, number_of_lines_of_context, tb_offset,
+                    limit=None):
         try:
             # Try the default getinnerframes and Alex's: Alex's fixes some
             # problems, but it generates empty tracebacks for console errors
             # (5 blanks lines) where none should be returned.
-            return _fixed_getinnerframes(etb, number_of_lines_of_context, tb_offset)
+            return _fixed_getinnerframes(etb, number_of_lines_of_context,
+                                         tb_offset, limit)
         except UnicodeDecodeError:
             # This can occur if a file's encoding magic comment is wrong.
             # I can't see a way to recover without duplicating a bunch of code
@@ -1128,7 +1325,15 @@ def get_chained_exception(exception_value):
     def structured_traceback(self, etype, evalue, etb, tb_offset=None,
                              number_of_lines_of_context=5):
         """Return a nice text document describing the traceback."""
+        previous, self._repr_budget = self._repr_budget, self.new_repr_budget()
+        try:
+            return self._structured_traceback(etype, evalue, etb, tb_offset,
+                                              number_of_lines_of_context)
+        finally:
+            self._repr_budget = previous
 
+    def _structured_traceback(self, etype, evalue, etb, tb_offset,
+                              number_of_lines_of_context):
         formatted_exception = self.format_exception_as_a_whole(etype, evalue, etb, number_of_lines_of_context,
                                                                tb_offset)
 
@@ -1165,6 +1370,13 @@ def structured_traceback(self, etype, evalue, etb, tb_offset=None,
 
         return structured_traceback_parts
 
+    def lazy_traceback(self, etype, evalue, etb, tb_offset=None,
+                       number_of_lines_of_context=5):
+        """Return a LazyTraceback, which formats frames on demand."""
+        tb_offset = self.tb_offset if tb_offset is None else tb_offset
+        return LazyTraceback(self, etype, evalue, etb, tb_offset,
+                             number_of_lines_of_context)
+
     def debugger(self, force=False):
         """Call up the pdb debugger if desired, always clean up the tb
         reference.
@@ -1231,13 +1443,164 @@ def __call__(self, etype=None, evalue=None, etb=None):
             print("\nKeyboardInterrupt")
 
 
+def _frame_records(etb, tb_offset=0):
+    """Records of the frames of a traceback, like VerboseTB.get_records(),
+    without reading their source: the lines and index are None."""
+    records = []
+    while etb is not None:
+        frame = etb.tb_frame
+        code = frame.f_code
+        records.append((frame, code.co_filename, etb.tb_lineno, code.co_name,
+                        None, None))
+        etb = etb.tb_next
+    return fix_frame_records_filenames(records)[tb_offset:]
+
+
+class LazyTraceback(object):
+    """A verbose traceback which only formats its frames when asked to.
+
+    :meth:`summary` is a structured traceback with one line per frame, and
+    :meth:`format_frame` formats a single frame in full, with its context and
+    variables, like *formatter* (a VerboseTB) does. :meth:`to_dict` describes
+    the traceback for frontends, in a JSON-able dict.
+
+    The exception and its traceback are kept, so the frames remain available
+    to a post-mortem debugger.
+    """
+
+    def __init__(self, formatter, etype, evalue, etb, tb_offset=0,
+                 number_of_lines_of_context=5):
+        self.formatter = formatter
+        self.etype = etype
+        self.evalue = evalue
+        self.etb = etb
+        self.context = number_of_lines_of_context
+        self.records = _frame_records(etb, tb_offset)
+        self.last_unique, self.recursion_repeat = find_recursion(
+            etype, evalue, self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def ename(self):
+        return getattr(self.etype, '__name__', str(self.etype))
+
+    def shown_frames(self):
+        """The indices of the frames listed by the summary, with None in place
+        of repeated recursive frames."""
+        end = self.last_unique + self.recursion_repeat + 1
+        if not self.recursion_repeat:
+            return list(range(len(self.records)))
+        return list(range(end)) + [None, end]
+
+    def summary(self):
+        """A structured traceback (a list of strings) listing the frames."""
+        f = self.formatter
+        Colors = f.Colors
+        f.check_cache()
+        tpl_frame = '%s[%%d]%s %s%%s%s:%s%%d%s in %s%%s%s' % (
+            Colors.linenoEm, Colors.Normal, Colors.filenameEm, Colors.Normal,
+            Colors.lineno, Colors.Normal, Colors.vName, Colors.Normal)
+
+        stb = []
+        # Chained exceptions, innermost first; shown on top like VerboseTB
+        chained = []
+        evalue, seen = self.evalue, set()
+        while True:
+            parts = f.get_parts_of_chained_exception(evalue)
+            if not parts or id(parts[1]) in seen:
+                break
+            seen.add(id(parts[1]))
+            message = f.prepare_chained_exception_message(evalue.__cause__)
+            chained.append(f.format_exception(parts[0].__name__, parts[1])
+                           + message[0])
+            evalue = parts[1]
+        for lines in reversed(chained):
+            stb.extend(lines)
+
+        stb.append(f.prepare_header(self.ename, f.long_header))
+        for i in self.shown_frames():
+            if i is None:
+                stb.append('... last %d frames repeated, from the frame '
+                           'below ...' % self.recursion_repeat)
+                continue
+            frame, file, lnum, func = self.records[i][:4]
+            line = tpl_frame % (i, util_path.compress_user(file), lnum, func)
+            source = linecache.getline(file, lnum).strip()
+            if source:
+                line += '  ' + source
+            stb.append(line)
+        stb.extend(f.format_exception(self.ename, self.evalue))
+        if self.records:
+            stb.append('(use %tb --frame N to show frame N in full)')
+        return stb
+
+    def format_frame(self, index):
+        """Format the frame with the given index in full.
+
+        Raises IndexError if there is no such frame.
+        """
+        frame, file, lnum, func = self.records[index][:4]
+        context = self.context
+        start = max(lnum - 1 - context // 2, 0)
+        lines = linecache.getlines(file)[start:start + context]
+        if lines:
+            index = lnum - 1 - start
+        else:
+            lines = index = None
+        f = self.formatter
+        f.source_index.begin()
+        # Expanded frames always show their variables
+        include_vars, f.include_vars = f.include_vars, True
+        try:
+            return f.format_record(frame, file, lnum, func, lines, index)
+        finally:
+            f.include_vars = include_vars
+
+    def to_dict(self, frames=()):
+        """The traceback as a JSON-able dict.
+
+        The frames listed have their index, filename, lineno, function name
+        and source line; those in *frames* also have their ``formatted``
+        text, as given by :meth:`format_frame`.
+        """
+        try:
+            evalue = str(self.evalue)
+        except Exception:
+            evalue = '<unprintable %s object>' % self.ename
+        data = {
+            'ename': self.ename,
+            'evalue': evalue,
+            'frames': [],
+            'last_unique': self.last_unique,
+            'recursion_repeat': self.recursion_repeat,
+        }
+        for i, record in enumerate(self.records):
+            frame, file, lnum, func = record[:4]
+            entry = {
+                'index': i,
+                'filename': file,
+                'lineno': lnum,
+                'name': func,
+                'line': linecache.getline(file, lnum).strip(),
+            }
+            if i in frames:
+                entry['formatted'] = self.format_frame(i)
+            data['frames'].append(entry)
+        return data
+
+
 #----------------------------------------------------------------------------
 class FormattedTB(VerboseTB, ListTB):
     """Subclass ListTB but allow calling with a traceback.
 
     It can thus be used as a sys.excepthook for Python > 2.1.
 
-    Also adds 'Context' and 'Verbose' modes, not available in ListTB.
+    Also adds 'Context' and 'Verbose' modes, not available in ListTB, and a
+    'Collapsed' mode listing the frames of a LazyTraceback, which can be
+    expanded one by one, and a 'Minimal' mode which only shows the exception,
+    without looking at the frames.
 
     Allows a tb_offset to be specified. This is useful for situations where
     one needs to remove a number of topmost frames from the traceback (such as
@@ -1251,7 +1614,8 @@ def __init__(self, mode='Plain', color_scheme='Linux', call_pdb=False,
                  parent=None, config=None):
 
         # NEVER change the order of this list. Put new modes at the end:
-        self.valid_modes = ['Plain', 'Context', 'Verbose']
+        self.valid_modes = ['Plain', 'Context', 'Verbose', 'Collapsed',
+                            'Minimal']
         self.verbose_modes = self.valid_modes[1:3]
 
         VerboseTB.__init__(self, color_scheme=color_scheme, call_pdb=call_pdb,
@@ -1262,7 +1626,8 @@ def __init__(self, mode='Plain', color_scheme='Linux', call_pdb=False,
 
         # Different types of tracebacks are joined with different separators to
         # form a single string.  They are taken from this dict
-        self._join_chars = dict(Plain='', Context='\n', Verbose='\n')
+        self._join_chars = dict(Plain='', Context='\n', Verbose='\n',
+                                Collapsed='\n', Minimal='')
         # set_mode also sets the tb_join_char attribute
         self.set_mode(mode)
 
@@ -1280,6 +1645,12 @@ def structured_traceback(self, etype, value, tb, tb_offset=None, number_of_lines
             return VerboseTB.structured_traceback(
                 self, etype, value, tb, tb_offset, number_of_lines_of_context
             )
+        elif mode == 'Collapsed':
+            return self.lazy_traceback(
+                etype, value, tb, tb_offset, number_of_lines_of_context
+            ).summary()
+        elif mode == 'Minimal':
+            return ListTB.get_exception_only(self, etype, value)
         else:
             # We must check the source cache because otherwise we can print
             # out-of-date source code.
@@ -1309,8 +1680,9 @@ def set_mode(self, mode=None):
                                                                             'Valid modes: ' + str(self.valid_modes))
         else:
             self.mode = mode
-        # include variable details only in 'Verbose' mode
-        self.include_vars = (self.mode == self.valid_modes[2])
+        # include variable details only in 'Verbose' mode, and in the frames
+        # expanded in 'Collapsed' mode
+        self.include_vars = (self.mode in self.valid_modes[2:4])
         # Set the join character for generating text tracebacks
         self.tb_join_char = self._join_chars[self.mode]
 
@@ -1324,6 +1696,12 @@ def context(self):
     def verbose(self):
         self.set_mode(self.valid_modes[2])
 
+    def collapsed(self):
+        self.set_mode(self.valid_modes[3])
+
+    def minimal(self):
+        self.set_mode(self.valid_modes[4])
+
 
 #----------------------------------------------------------------------------
 class AutoFormattedTB(FormattedTB):
@@ -1453,6 +1831,106 @@ def text_repr(value):
                 return 'UNRECOVERABLE REPR FAILURE'
 
 
+# Builtin types whose length is cheap to get, and which are summarised with it
+_SIZED_TYPES = (str, bytes, bytearray, list, tuple, dict, set, frozenset)
+
+
+def _class_attr(value, name):
+    """value.name, if the class of value defines name, else None.
+
+    This avoids __getattr__ hooks, which may do anything.
+    """
+    if getattr(type(value), name, None) is None:
+        return None
+    try:
+        return getattr(value, name)
+    except Exception:
+        return None
+
+
+def summary_repr(value):
+    """A cheap description of value: its type, and its shape and dtype or its
+    length when it has some."""
+    parts = [type(value).__name__]
+    shape = _class_attr(value, 'shape')
+    if isinstance(shape, tuple):
+        parts.append('shape=%r' % (shape,))
+        dtype = _class_attr(value, 'dtype')
+        if dtype is not None:
+            parts.append('dtype=%s' % dtype)
+    elif isinstance(value, _SIZED_TYPES):
+        parts.append('len=%d' % len(value))
+    return '<%s>' % ' '.join(parts)
+
+
+def _item_count(value):
+    """The number of items of a builtin container or of an array, or None."""
+    if isinstance(value, (str, bytes, bytearray)):
+        # Reprs of strings are cut rather than summarised
+        return None
+    if isinstance(value, _SIZED_TYPES):
+        return len(value)
+    shape = _class_attr(value, 'shape')
+    if isinstance(shape, tuple):
+        count = 1
+        for n in shape:
+            if not isinstance(n, int):
+                return None
+            count *= n
+        return count
+    return None
+
+
+class ReprBudget(object):
+    """Reprs of the variables shown in a traceback, within limits.
+
+    Each repr is cut to *max_size* characters; strings and bytes are cut
+    before their repr is made. Containers and arrays with more than
+    *max_items* items are summarised by :func:`summary_repr`, as are all
+    values once *max_time* seconds have been spent on reprs (0 means no
+    limit); the latter are marked with "repr skipped". The time is only
+    checked between reprs: a slow repr already running isn't interrupted.
+    Values seen before are not formatted again.
+    """
+
+    def __init__(self, max_size=1000, max_items=1000, max_time=1.0):
+        self.max_size = max_size
+        self.max_items = max_items
+        self.max_time = max_time
+        self.elapsed = 0.
+        self._seen = {}
+
+    @property
+    def exhausted(self):
+        return 0 < self.max_time <= self.elapsed
+
+    def __call__(self, value, repr=text_repr):
+        key = (id(value), repr)
+        if key in self._seen:
+            return self._seen[key][1]
+        count = _item_count(value)
+        if count is not None and count > self.max_items:
+            result = summary_repr(value)
+        elif self.exhausted:
+            result = summary_repr(value)[:-1] + '; repr skipped>'
+        else:
+            start = time.perf_counter()
+            try:
+                if (type(value) in (str, bytes, bytearray)
+                        and len(value) > self.max_size):
+                    # The repr of the rest would be cut anyway
+                    result = repr(value[:self.max_size])
+                else:
+                    result = repr(value)
+            finally:
+                self.elapsed += time.perf_counter() - start
+            if len(result) > self.max_size:
+                result = result[:self.max_size] + '...'
+        # Keep value alive, so that its id isn't reused
+        self._seen[key] = (value, result)
+        return result
+
+
 def eqrepr(value, repr=text_repr):
     return '=%s' % repr(value)
 
@@ -48,6 +48,11 @@
     Reload all modules (except those excluded by ``%aimport``) every
     time before executing the Python code typed.
 
+``%autoreload 2 --print``
+
+    Same, and print the modules reloaded with the time taken. ``-p`` is
+    short for ``--print``, which can follow any of the above.
+
 ``%aimport``
 
     List modules which are to be automatically imported or not to be imported.
@@ -64,6 +69,16 @@
 
     Mark module 'foo' to not be autoreloaded.
 
+On Linux, the source files of the modules are watched with inotify, so that
+looking for changes before running code only checks the files which changed.
+Elsewhere, on network filesystems, and with ``AutoreloadMagics.watch`` set to
+False (e.g. ``%config AutoreloadMagics.watch = False``), the modification time
+of the source of each module is checked.
+
+The modules which changed are reloaded together, those imported by others
+first, so that a module is reloaded after the new versions of the modules it
+imports from.
+
 Caveats
 =======
 
@@ -110,8 +125,14 @@
 # Imports
 #-----------------------------------------------------------------------------
 
+import ast
+import errno
 import os
+import select
+import struct
 import sys
+import threading
+import time
 import traceback
 import types
 import weakref
@@ -120,6 +141,213 @@
 
 from IPython.utils import openpy
 
+#------------------------------------------------------------------------------
+# File watching
+#------------------------------------------------------------------------------
+
+class InotifyWatcher(object):
+    """Watch source files for changes with Linux's inotify.
+
+    The directories of the watched files are watched, so that files replaced
+    by a rename (as many editors save) are still seen. A background thread
+    reads the events as they come, so that the kernel's queue doesn't
+    overflow, and :meth:`changed` reads those not read yet.
+
+    The files symbolic links point to are watched too, so that editing the
+    target of a link reports the link.
+
+    Files whose directory can't be watched (for instance once the limit on
+    the number of watches is reached), and files on network filesystems,
+    where inotify doesn't see the changes made by other machines or by the
+    host of a container or VM, are returned by every call to :meth:`changed`,
+    so that the caller checks them itself.
+    """
+
+    # From <sys/inotify.h>
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    _EVENT = struct.Struct('iIII')
+
+    # Types of network filesystems, as in the f_type of statfs, from
+    # <linux/magic.h>
+    NETWORK_FS_TYPES = frozenset([
+        0x6969,      # NFS
+        0x517B,      # SMB
+        0xFF534D42,  # CIFS
+        0xFE534D42,  # SMB2
+        0x01021997,  # 9P: WSL, Docker Desktop and VM shared folders
+        0x65735546,  # FUSE: sshfs, Docker Desktop's grpcfuse and virtiofs
+        0x786F4256,  # VirtualBox shared folders
+        0x00C36400,  # Ceph
+        0x5346414F,  # AFS
+        0x73757245,  # Coda
+    ])
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                 use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._lock = threading.Lock()
+        # directory -> watch descriptor, and the reverse
+        self._dirs = {}
+        self._wds = {}
+        # directory -> {name in it: filenames watched through that name}
+        self._names = {}
+        # directories on network filesystems
+        self._polled_dirs = set()
+        self._dirty = set()
+        self.unwatched = set()
+        self._closed = False
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._thread = threading.Thread(target=self._run,
+                                        name='autoreload watcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    @classmethod
+    def available(cls):
+        """Whether inotify can be used on this platform."""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c'))
+            return hasattr(libc, 'inotify_init1')
+        except (ImportError, OSError):
+            return False
+
+    def watch(self, filename):
+        """Report the changes of filename from now on.
+
+        If filename is a symbolic link, the changes of the file it points to
+        are reported as changes of filename.
+        """
+        paths = [os.path.realpath(filename)]
+        if os.path.abspath(filename) != paths[0]:
+            # The link itself may be replaced
+            paths.append(os.path.abspath(filename))
+        with self._lock:
+            if self._closed:
+                return
+            for path in paths:
+                directory, name = os.path.split(path)
+                if directory not in self._dirs:
+                    wd = -1
+                    if directory not in self._polled_dirs:
+                        if self._network_fs(directory):
+                            self._polled_dirs.add(directory)
+                        else:
+                            wd = self._libc.inotify_add_watch(
+                                self._fd, os.fsencode(directory), self.MASK)
+                    if wd < 0:
+                        self.unwatched.add(filename)
+                        return
+                    self._dirs[directory] = wd
+                    self._wds[wd] = directory
+                self._names.setdefault(directory, {}).setdefault(
+                    name, set()).add(filename)
+
+    def changed(self):
+        """The watched files which changed since the last call, possibly."""
+        with self._lock:
+            if not self._closed:
+                self._read_events()
+            dirty, self._dirty = self._dirty, set()
+        return dirty | self.unwatched
+
+    def close(self):
+        """Stop watching files."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            os.write(self._wakeup_w, b'x')
+        self._thread.join()
+        os.close(self._fd)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+
+    def _network_fs(self, directory):
+        """Whether directory is on a network filesystem."""
+        import ctypes
+        # Larger than struct statfs, whose first field is f_type, a long
+        buf = ctypes.create_string_buffer(256)
+        if self._libc.statfs(os.fsencode(directory), buf) != 0:
+            return False
+        f_type = ctypes.c_long.from_buffer(buf).value & 0xFFFFFFFF
+        return f_type in self.NETWORK_FS_TYPES
+
+    def _run(self):
+        while True:
+            try:
+                select.select([self._fd, self._wakeup_r], [], [])
+            except (OSError, ValueError):
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                self._read_events()
+
+    def _read_events(self):
+        """Mark the files of the queued events dirty. Called with the lock."""
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    return
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    # Events were lost
+                    for names in self._names.values():
+                        for filenames in names.values():
+                            self._dirty.update(filenames)
+                    continue
+                directory = self._wds.get(wd)
+                if directory is None:
+                    continue
+                if mask & self.IN_IGNORED:
+                    # The directory was removed
+                    del self._wds[wd], self._dirs[directory]
+                    for filenames in self._names.pop(directory, {}).values():
+                        self.unwatched.update(filenames)
+                    continue
+                self._dirty.update(self._names.get(directory, {}).get(
+                    os.fsdecode(name), ()))
+
+
+def default_watcher():
+    """An InotifyWatcher if inotify is available, else None.
+
+    Without a watcher, ModuleReloader checks the modification time of the
+    source of every module each time it checks for changes.
+    """
+    if InotifyWatcher.available():
+        try:
+            return InotifyWatcher()
+        except OSError:
+            pass
+    return None
+
 #------------------------------------------------------------------------------
 # Autoreload functionality
 #------------------------------------------------------------------------------
@@ -131,7 +359,16 @@ class ModuleReloader(object):
     check_all = True
     """Autoreload all modules, not just those listed in 'modules'"""
 
-    def __init__(self):
+    watcher = None
+    """Object telling which source files changed since the last check, such
+    as an InotifyWatcher. If None, the modification time of the source of
+    every module is checked each time."""
+
+    print_reloads = False
+    """Print the modules reloaded, with the time taken"""
+
+    def __init__(self, watcher=None):
+        self.set_watcher(watcher)
         # Modules that failed to reload: {module: mtime-on-failed-reload, ...}
         self.failed = {}
         # Modules specially marked as autoreloadable.
@@ -142,10 +379,27 @@ def __init__(self):
         self.old_objects = {}
         # Module modification timestamps
         self.modules_mtimes = {}
+        # Seconds taken to reload each module of the last batch, in order
+        self.reload_times = []
 
         # Cache module modification times
         self.check(check_all=True, do_reload=False)
 
+    def set_watcher(self, watcher):
+        """Use watcher from now on, or check the modification time of every
+        module if it is None.
+
+        Every module is checked at the next check, as a new watcher only
+        reports the changes made once it watches the module's source.
+        """
+        self.watcher = watcher
+        # Modules whose source is known to the watcher: {name: module}
+        self._watched_modules = {}
+        # Source file -> names of the modules loaded from it
+        self._file_modules = {}
+        # Modules whose source changed, not checked since
+        self._changed = set()
+
     def mark_module_skipped(self, module_name):
         """Skip reloading the named module in the future"""
         try:
@@ -216,7 +470,10 @@ def check(self, check_all=False, do_reload=True):
             modules = list(sys.modules.keys())
         else:
             modules = list(self.modules.keys())
+        if self.watcher is not None and not check_all:
+            modules = self._changed_modules(modules)
 
+        changed = []
         for modname in modules:
             m = sys.modules.get(modname, None)
 
@@ -224,6 +481,8 @@ def check(self, check_all=False, do_reload=True):
                 continue
 
             py_filename, pymtime = self.filename_and_mtime(m)
+            if self.watcher is not None:
+                self._watch_module(modname, m, py_filename)
             if py_filename is None:
                 continue
 
@@ -241,14 +500,149 @@ def check(self, check_all=False, do_reload=True):
 
             # If we've reached this point, we should try to reload the module
             if do_reload:
-                try:
-                    superreload(m, reload, self.old_objects)
-                    if py_filename in self.failed:
-                        del self.failed[py_filename]
-                except:
-                    print("[autoreload of %s failed: %s]" % (
-                            modname, traceback.format_exc(10)), file=sys.stderr)
-                    self.failed[py_filename] = pymtime
+                changed.append((modname, m, py_filename, pymtime))
+
+        if changed:
+            self.reload_modules(changed)
+
+    def reload_modules(self, changed):
+        """Reload a batch of modules, each after those it imports.
+
+        *changed* is a list of (name, module, source filename, mtime).
+        """
+        deps = module_dependencies([(name, py_filename)
+                                    for name, _, py_filename, _ in changed])
+        by_name = {c[0]: c for c in changed}
+        self.reload_times = []
+        for modname in reload_order([c[0] for c in changed], deps):
+            _, m, py_filename, pymtime = by_name[modname]
+            start = time.perf_counter()
+            try:
+                superreload(m, reload, self.old_objects)
+                if py_filename in self.failed:
+                    del self.failed[py_filename]
+            except:
+                print("[autoreload of %s failed: %s]" % (
+                        modname, traceback.format_exc(10)), file=sys.stderr)
+                self.failed[py_filename] = pymtime
+                continue
+            elapsed = time.perf_counter() - start
+            self.reload_times.append((modname, elapsed))
+            if self.print_reloads:
+                print("[autoreload: reloaded %s in %.1f ms]" % (
+                        modname, elapsed * 1e3))
+
+    def _watch_module(self, modname, module, py_filename):
+        """Have the watcher report the changes of a module's source."""
+        if self._watched_modules.get(modname) is module:
+            return
+        self._watched_modules[modname] = module
+        if py_filename is not None:
+            if py_filename not in self._file_modules:
+                self.watcher.watch(py_filename)
+            self._file_modules.setdefault(py_filename, set()).add(modname)
+
+    def _changed_modules(self, modules):
+        """The modules among *modules* which may need to be reloaded: those
+        whose source the watcher reports as changed, and those it doesn't
+        know yet."""
+        changed = self._changed
+        for filename in self.watcher.changed():
+            changed.update(self._file_modules.get(filename, ()))
+        watched = self._watched_modules
+        modules = [modname for modname in modules
+                   if modname in changed or
+                   watched.get(modname) is not sys.modules.get(modname)]
+        # Skipped modules are checked once they aren't skipped any more
+        changed.difference_update(modname for modname in modules
+                                  if modname not in self.skip_modules)
+        return modules
+
+#------------------------------------------------------------------------------
+# Reload order
+#------------------------------------------------------------------------------
+
+def imported_modules(modname, source):
+    """The names of the modules the import statements of *source*, the code
+    of module *modname*, may import, including the packages they are in."""
+    tree = ast.parse(source)
+    # The package relative imports are resolved in
+    package = getattr(sys.modules.get(modname), '__package__', None)
+    if package is None:
+        package = modname.rpartition('.')[0]
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            bases = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split('.') if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                parts = parts[:len(parts) - (node.level - 1)]
+                if node.module:
+                    parts.append(node.module)
+                base = '.'.join(parts)
+            else:
+                base = node.module
+            # from package import submodule
+            bases = [base] + ['%s.%s' % (base, alias.name)
+                              for alias in node.names]
+        else:
+            continue
+        for name in bases:
+            parts = name.split('.')
+            names.extend('.'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    return names
+
+
+def module_dependencies(modules):
+    """The dependencies of modules on each other.
+
+    *modules* is a list of (name, source filename). Returns a dict mapping
+    each name to the names of the other modules it imports, in the order of
+    *modules*. Sources which can't be read or parsed have no dependencies.
+    """
+    names = [name for name, _ in modules]
+    index = {name: i for i, name in enumerate(names)}
+    deps = {}
+    for name, filename in modules:
+        try:
+            source = openpy.read_py_file(filename, skip_encoding_cookie=False)
+            imported = set(imported_modules(name, source))
+        except (OSError, SyntaxError, ValueError, UnicodeDecodeError):
+            imported = set()
+        imported.discard(name)
+        deps[name] = sorted(imported.intersection(index), key=index.get)
+    return deps
+
+
+def reload_order(names, deps):
+    """Sort *names* so that each comes after the names it depends on.
+
+    *deps* maps names to their dependencies. The order of *names* is kept
+    otherwise, and in import cycles.
+    """
+    order = []
+    # 1 while a name's dependencies are being visited, 2 once it's sorted
+    state = {}
+    for root in names:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(deps.get(root, ())))]
+        while stack:
+            name, children = stack[-1]
+            for child in children:
+                if child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(deps.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                state[name] = 2
+                order.append(name)
+    return order
 
 #------------------------------------------------------------------------------
 # superreload
@@ -395,15 +789,36 @@ def superreload(module, reload=reload, old_objects={}):
 #------------------------------------------------------------------------------
 
 from IPython.core.magic import Magics, magics_class, line_magic
+from traitlets import Bool, observe
 
 @magics_class
 class AutoreloadMagics(Magics):
+
+    watch = Bool(True, help=
+        """Watch the source files of the modules with inotify, where
+        available, to only check those which changed before running code.
+        If False, the modification time of every module is checked.
+        """
+    ).tag(config=True)
+
     def __init__(self, *a, **kw):
         super(AutoreloadMagics, self).__init__(*a, **kw)
-        self._reloader = ModuleReloader()
+        self._reloader = ModuleReloader(
+            default_watcher() if self.watch else None)
         self._reloader.check_all = False
         self.loaded_modules = set(sys.modules)
 
+    @observe('watch')
+    def _watch_changed(self, change):
+        reloader = getattr(self, '_reloader', None)
+        if reloader is None:
+            # Configured before the reloader exists
+            return
+        previous = reloader.watcher
+        reloader.set_watcher(default_watcher() if change['new'] else None)
+        if previous is not None:
+            previous.close()
+
     @line_magic
     def autoreload(self, parameter_s=''):
         r"""%autoreload => Reload modules automatically
@@ -423,6 +838,13 @@ def autoreload(self, parameter_s=''):
         Reload all modules (except those excluded by %aimport) every time
         before executing the Python code typed.
 
+        %autoreload 2 --print
+        Same, and print the modules reloaded with the time taken. -p is short
+        for --print, which can follow any of the above.
+
+        Modules which changed together are reloaded after the modules they
+        import from.
+
         Reloading Python modules in a reliable way is in general
         difficult, and unexpected things may occur. %autoreload tries to
         work around common pitfalls by replacing function code objects and
@@ -449,16 +871,26 @@ def autoreload(self, parameter_s=''):
           autoreloaded.
 
         """
+        args = parameter_s.split()
+        print_reloads = '-p' in args or '--print' in args
+        parameter_s = ' '.join(a for a in args if a not in ('-p', '--print'))
         if parameter_s == '':
-            self._reloader.check(True)
+            previous = self._reloader.print_reloads
+            self._reloader.print_reloads = previous or print_reloads
+            try:
+                self._reloader.check(True)
+            finally:
+                self._reloader.print_reloads = previous
         elif parameter_s == '0':
             self._reloader.enabled = False
         elif parameter_s == '1':
             self._reloader.check_all = False
             self._reloader.enabled = True
+            self._reloader.print_reloads = print_reloads
         elif parameter_s == '2':
             self._reloader.check_all = True
             self._reloader.enabled = True
+            self._reloader.print_reloads = print_reloads
 
     @line_magic
     def aimport(self, parameter_s='', stream=None):
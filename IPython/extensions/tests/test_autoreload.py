@@ -25,8 +25,11 @@
 import IPython.testing.tools as tt
 
 from IPython.testing.decorators import skipif
+from IPython.utils.tempdir import TemporaryDirectory
 
-from IPython.extensions.autoreload import AutoreloadMagics
+from IPython.extensions.autoreload import (AutoreloadMagics, InotifyWatcher,
+                                           ModuleReloader, imported_modules,
+                                           reload_order)
 from IPython.core.events import EventManager, pre_run_cell
 
 #-----------------------------------------------------------------------------
@@ -340,3 +343,160 @@ def test_smoketest_aimport(self):
 
     def test_smoketest_autoreload(self):
         self._check_smoketest(use_aimport=False)
+
+    def test_watcher_checks_changed_modules(self):
+        mod_name, mod_fn = self.new_module("x = 1\n")
+        other_name, other_fn = self.new_module("x = 1\n")
+        __import__(mod_name)
+        __import__(other_name)
+        watcher = FakeWatcher()
+        reloader = ModuleReloader(watcher)
+        reloader.enabled = True
+        nt.assert_in(mod_fn, watcher.watched)
+
+        checked = []
+        def filename_and_mtime(module):
+            checked.append(getattr(module, '__name__', None))
+            return ModuleReloader.filename_and_mtime(reloader, module)
+        reloader.filename_and_mtime = filename_and_mtime
+
+        self.write_file(mod_fn, "x = 2\n")
+        self.write_file(other_fn, "x = 2\n")
+        watcher.dirty.add(mod_fn)
+        reloader.check()
+        nt.assert_equal(checked, [mod_name])
+        nt.assert_equal(sys.modules[mod_name].x, 2)
+        nt.assert_equal(sys.modules[other_name].x, 1)
+
+        # Modules imported since are checked once
+        new_name, new_fn = self.new_module("x = 1\n")
+        __import__(new_name)
+        del checked[:]
+        reloader.check()
+        reloader.check()
+        nt.assert_equal(checked, [new_name])
+        nt.assert_in(new_fn, watcher.watched)
+
+    def test_watch_disabled(self):
+        magics = self.shell.auto_magics
+        mod_name, mod_fn = self.new_module("x = 1\n")
+        self.shell.magic_autoreload("2")
+        self.shell.magic_aimport(mod_name)
+        magics.watch = False
+        nt.assert_is_none(magics._reloader.watcher)
+        self.write_file(mod_fn, "x = 2\n")
+        self.shell.run_code("pass")
+        nt.assert_equal(sys.modules[mod_name].x, 2)
+
+        # Modules are watched again, once checked
+        magics.watch = True
+        self.shell.run_code("pass")
+        if InotifyWatcher.available():
+            nt.assert_in(mod_name, magics._reloader._watched_modules)
+            magics._reloader.watcher.close()
+
+    def test_reload_dependencies_first(self):
+        dep_name, dep_fn = self.new_module("result = 2\n")
+        base_name, base_fn = self.new_module("value = 1\n")
+        self.shell.magic_autoreload("2 --print")
+        self.shell.magic_aimport(dep_name)
+        self.shell.magic_aimport(base_name)
+        dep = sys.modules[dep_name]
+        # The module changed to import the other comes first in sys.modules
+
+        self.write_file(dep_fn,
+                        "from %s import value\nresult = value * 3\n" % base_name)
+        self.write_file(base_fn, "value = 2\n")
+        with tt.AssertPrints('reloaded %s in' % dep_name):
+            self.shell.run_code("pass")
+        nt.assert_equal(dep.result, 6)
+        reloader = self.shell.auto_magics._reloader
+        nt.assert_equal([name for name, t in reloader.reload_times],
+                        [base_name, dep_name])
+
+
+def test_imported_modules():
+    source = textwrap.dedent("""
+        import os.path
+        from . import sibling
+        from .. import uncle
+        from .sub import name
+        def f():
+            import json
+        """)
+    names = imported_modules('pkg.sub.mod', source)
+    for name in ['os', 'os.path', 'json', 'pkg.sub', 'pkg.sub.sibling', 'pkg',
+                 'pkg.uncle', 'pkg.sub.sub', 'pkg.sub.sub.name']:
+        nt.assert_in(name, names)
+
+
+def test_reload_order():
+    deps = {'a': ['b'], 'b': ['c'], 'c': [], 'd': ['a']}
+    nt.assert_equal(reload_order(['d', 'a', 'b', 'c'], deps),
+                    ['c', 'b', 'a', 'd'])
+    # Cycles keep the given order otherwise
+    deps = {'a': ['b'], 'b': ['a'], 'c': ['a']}
+    nt.assert_equal(reload_order(['c', 'a', 'b'], deps), ['b', 'a', 'c'])
+
+
+class FakeWatcher(object):
+    """A watcher reporting the files put in its dirty set"""
+
+    def __init__(self):
+        self.watched = set()
+        self.dirty = set()
+
+    def watch(self, filename):
+        self.watched.add(filename)
+
+    def changed(self):
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+
+@skipif(not InotifyWatcher.available(), "inotify is not available")
+def test_inotify_watcher():
+    with TemporaryDirectory() as td:
+        filename = os.path.join(td, 'watched.py')
+        other = os.path.join(td, 'other.py')
+        with open(filename, 'w') as f:
+            f.write('x = 1\n')
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch(filename)
+            nt.assert_equal(watcher.changed(), set())
+
+            with open(filename, 'w') as f:
+                f.write('x = 2\n')
+            with open(other, 'w') as f:
+                f.write('x = 2\n')
+            nt.assert_equal(watcher.changed(), {filename})
+            nt.assert_equal(watcher.changed(), set())
+
+            # Editors often save by renaming a new file over the old one
+            os.replace(other, filename)
+            nt.assert_equal(watcher.changed(), {filename})
+
+            # The targets of links are watched
+            os.mkdir(os.path.join(td, 'sub'))
+            target = os.path.join(td, 'sub', 'target.py')
+            link = os.path.join(td, 'link.py')
+            with open(target, 'w') as f:
+                f.write('x = 1\n')
+            os.symlink(target, link)
+            watcher.watch(link)
+            with open(target, 'w') as f:
+                f.write('x = 2\n')
+            nt.assert_equal(watcher.changed(), {link})
+            nt.assert_equal(watcher.unwatched, set())
+
+            # Files on network filesystems are always reported
+            nt.assert_false(watcher._network_fs(td))
+            watcher._network_fs = lambda directory: True
+            os.mkdir(os.path.join(td, 'nfs'))
+            remote = os.path.join(td, 'nfs', 'remote.py')
+            watcher.watch(remote)
+            nt.assert_equal(watcher.changed(), {remote})
+            nt.assert_equal(watcher.changed(), {remote})
+        finally:
+            watcher.close()
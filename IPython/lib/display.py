@@ -5,11 +5,23 @@
 from os.path import exists, isfile, splitext, abspath, join, isdir
 from os import walk, sep
 
-from IPython.core.display import DisplayObject
+from IPython.core.display import DisplayObject, _BINARY_TYPES
 
 __all__ = ['Audio', 'IFrame', 'YouTubeVideo', 'VimeoVideo', 'ScribdDocument',
            'FileLink', 'FileLinks']
 
+# Number of frames scaled at once when converting an array to a WAV file
+_WAV_CHUNK_FRAMES = 2**16
+
+
+def _wav_header(nchan, rate, nframes):
+    """The header of a 16 bit PCM WAV file, as written by the wave module."""
+    import struct
+    size = 2 * nchan * nframes
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + size, b'WAVE', b'fmt ', 16, 1, nchan, rate,
+        2 * nchan * rate, 2 * nchan, 16, b'data', size)
+
 
 class Audio(DisplayObject):
     """Create an audio object.
@@ -29,17 +41,20 @@ class Audio(DisplayObject):
             http://msdn.microsoft.com/en-us/library/windows/hardware/dn653308(v=vs.85).aspx
           * List of float or integer representing the waveform (mono)
           * String containing the filename
-          * Bytestring containing raw PCM data or
+          * Bytestring (or memoryview or mmap) containing raw PCM data or
           * URL pointing to a file on the web.
 
-        If the array option is used the waveform will be normalized.
+        If the array option is used the waveform will be normalized. Arrays
+        of any numeric type (e.g. float32 or int16) are converted to 16 bit
+        PCM by chunks, without copying them.
 
         If a filename or url is used the format support will be browser
         dependent.
     url : unicode
         A URL to download the data from.
     filename : unicode
-        Path to a local file to load the data from.
+        Path to a local file to load the data from. Embedded files are read
+        and encoded by chunks when the audio is displayed.
     embed : boolean
         Should the audio data be embedded using a data URI (True) or should
         the original source be referenced. Set this to True if you want the
@@ -81,6 +96,7 @@ class Audio(DisplayObject):
 
     """
     _read_flags = 'rb'
+    _load_lazily = True
 
     def __init__(self, data=None, filename=None, url=None, embed=None, rate=None, autoplay=False):
         if filename is None and url is None and data is None:
@@ -95,7 +111,7 @@ def __init__(self, data=None, filename=None, url=None, embed=None, rate=None, au
         self.autoplay = autoplay
         super(Audio, self).__init__(data=data, url=url, filename=filename)
 
-        if self.data is not None and not isinstance(self.data, bytes):
+        if self._data is not None and not isinstance(self._data, _BINARY_TYPES):
             self.data = self._make_wav(data,rate)
 
     def reload(self):
@@ -113,51 +129,66 @@ def reload(self):
 
     def _make_wav(self, data, rate):
         """ Transform a numpy array to a PCM bytestring """
-        import struct
-        from io import BytesIO
-        import wave
-
         try:
             import numpy as np
-
-            data = np.array(data, dtype=float)
-            if len(data.shape) == 1:
-                nchan = 1
-            elif len(data.shape) == 2:
-                # In wave files,channels are interleaved. E.g.,
-                # "L1R1L2R2..." for stereo. See
-                # http://msdn.microsoft.com/en-us/library/windows/hardware/dn653308(v=vs.85).aspx
-                # for channel ordering
-                nchan = data.shape[0]
-                data = data.T.ravel()
-            else:
-                raise ValueError('Array audio input must be a 1D or 2D array')
-            scaled = np.int16(data/np.max(np.abs(data))*32767).tolist()
         except ImportError:
-            # check that it is a "1D" list
-            idata = iter(data)  # fails if not an iterable
-            try:
-                iter(idata.next())
-                raise TypeError('Only lists of mono audio are '
-                    'supported if numpy is not installed')
-            except TypeError:
-                # this means it's not a nested list, which is what we want
-                pass
-            maxabsvalue = float(max([abs(x) for x in data]))
-            scaled = [int(x/maxabsvalue*32767) for x in data]
+            return self._make_wav_from_list(data, rate)
+
+        # No copy of arrays: the samples are scaled by chunks, straight into
+        # the output buffer.
+        data = np.asarray(data)
+        if data.dtype.kind not in 'iuf':
+            data = data.astype(float)
+        if len(data.shape) == 1:
             nchan = 1
-
-        fp = BytesIO()
-        waveobj = wave.open(fp,mode='wb')
-        waveobj.setnchannels(nchan)
-        waveobj.setframerate(rate)
-        waveobj.setsampwidth(2)
-        waveobj.setcomptype('NONE','NONE')
-        waveobj.writeframes(b''.join([struct.pack('<h',x) for x in scaled]))
-        val = fp.getvalue()
-        waveobj.close()
-
-        return val
+            frames = data[:, np.newaxis]
+        elif len(data.shape) == 2:
+            # In wave files,channels are interleaved. E.g.,
+            # "L1R1L2R2..." for stereo. See
+            # http://msdn.microsoft.com/en-us/library/windows/hardware/dn653308(v=vs.85).aspx
+            # for channel ordering
+            nchan = data.shape[0]
+            frames = data.T
+        else:
+            raise ValueError('Array audio input must be a 1D or 2D array')
+
+        nframes = frames.shape[0]
+        header = _wav_header(nchan, rate, nframes)
+        offset = len(header)
+        wav = bytearray(offset + 2 * nchan * nframes)
+        wav[:offset] = header
+        if not data.size:
+            return bytes(wav)
+        out = np.frombuffer(wav, dtype='<i2', offset=offset)
+        out = out.reshape(nframes, nchan)
+        peak = max(abs(float(data.max())), abs(float(data.min())))
+        if peak:
+            for start in range(0, nframes, _WAV_CHUNK_FRAMES):
+                chunk = frames[start:start + _WAV_CHUNK_FRAMES] / peak
+                chunk *= 32767
+                out[start:start + _WAV_CHUNK_FRAMES] = chunk
+        # Immutable bytes, like the data of other displays
+        return bytes(wav)
+
+    def _make_wav_from_list(self, data, rate):
+        """_make_wav without numpy, for lists of mono samples"""
+        from array import array
+        import sys
+
+        # check that it is a "1D" list
+        idata = iter(data)  # fails if not an iterable
+        try:
+            iter(next(idata))
+            raise TypeError('Only lists of mono audio are '
+                'supported if numpy is not installed')
+        except (TypeError, StopIteration):
+            # this means it's not a nested list, which is what we want
+            pass
+        maxabsvalue = float(max([abs(x) for x in data]))
+        scaled = array('h', [int(x/maxabsvalue*32767) for x in data])
+        if sys.byteorder == 'big':
+            scaled.byteswap()
+        return _wav_header(1, rate, len(scaled)) + scaled.tobytes()
 
     def _data_and_metadata(self):
         """shortcut for returning metadata with url information, if defined"""
@@ -179,9 +210,8 @@ def _repr_html_(self):
         return src.format(src=self.src_attr(),type=self.mimetype, autoplay=self.autoplay_attr())
 
     def src_attr(self):
-        import base64
-        if self.embed and (self.data is not None):
-            data = base64=base64.b64encode(self.data).decode('ascii')
+        if self.embed and (self._data is not None or self._data_in_file()):
+            data = self._b64_data()
             return """data:{type};base64,{base64}""".format(type=self.mimetype,
                                                             base64=data)
         elif self.url is not None:
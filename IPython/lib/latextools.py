@@ -4,7 +4,10 @@
 # Copyright (c) IPython Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+from collections import OrderedDict
+import hashlib
 from io import BytesIO, open
+import json
 import os
 import tempfile
 import shutil
@@ -14,9 +17,12 @@
 from IPython.utils.process import find_cmd, FindCmdError
 from traitlets.config import get_config
 from traitlets.config.configurable import SingletonConfigurable
-from traitlets import List, Bool, Unicode
+from traitlets import List, Bool, Integer, Unicode, observe
 from IPython.utils.py3compat import cast_unicode
 
+# Changed when the rendering changes, to not reuse images cached on disk
+_CACHE_VERSION = 1
+
 
 class LaTeXTool(SingletonConfigurable):
     """An object to store configuration of the LaTeX tool."""
@@ -54,6 +60,151 @@ def _config_default(self):
         "for dvipng backend.",
         ).tag(config=True)
 
+    cache_size = Integer(
+        128,
+        help="Number of rendered equations kept in memory, to reuse them "
+        "when the same LaTeX is rendered again. 0 disables the cache, "
+        "including on disk.",
+        ).tag(config=True)
+
+    cache_dir = Unicode(
+        None, allow_none=True,
+        help="Directory where rendered equations are saved, to be reused "
+        "by later sessions. Defaults to the 'latex_cache' directory of the "
+        "IPython profile; an empty string only caches in memory.",
+        ).tag(config=True)
+
+    disk_cache_size = Integer(
+        1000,
+        help="Number of rendered equations kept in cache_dir. The least "
+        "recently used ones are removed.",
+        ).tag(config=True)
+
+    _cache = None
+
+    @observe('cache_size', 'cache_dir', 'disk_cache_size')
+    def _cache_changed(self, change):
+        self._cache = None
+
+    def get_cache(self):
+        """Return the cache of rendered equations, or None if disabled."""
+        if self.cache_size <= 0:
+            return None
+        if self._cache is None:
+            directory = self.cache_dir
+            if directory is None:
+                from IPython.core.getipython import get_ipython
+                ip = get_ipython()
+                profile_dir = getattr(ip, 'profile_dir', None)
+                if profile_dir is not None:
+                    directory = os.path.join(profile_dir.location,
+                                             'latex_cache')
+            self._cache = RenderCache(self.cache_size, directory or None,
+                                      self.disk_cache_size)
+        return self._cache
+
+    def cache_key(self, s, backend, wrap):
+        """Hash of the LaTeX source and of the options used to render it.
+
+        The key includes the versions of the programs rendering it, and for
+        matplotlib, the rcParams mathtext uses, since the images are kept on
+        disk across sessions.
+        """
+        options = [_CACHE_VERSION, backend, wrap, s]
+        if backend == 'matplotlib':
+            options += _mpl_render_options()
+        elif backend == 'dvipng':
+            options += [self.packages, self.use_breqn, self.preamble,
+                        _tex_versions()]
+        data = json.dumps(options).encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+
+class RenderCache(object):
+    """A least recently used cache of rendered images, keyed by hashes.
+
+    The images are kept in memory, and if a directory is given, saved in
+    files named after the keys, which are found again by later sessions.
+    """
+
+    def __init__(self, size=128, directory=None, disk_size=1000):
+        self.size = size
+        self.directory = directory
+        self.disk_size = disk_size
+        self._data = OrderedDict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.png')
+
+    def get(self, key):
+        """Return the data cached for key, or None."""
+        try:
+            data = self._data[key]
+        except KeyError:
+            pass
+        else:
+            self._data.move_to_end(key)
+            return data
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark it as recently used
+            os.utime(path, None)
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def set(self, key, data):
+        """Cache data for key."""
+        self._remember(key, data)
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with open(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+            self._prune_directory()
+        except OSError:
+            pass
+
+    def _remember(self, key, data):
+        self._data[key] = data
+        self._data.move_to_end(key)
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def _cached_files(self):
+        return [os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if name.endswith('.png')]
+
+    def _prune_directory(self):
+        paths = self._cached_files()
+        if len(paths) <= self.disk_size:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.disk_size]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all the cached data, including on disk."""
+        self._data.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for path in self._cached_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
 
 def latex_to_png(s, encode=False, backend=None, wrap=False):
     """Render a LaTeX string to PNG.
@@ -71,9 +222,12 @@ def latex_to_png(s, encode=False, backend=None, wrap=False):
 
     None is returned when the backend cannot be used.
 
+    Rendered equations are cached (see :class:`LaTeXTool`), so rendering the
+    same LaTeX again with the same options is immediate.
     """
     s = cast_unicode(s)
-    allowed_backends = LaTeXTool.instance().backends
+    tool = LaTeXTool.instance()
+    allowed_backends = tool.backends
     if backend is None:
         backend = allowed_backends[0]
     if backend not in allowed_backends:
@@ -84,12 +238,53 @@ def latex_to_png(s, encode=False, backend=None, wrap=False):
         f = latex_to_png_dvipng
     else:
         raise ValueError('No such backend {0}'.format(backend))
-    bin_data = f(s, wrap)
+    cache = tool.get_cache()
+    if cache is None:
+        bin_data = f(s, wrap)
+    else:
+        key = tool.cache_key(s, backend, wrap)
+        bin_data = cache.get(key)
+        if bin_data is None:
+            bin_data = f(s, wrap)
+            # Failures aren't cached: the backend may become usable
+            if bin_data:
+                cache.set(key, bin_data)
     if encode and bin_data:
         bin_data = encodebytes(bin_data)
     return bin_data
 
 
+def _mpl_render_options():
+    """The matplotlib version and the rcParams mathtext renders with."""
+    try:
+        import matplotlib
+    except ImportError:
+        return []
+    params = sorted((key, repr(value))
+                    for key, value in dict.items(matplotlib.rcParams)
+                    if key.startswith(('mathtext.', 'font.')))
+    return [matplotlib.__version__, params]
+
+
+_tex_versions_found = None
+
+def _tex_versions():
+    """The versions of latex and dvipng, as they print them."""
+    global _tex_versions_found
+    if _tex_versions_found is None:
+        versions = []
+        for cmd in ['latex', 'dvipng']:
+            try:
+                find_cmd(cmd)
+                output = subprocess.check_output(
+                    [cmd, '--version'], stderr=subprocess.DEVNULL)
+            except (FindCmdError, OSError, subprocess.CalledProcessError):
+                output = b''
+            versions.append(output.decode('utf8', 'replace').partition('\n')[0])
+        _tex_versions_found = versions
+    return _tex_versions_found
+
+
 def latex_to_png_mpl(s, wrap):
     try:
         from matplotlib import mathtext
@@ -82,6 +82,7 @@ def _repr_pretty_(self, p, cycle):
 import types
 import re
 import datetime
+import time
 from collections import deque
 from io import StringIO
 from warnings import warn
@@ -181,13 +182,28 @@ class PrettyPrinter(_PrettyPrinterBase):
     generate pretty reprs of objects.  Contrary to the `RepresentationPrinter`
     this printer knows nothing about the default pprinters or the `_repr_pretty_`
     callback method.
+
+    The printer can be given a budget: `max_output_size` characters, `max_depth`
+    levels of nested collections and `max_time` seconds (0 meaning no limit).
+    Collections nested too deep are shown as ``[...]``; once the size or time
+    budget is used up, collections stop at their next item, long texts are cut
+    and the output ends with a note saying it was truncated.
     """
 
-    def __init__(self, output, max_width=79, newline='\n', max_seq_length=MAX_SEQ_LENGTH):
+    def __init__(self, output, max_width=79, newline='\n', max_seq_length=MAX_SEQ_LENGTH,
+                 max_output_size=0, max_depth=0, max_time=0):
         self.output = output
         self.max_width = max_width
         self.newline = newline
         self.max_seq_length = max_seq_length
+        # Budget of the printer: 0 means no limit
+        self.max_output_size = max_output_size
+        self.max_depth = max_depth
+        self.max_time = max_time
+        self.output_size = 0
+        self.deadline = None
+        # Why the output was cut short ('size' or 'time'), if it was
+        self.budget_exceeded = None
         self.output_width = 0
         self.buffer_width = 0
         self.buffer = deque()
@@ -214,6 +230,16 @@ def _break_outer_groups(self):
     def text(self, obj):
         """Add literal text to the output."""
         width = len(obj)
+        if self.max_output_size:
+            room = self.max_output_size - self.output_size
+            if width > room and width > 3:
+                # Cut long texts, like the repr of a large string, to what is
+                # left of the budget. Short ones (brackets, separators) still
+                # go through, so that the output stays well-formed.
+                obj = obj[:max(room, 0)] + '...'
+                width = len(obj)
+                self.budget_exceeded = 'size'
+        self.output_size += width
         if self.buffer:
             text = self.buffer[-1]
             if not isinstance(text, Text):
@@ -238,9 +264,11 @@ def breakable(self, sep=' '):
             self.flush()
             self.output.write(self.newline)
             self.output.write(' ' * self.indentation)
+            self.output_size += len(self.newline) + self.indentation
             self.output_width = self.indentation
             self.buffer_width = 0
         else:
+            self.output_size += width
             self.buffer.append(Breakable(sep, width, self))
             self.buffer_width += width
             self._break_outer_groups()
@@ -252,6 +280,7 @@ def break_(self):
         self.flush()
         self.output.write(self.newline)
         self.output.write(' ' * self.indentation)
+        self.output_size += len(self.newline) + self.indentation
         self.output_width = self.indentation
         self.buffer_width = 0
         
@@ -282,14 +311,40 @@ def begin_group(self, indent=0, open=''):
         self.indentation += indent
     
     def _enumerate(self, seq):
-        """like enumerate, but with an upper limit on the number of items"""
+        """like enumerate, but with an upper limit on the number of items,
+        which stops early once the budget of the printer is exhausted"""
         for idx, x in enumerate(seq):
-            if self.max_seq_length and idx >= self.max_seq_length:
-                self.text(',')
-                self.breakable()
+            if (self.max_seq_length and idx >= self.max_seq_length) \
+                    or self._out_of_budget():
+                if idx:
+                    self.text(',')
+                    self.breakable()
                 self.text('...')
                 return
             yield idx, x
+
+    def _out_of_budget(self):
+        """Whether the output size or time budget has been used up."""
+        if self.budget_exceeded is not None:
+            return True
+        if self.max_output_size and self.output_size >= self.max_output_size:
+            self.budget_exceeded = 'size'
+        elif self.deadline is not None and time.perf_counter() > self.deadline:
+            self.budget_exceeded = 'time'
+        return self.budget_exceeded is not None
+
+    def _too_deep(self, depth):
+        """Whether a container nested *depth* levels deep should be elided."""
+        return bool(self.max_depth) and depth > self.max_depth
+
+    def _budget_note(self):
+        """The note ending an output cut short by the budget."""
+        if self.budget_exceeded == 'size':
+            return ' <output truncated: longer than %d characters>' \
+                % self.max_output_size
+        elif self.budget_exceeded == 'time':
+            return ' <output truncated: took longer than %gs>' % self.max_time
+        return ''
     
     def end_group(self, dedent=0, close=''):
         """End a group. See `begin_group` for more details."""
@@ -344,11 +399,15 @@ class RepresentationPrinter(PrettyPrinter):
 
     def __init__(self, output, verbose=False, max_width=79, newline='\n',
         singleton_pprinters=None, type_pprinters=None, deferred_pprinters=None,
-        max_seq_length=MAX_SEQ_LENGTH):
+        max_seq_length=MAX_SEQ_LENGTH, max_output_size=0, max_depth=0, max_time=0):
 
-        PrettyPrinter.__init__(self, output, max_width, newline, max_seq_length=max_seq_length)
+        PrettyPrinter.__init__(self, output, max_width, newline, max_seq_length=max_seq_length,
+                               max_output_size=max_output_size, max_depth=max_depth,
+                               max_time=max_time)
         self.verbose = verbose
         self.stack = []
+        # How many times each id is in the stack, for fast cycle detection
+        self._stack_ids = {}
         if singleton_pprinters is None:
             singleton_pprinters = _singleton_pprinters.copy()
         self.singleton_pprinters = singleton_pprinters
@@ -358,51 +417,139 @@ def __init__(self, output, verbose=False, max_width=79, newline='\n',
         if deferred_pprinters is None:
             deferred_pprinters = _deferred_type_pprinters.copy()
         self.deferred_pprinters = deferred_pprinters
+        # The printer found for each class met so far
+        self._class_pprinters = {}
 
     def pretty(self, obj):
-        """Pretty print the given object."""
+        """Pretty print the given object.
+
+        Containers whose printers have a ``pretty_items`` generator (the
+        builtin lists, tuples, dicts and sets) are printed without recursion:
+        the objects they yield are printed in turn, keeping the generators of
+        the enclosing containers on a stack.
+        """
+        if not self.stack and self.max_time and self.deadline is None:
+            self.deadline = time.perf_counter() + self.max_time
+        # The generators of the containers being printed, innermost last
+        work = []
+        try:
+            while True:
+                items = self._begin_object(obj)
+                if items is not None:
+                    work.append(items)
+                while work:
+                    try:
+                        obj = next(work[-1])
+                    except StopIteration:
+                        work.pop()
+                        self._end_object()
+                    else:
+                        break
+                else:
+                    break
+        except BaseException:
+            while work:
+                work.pop().close()
+                self._end_object()
+            raise
+        finally:
+            if not self.stack and self.budget_exceeded is not None:
+                note = self._budget_note()
+                self.flush()
+                self.output.write(note)
+                self.output_width += len(note)
+
+    def _begin_object(self, obj):
+        """Start printing an object.
+
+        Returns the generator of the objects it contains if its printer has
+        one, to be exhausted before calling :meth:`_end_object`. Otherwise
+        print the object completely and return None.
+        """
         obj_id = id(obj)
-        cycle = obj_id in self.stack
+        try:
+            obj_class = obj.__class__ or type(obj)
+        except Exception:
+            obj_class = type(obj)
+        # First try to find registered singleton printers for the type.
+        try:
+            printer = self.singleton_pprinters[obj_id]
+        except (TypeError, KeyError):
+            # Then use the printer for the class
+            try:
+                printer, items = self._class_pprinters[obj_class]
+            except KeyError:
+                printer, items = self._class_pprinters[obj_class] = \
+                    self._find_pprinter(obj_class)
+            except TypeError:
+                # unhashable class
+                printer, items = self._find_pprinter(obj_class)
+        else:
+            items = getattr(printer, 'pretty_items', None)
+        if printer is _repr_pprint:
+            # Objects printed by their repr don't add breakables, so they
+            # need neither a group nor cycle detection.
+            printer(obj, self, False)
+            return None
+
+        stack_ids = self._stack_ids
+        cycle = obj_id in stack_ids
+        stack_ids[obj_id] = stack_ids.get(obj_id, 0) + 1
         self.stack.append(obj_id)
         self.begin_group()
         try:
-            obj_class = _safe_getattr(obj, '__class__', None) or type(obj)
-            # First try to find registered singleton printers for the type.
-            try:
-                printer = self.singleton_pprinters[obj_id]
-            except (TypeError, KeyError):
-                pass
+            if items is not None:
+                return items(obj, self, cycle)
+            printer(obj, self, cycle)
+        except BaseException:
+            self._end_object()
+            raise
+        self._end_object()
+        return None
+
+    def _end_object(self):
+        self.end_group()
+        obj_id = self.stack.pop()
+        count = self._stack_ids.pop(obj_id) - 1
+        if count:
+            self._stack_ids[obj_id] = count
+
+    def _find_pprinter(self, obj_class):
+        """Find the printer for instances of a class.
+
+        Returns the printer, and its ``pretty_items`` generator function or
+        None.
+        """
+        printer = self._find_pprinter_function(obj_class)
+        return printer, getattr(printer, 'pretty_items', None)
+
+    def _find_pprinter_function(self, obj_class):
+        # Walk the mro and check for either:
+        #   1) a registered printer
+        #   2) a _repr_pretty_ method
+        for cls in _get_mro(obj_class):
+            if cls in self.type_pprinters:
+                # printer registered in self.type_pprinters
+                return self.type_pprinters[cls]
             else:
-                return printer(obj, self, cycle)
-            # Next walk the mro and check for either:
-            #   1) a registered printer
-            #   2) a _repr_pretty_ method
-            for cls in _get_mro(obj_class):
-                if cls in self.type_pprinters:
-                    # printer registered in self.type_pprinters
-                    return self.type_pprinters[cls](obj, self, cycle)
+                # deferred printer
+                printer = self._in_deferred_types(cls)
+                if printer is not None:
+                    return printer
                 else:
-                    # deferred printer
-                    printer = self._in_deferred_types(cls)
-                    if printer is not None:
-                        return printer(obj, self, cycle)
-                    else:
-                        # Finally look for special method names.
-                        # Some objects automatically create any requested
-                        # attribute. Try to ignore most of them by checking for
-                        # callability.
-                        if '_repr_pretty_' in cls.__dict__:
-                            meth = cls._repr_pretty_
-                            if callable(meth):
-                                return meth(obj, self, cycle)
-                        if cls is not object \
-                                and callable(cls.__dict__.get('__repr__')):
-                            return _repr_pprint(obj, self, cycle)
-
-            return _default_pprint(obj, self, cycle)
-        finally:
-            self.end_group()
-            self.stack.pop()
+                    # Finally look for special method names.
+                    # Some objects automatically create any requested
+                    # attribute. Try to ignore most of them by checking for
+                    # callability.
+                    if '_repr_pretty_' in cls.__dict__:
+                        meth = cls._repr_pretty_
+                        if callable(meth):
+                            return meth
+                    if cls is not object \
+                            and callable(cls.__dict__.get('__repr__')):
+                        return _repr_pprint
+
+        return _default_pprint
 
     def _in_deferred_types(self, cls):
         """
@@ -424,12 +571,14 @@ class is not in the registry. Successful matches will be moved to the
 
 
 class Printable(object):
+    __slots__ = ()
 
     def output(self, stream, output_width):
         return output_width
 
 
 class Text(Printable):
+    __slots__ = ('objs', 'width')
 
     def __init__(self):
         self.objs = []
@@ -446,6 +595,7 @@ def add(self, obj, width):
 
 
 class Breakable(Printable):
+    __slots__ = ('obj', 'width', 'pretty', 'indentation', 'group')
 
     def __init__(self, seq, width, pretty):
         self.obj = seq
@@ -468,6 +618,7 @@ def output(self, stream, output_width):
 
 
 class Group(Printable):
+    __slots__ = ('depth', 'breakables', 'want_break')
 
     def __init__(self, depth):
         self.depth = depth
@@ -544,26 +695,43 @@ def _default_pprint(obj, p, cycle):
     p.end_group(1, '>')
 
 
+def _items_pprinter(items):
+    """
+    Make a pprint function from a generator function, which prints a
+    container like a pprint function but yields the objects it contains
+    instead of calling ``p.pretty`` on them.
+
+    `RepresentationPrinter.pretty` runs the generator, found as the
+    ``pretty_items`` attribute of the pprint function, without recursing.
+    """
+    def inner(obj, p, cycle):
+        for x in items(obj, p, cycle):
+            p.pretty(x)
+    inner.pretty_items = items
+    return inner
+
+
 def _seq_pprinter_factory(start, end):
     """
     Factory that returns a pprint function useful for sequences.  Used by
     the default pprint for tuples, dicts, and lists.
     """
     def inner(obj, p, cycle):
-        if cycle:
-            return p.text(start + '...' + end)
+        if cycle or (len(obj) and p._too_deep(len(p.stack))):
+            p.text(start + '...' + end)
+            return
         step = len(start)
         p.begin_group(step, start)
         for idx, x in p._enumerate(obj):
             if idx:
                 p.text(',')
                 p.breakable()
-            p.pretty(x)
+            yield x
         if len(obj) == 1 and type(obj) is tuple:
             # Special case for 1-item tuples.
             p.text(',')
         p.end_group(step, end)
-    return inner
+    return _items_pprinter(inner)
 
 
 def _set_pprinter_factory(start, end):
@@ -571,8 +739,9 @@ def _set_pprinter_factory(start, end):
     Factory that returns a pprint function useful for sets and frozensets.
     """
     def inner(obj, p, cycle):
-        if cycle:
-            return p.text(start + '...' + end)
+        if cycle or (len(obj) and p._too_deep(len(p.stack))):
+            p.text(start + '...' + end)
+            return
         if len(obj) == 0:
             # Special case.
             p.text(type(obj).__name__ + '()')
@@ -588,9 +757,9 @@ def inner(obj, p, cycle):
                 if idx:
                     p.text(',')
                     p.breakable()
-                p.pretty(x)
+                yield x
             p.end_group(step, end)
-    return inner
+    return _items_pprinter(inner)
 
 
 def _dict_pprinter_factory(start, end):
@@ -599,8 +768,9 @@ def _dict_pprinter_factory(start, end):
     dicts and dict proxies.
     """
     def inner(obj, p, cycle):
-        if cycle:
-            return p.text('{...}')
+        if cycle or (len(obj) and p._too_deep(len(p.stack))):
+            p.text('{...}')
+            return
         step = len(start)
         p.begin_group(step, start)
         keys = obj.keys()
@@ -613,11 +783,11 @@ def inner(obj, p, cycle):
             if idx:
                 p.text(',')
                 p.breakable()
-            p.pretty(key)
+            yield key
             p.text(': ')
-            p.pretty(obj[key])
+            yield obj[key]
         p.end_group(step, end)
-    return inner
+    return _items_pprinter(inner)
 
 
 def _super_pprint(obj, p, cycle):
@@ -695,6 +865,8 @@ def _repr_pprint(obj, p, cycle):
     output = repr(obj)
     for idx,output_line in enumerate(output.splitlines()):
         if idx:
+            if p._out_of_budget():
+                break
             p.break_()
         p.text(output_line)
 
@@ -12,8 +12,12 @@
 #-----------------------------------------------------------------------------
 # Imports
 #-----------------------------------------------------------------------------
+from base64 import b64encode
+from io import BytesIO
 from tempfile import NamedTemporaryFile, mkdtemp
 from os.path import split, join as pjoin, dirname
+from unittest import mock
+import wave
 
 # Third-party imports
 import nose.tools as nt
@@ -174,4 +178,49 @@ def test_recursive_FileLinks():
 @skipif_not_numpy
 def test_audio_from_file():
     path = pjoin(dirname(__file__), 'test.wav')
-    display.Audio(filename=path)
+    audio = display.Audio(filename=path)
+    # the file is only read when displayed
+    nt.assert_is_none(audio._data)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    nt.assert_in('base64,' + b64encode(raw).decode('ascii'), audio._repr_html_())
+    # but must exist when the object is built
+    with nt.assert_raises(FileNotFoundError):
+        display.Audio(filename=pjoin(dirname(__file__), 'missing.wav'))
+
+def _read_wav(data):
+    with wave.open(BytesIO(bytes(data))) as w:
+        params = w.getnchannels(), w.getframerate(), w.getsampwidth()
+        return params, w.readframes(w.getnframes())
+
+@skipif_not_numpy
+def test_audio_from_array():
+    import numpy as np
+    t = np.linspace(0, 1, 1001)
+    left = np.sin(2 * np.pi * 5 * t)
+    right = 0.5 * np.cos(2 * np.pi * 5 * t)
+    expected = np.int16(np.array([left, right]).T.ravel() * 32767)
+
+    with mock.patch.object(display, '_WAV_CHUNK_FRAMES', 100):
+        stereo = display.Audio([left, right], rate=8000)
+    nt.assert_is_instance(stereo.data, bytes)
+    params, frames = _read_wav(stereo.data)
+    nt.assert_equal(params, (2, 8000, 2))
+    nt.assert_equal(frames, expected.astype('<i2').tobytes())
+    nt.assert_equal(stereo.mimetype, 'audio/wav')
+
+    # float32 and int16 samples are scaled without converting the array
+    for dtype in (np.float32, np.int16):
+        samples = (left * 1000).astype(dtype)
+        params, frames = _read_wav(display.Audio(samples, rate=8000).data)
+        nt.assert_equal(params, (1, 8000, 2))
+        scaled = np.frombuffer(frames, dtype='<i2')
+        nt.assert_equal(abs(scaled).max(), 32767)
+        nt.assert_true(np.all(abs(scaled - left * 32767) <= 40))
+
+    silence = display.Audio(np.zeros(10), rate=8000).data
+    nt.assert_is_instance(silence, bytes)
+    params, frames = _read_wav(silence)
+    nt.assert_equal(frames, bytes(20))
+    with nt.assert_raises(ValueError):
+        display.Audio(np.zeros((2, 2, 2)), rate=8000)
@@ -3,12 +3,14 @@
 
 # Copyright (c) IPython Development Team.
 # Distributed under the terms of the Modified BSD License.
+import os
 from unittest.mock import patch
 import nose.tools as nt
 
 from IPython.lib import latextools
 from IPython.testing.decorators import onlyif_cmds_exist, skipif_not_matplotlib
 from IPython.utils.process import FindCmdError
+from IPython.utils.tempdir import TemporaryDirectory
 
 
 def test_latex_to_png_dvipng_fails_when_no_cmd():
@@ -132,3 +134,67 @@ def mock_kpsewhich(filename):
 \begin{document}
 $$x^2$$
 \end{document}''')
+
+
+def test_latex_to_png_cached():
+    rendered = []
+    def mock_latex_to_png_mpl(s, wrap):
+        rendered.append((s, wrap))
+        if s == 'bad':
+            return None
+        return ('png:%s:%s' % (s, wrap)).encode('ascii')
+
+    tool = latextools.LaTeXTool.instance()
+    with TemporaryDirectory() as td, \
+            patch.object(latextools, 'latex_to_png_mpl',
+                         mock_latex_to_png_mpl):
+        tool.cache_dir = td
+        try:
+            for i in range(2):
+                nt.assert_equal(latextools.latex_to_png('x^2', wrap=True,
+                                                        backend='matplotlib'),
+                                b'png:x^2:True')
+                nt.assert_equal(latextools.latex_to_png('x^2', encode=True,
+                                                        backend='matplotlib'),
+                                b'cG5nOnheMjpGYWxzZQ==\n')
+                nt.assert_is_none(latextools.latex_to_png(
+                    'bad', backend='matplotlib'))
+            nt.assert_equal(rendered, [('x^2', True), ('x^2', False),
+                                       ('bad', False), ('bad', False)])
+
+            # A new session finds the images on disk
+            tool.cache_size = 1
+            del rendered[:]
+            latextools.latex_to_png('x^2', wrap=True, backend='matplotlib')
+            latextools.latex_to_png('x^2', backend='matplotlib')
+            nt.assert_equal(rendered, [])
+
+            tool.disk_cache_size = 1
+            latextools.latex_to_png('y', backend='matplotlib')
+            nt.assert_equal(len(os.listdir(td)), 1)
+            tool.get_cache().clear()
+            nt.assert_equal(os.listdir(td), [])
+        finally:
+            tool.cache_dir = None
+            tool.cache_size = 128
+            tool.disk_cache_size = 1000
+
+
+@skipif_not_matplotlib
+def test_cache_key_mpl_options():
+    import matplotlib
+    tool = latextools.LaTeXTool.instance()
+    key = tool.cache_key('x^2', 'matplotlib', False)
+    with matplotlib.rc_context({'mathtext.fontset': 'stix'}):
+        nt.assert_not_equal(tool.cache_key('x^2', 'matplotlib', False), key)
+    with patch.object(matplotlib, '__version__', '0.0'):
+        nt.assert_not_equal(tool.cache_key('x^2', 'matplotlib', False), key)
+    nt.assert_equal(tool.cache_key('x^2', 'matplotlib', False), key)
+
+
+def test_cache_key_tex_versions():
+    tool = latextools.LaTeXTool.instance()
+    with patch.object(latextools, '_tex_versions_found', ['TeX 1', 'dvipng 1']):
+        key = tool.cache_key('x^2', 'dvipng', False)
+    with patch.object(latextools, '_tex_versions_found', ['TeX 2', 'dvipng 1']):
+        nt.assert_not_equal(tool.cache_key('x^2', 'dvipng', False), key)
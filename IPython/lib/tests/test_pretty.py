@@ -6,6 +6,7 @@
 
 
 from collections import Counter, defaultdict, deque, OrderedDict
+import sys
 import types
 import string
 import unittest
@@ -406,6 +407,67 @@ def test_mappingproxy():
     for obj, expected in cases:
         nt.assert_equal(pretty.pretty(obj), expected)
 
+def test_budget_in_nested_reprs():
+    """The budget also stops multi-line reprs and sets"""
+    class ManyLines(object):
+        def __repr__(self):
+            return '\n'.join(['line'] * 1000)
+
+    output = pretty.pretty([ManyLines()])
+    nt.assert_equal(output.count('line'), 1000)
+
+    stream = StringIO()
+    printer = pretty.RepresentationPrinter(stream, max_output_size=50)
+    printer.pretty(ManyLines())
+    printer.flush()
+    nt.assert_less(stream.getvalue().count('line'), 15)
+    nt.assert_equal(printer.budget_exceeded, 'size')
+
+    stream = StringIO()
+    printer = pretty.RepresentationPrinter(stream, max_output_size=20)
+    printer.pretty({frozenset(range(100))})
+    printer.flush()
+    nt.assert_in(', ...})} <output truncated', stream.getvalue())
+
+
+def test_deeply_nested():
+    """Builtin containers are printed without recursion"""
+    depth = sys.getrecursionlimit() * 2
+    obj = []
+    for _ in range(depth):
+        obj = [{'a': (obj,)}]
+    output = pretty.pretty(obj)
+    nt.assert_true(output.startswith("[{'a': ([{'a': (["))
+    nt.assert_equal(output.count('('), depth)
+
+
+def test_container_printer_called_directly():
+    """The builtin printers still work when called by other printers"""
+    class Wrapper(object):
+        def __init__(self, content):
+            self.content = content
+        def _repr_pretty_(self, p, cycle):
+            with p.group(8, 'Wrapper(', ')'):
+                printer = pretty._type_pprinters[type(self.content)]
+                printer(self.content, p, cycle)
+
+    output = pretty.pretty([Wrapper([1, Wrapper({'a': [2]})])])
+    nt.assert_equal(output, "[Wrapper([1, Wrapper({'a': [2]})])]")
+
+
+def test_error_in_nested_printer():
+    class Bad(object):
+        def _repr_pretty_(self, p, cycle):
+            raise ValueError
+
+    stream = StringIO()
+    printer = pretty.RepresentationPrinter(stream)
+    with nt.assert_raises(ValueError):
+        printer.pretty([[1, {'a': Bad()}]])
+    nt.assert_equal(printer.stack, [])
+    nt.assert_equal(printer._stack_ids, {})
+
+
 def test_function_pretty():
     "Test pretty print of function"
     # posixpath is a pure python module, its interface is consistent
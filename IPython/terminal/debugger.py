@@ -19,53 +19,89 @@
 from prompt_toolkit.enums import EditingMode
 
 
-class TerminalPdb(Pdb):
-    def __init__(self, *args, **kwargs):
-        Pdb.__init__(self, *args, **kwargs)
-        self._ptcomp = None
-        self.pt_init()
+class _DebuggerPrompt(object):
+    """The prompt_toolkit application of TerminalPdb, shared by the debuggers
+    of a shell.
+
+    Building it takes a while, so it is cached on the shell and reused by the
+    next debuggers, as long as the shell's settings it depends on don't
+    change. ``pdb`` is the debugger currently using it, whose prompt is shown,
+    and is reset with the completer's namespaces when its session ends, so
+    that the debugger and its frames aren't kept alive.
+    """
+
+    def __init__(self, shell, settings):
+        self.settings = settings
+        self.pdb = None
 
-    def pt_init(self):
         def get_prompt_tokens(cli):
-            return [(Token.Prompt, self.prompt)]
+            return [(Token.Prompt, self.pdb.prompt)]
 
         def patch_stdout(**kwargs):
             return self.pt_cli.patch_stdout_context(**kwargs)
 
-        if self._ptcomp is None:
-            compl = IPCompleter(shell=self.shell,
-                                        namespace={},
-                                        global_namespace={},
-                                        parent=self.shell,
-                                       )
-            self._ptcomp = IPythonPTCompleter(compl, patch_stdout=patch_stdout)
+        compl = IPCompleter(shell=shell,
+                            namespace={},
+                            global_namespace={},
+                            parent=shell,
+                            )
+        self.ptcomp = IPythonPTCompleter(compl, patch_stdout=patch_stdout)
 
         kbmanager = KeyBindingManager.for_prompt()
         supports_suspend = Condition(lambda cli: hasattr(signal, 'SIGTSTP'))
         kbmanager.registry.add_binding(Keys.ControlZ, filter=supports_suspend
                                       )(suspend_to_bg)
 
-        if self.shell.display_completions == 'readlinelike':
+        if shell.display_completions == 'readlinelike':
             kbmanager.registry.add_binding(Keys.ControlI,
                                  filter=(HasFocus(DEFAULT_BUFFER)
                                          & ~HasSelection()
                                          & ViInsertMode() | EmacsInsertMode()
                                          & ~cursor_in_leading_ws
                                          ))(display_completions_like_readline)
-        multicolumn = (self.shell.display_completions == 'multicolumn')
+        multicolumn = (shell.display_completions == 'multicolumn')
 
-        self._pt_app = create_prompt_application(
-                            editing_mode=getattr(EditingMode, self.shell.editing_mode.upper()),
+        self.pt_app = create_prompt_application(
+                            editing_mode=getattr(EditingMode, shell.editing_mode.upper()),
                             key_bindings_registry=kbmanager.registry,
-                            history=self.shell.debugger_history,
-                            completer= self._ptcomp,
+                            history=shell.debugger_history,
+                            completer=self.ptcomp,
                             enable_history_search=True,
-                            mouse_support=self.shell.mouse_support,
+                            mouse_support=shell.mouse_support,
                             get_prompt_tokens=get_prompt_tokens,
                             display_completions_in_columns=multicolumn,
-                            style=self.shell.style
+                            style=shell.style
         )
-        self.pt_cli = CommandLineInterface(self._pt_app, eventloop=self.shell._eventloop)
+        self.pt_cli = CommandLineInterface(self.pt_app, eventloop=shell._eventloop)
+
+    @staticmethod
+    def settings_of(shell):
+        """The settings of shell the application is built from."""
+        return (shell.editing_mode, shell.display_completions,
+                shell.mouse_support, shell.style, shell.debugger_history,
+                shell._eventloop)
+
+    @classmethod
+    def for_shell(cls, shell):
+        """The prompt cached on shell, built again if its settings changed."""
+        settings = cls.settings_of(shell)
+        prompt = getattr(shell, '_debugger_prompt', None)
+        if prompt is None or prompt.settings != settings:
+            prompt = shell._debugger_prompt = cls(shell, settings)
+        return prompt
+
+
+class TerminalPdb(Pdb):
+    def __init__(self, *args, **kwargs):
+        Pdb.__init__(self, *args, **kwargs)
+        self._ptcomp = None
+        self.pt_init()
+
+    def pt_init(self):
+        self._pt_prompt = _DebuggerPrompt.for_shell(self.shell)
+        self._ptcomp = self._pt_prompt.ptcomp
+        self._pt_app = self._pt_prompt.pt_app
+        self.pt_cli = self._pt_prompt.pt_cli
 
     def cmdloop(self, intro=None):
         """Repeatedly issue a prompt, accept input, parse an initial prefix
@@ -89,6 +125,8 @@ def cmdloop(self, intro=None):
                 if self.cmdqueue:
                     line = self.cmdqueue.pop(0)
                 else:
+                    # The prompt may have been used by another debugger since
+                    self._pt_prompt.pdb = self
                     self._ptcomp.ipy_completer.namespace = self.curframe_locals
                     self._ptcomp.ipy_completer.global_namespace = self.curframe.f_globals
                     try:
@@ -101,6 +139,11 @@ def cmdloop(self, intro=None):
             self.postloop()
         except Exception:
             raise
+        finally:
+            # Don't keep this debugger and its frames alive with the prompt
+            self._pt_prompt.pdb = None
+            self._ptcomp.ipy_completer.namespace = {}
+            self._ptcomp.ipy_completer.global_namespace = {}
 
 
 def set_trace(frame=None):
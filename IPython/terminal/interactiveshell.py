@@ -5,6 +5,7 @@
 import warnings
 from warnings import warn
 
+from IPython.core.displaypub import DisplayPublisher
 from IPython.core.interactiveshell import InteractiveShell, InteractiveShellABC
 from IPython.utils import io
 from IPython.utils.py3compat import input
@@ -86,6 +87,17 @@ def get_default_editor():
 
 _use_simple_prompt = ('IPY_TEST_SIMPLE_PROMPT' in os.environ) or (not _is_tty)
 
+
+class TerminalDisplayPublisher(DisplayPublisher):
+    """Display publisher printing the plain text representation of objects.
+
+    Only the text/plain format is computed for displayed objects.
+    """
+    @default('accepted_mimetypes')
+    def _accepted_mimetypes_default(self):
+        return ['text/plain']
+
+
 class TerminalInteractiveShell(InteractiveShell):
     space_for_menu = Integer(6, help='Number of line at the bottom of the screen '
                                                   'to reserve for the completion menu'
@@ -175,6 +187,10 @@ def _(self, change):
     def _displayhook_class_default(self):
         return RichPromptDisplayHook
 
+    @default('display_pub_class')
+    def _display_pub_class_default(self):
+        return TerminalDisplayPublisher
+
     term_title = Bool(True,
         help="Automatically set the terminal title"
     ).tag(config=True)
@@ -31,11 +31,12 @@
 from IPython.core.shellapp import (
     InteractiveShellApp, shell_flags, shell_aliases
 )
+from IPython.core.startupprofile import StartupProfiler, startup_step
 from IPython.extensions.storemagic import StoreMagics
 from .interactiveshell import TerminalInteractiveShell
 from IPython.paths import get_ipython_dir
 from traitlets import (
-    Bool, List, default, observe, Type
+    Bool, List, Unicode, default, observe, Type
 )
 
 #-----------------------------------------------------------------------------
@@ -152,10 +153,16 @@ def make_report(self,traceback):
     script arguments.
     """
 )
+frontend_flags['startup-profile'] = (
+    {'TerminalIPythonApp' : {'startup_profile' : True}},
+    """Print how long each step of the startup took, including the modules
+    imported, the extensions loaded and the startup files run."""
+)
 flags.update(frontend_flags)
 
 aliases = dict(base_aliases)
 aliases.update(shell_aliases)
+aliases['startup-profile-file'] = 'TerminalIPythonApp.startup_profile_file'
 
 #-----------------------------------------------------------------------------
 # Main classes and functions
@@ -283,6 +290,26 @@ def _file_to_run_changed(self, change):
         if new and not self.force_interact:
                 self.interact = False
 
+    startup_profile = Bool(False,
+        help="""Profile the startup of IPython: time each initialisation step,
+        the modules imported, the extensions loaded and the startup files run,
+        and print the results once IPython is initialised."""
+    ).tag(config=True)
+    @observe('startup_profile')
+    def _startup_profile_changed(self, change):
+        if change['new'] and self.startup_profiler is None:
+            self.startup_profiler = StartupProfiler()
+            self.startup_profiler.start()
+
+    startup_profile_file = Unicode('',
+        help="""Write the startup profile to this JSON file instead of printing
+        it. Setting this enables startup_profile."""
+    ).tag(config=True)
+    @observe('startup_profile_file')
+    def _startup_profile_file_changed(self, change):
+        if change['new']:
+            self.startup_profile = True
+
     # internal, not-configurable
     something_to_run=Bool(False)
 
@@ -308,19 +335,55 @@ def initialize(self, argv=None):
         super(TerminalIPythonApp, self).initialize(argv)
         if self.subapp is not None:
             # don't bother initializing further, starting subapp
+            if self.startup_profiler is not None:
+                self.startup_profiler.stop()
             return
         # print self.extra_args
         if self.extra_args and not self.something_to_run:
             self.file_to_run = self.extra_args[0]
-        self.init_path()
+        try:
+            self._init_steps()
+        finally:
+            self.report_startup_profile()
+
+    def _init_steps(self):
+        profiler = self.startup_profiler
+        with startup_step(profiler, 'init_path'):
+            self.init_path()
         # create the shell
-        self.init_shell()
+        with startup_step(profiler, 'init_shell'):
+            self.init_shell()
         # and draw the banner
-        self.init_banner()
+        with startup_step(profiler, 'init_banner'):
+            self.init_banner()
         # Now a variety of things that happen after the banner is printed.
-        self.init_gui_pylab()
-        self.init_extensions()
-        self.init_code()
+        with startup_step(profiler, 'init_gui_pylab'):
+            self.init_gui_pylab()
+        with startup_step(profiler, 'init_extensions'):
+            self.init_extensions()
+        with startup_step(profiler, 'init_code'):
+            self.init_code()
+
+    def init_profile_dir(self):
+        with startup_step(self.startup_profiler, 'init_profile_dir'):
+            super(TerminalIPythonApp, self).init_profile_dir()
+
+    def load_config_file(self, *args, **kwargs):
+        with startup_step(self.startup_profiler, 'load_config_file'):
+            super(TerminalIPythonApp, self).load_config_file(*args, **kwargs)
+
+    def report_startup_profile(self):
+        """Stop profiling the startup, and print or save the results."""
+        profiler = self.startup_profiler
+        if profiler is None or not profiler.running:
+            return
+        profiler.stop()
+        if self.startup_profile_file:
+            profiler.write_json(self.startup_profile_file)
+            self.log.info("Startup profile written to %s",
+                          self.startup_profile_file)
+        else:
+            print(profiler.format_report(), file=sys.stderr)
 
     def init_shell(self):
         """initialize the InteractiveShell instance"""
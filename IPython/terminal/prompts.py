@@ -4,6 +4,7 @@
 import sys
 
 from IPython.core.displayhook import DisplayHook
+from traitlets import default
 
 from prompt_toolkit.layout.utils import token_list_width
 
@@ -60,6 +61,12 @@ def out_prompt_tokens(self):
 
 class RichPromptDisplayHook(DisplayHook):
     """Subclass of base display hook using coloured prompt"""
+
+    @default('accepted_mimetypes')
+    def _accepted_mimetypes_default(self):
+        # Only the plain text is written to the terminal
+        return ['text/plain']
+
     def write_output_prompt(self):
         sys.stdout.write(self.shell.separate_out)
         # If we're not displaying a prompt, it effectively ends with a newline,
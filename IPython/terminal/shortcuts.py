@@ -19,6 +19,7 @@
 from prompt_toolkit.keys import Keys
 from prompt_toolkit.key_binding.bindings.completion import display_completions_like_readline
 
+from IPython.core.inputsplitter import IncrementalCompleteChecker
 from IPython.utils.decorators import undoc
 
 @undoc
@@ -100,6 +101,8 @@ def register_ipython_shortcuts(registry, shell):
 
 
 def newline_or_execute_outer(shell):
+    checker = IncrementalCompleteChecker(shell.input_splitter)
+
     def newline_or_execute(event):
         """When the user presses return, insert a newline or execute the code."""
         b = event.current_buffer
@@ -119,7 +122,7 @@ def newline_or_execute(event):
             check_text = d.text
         else:
             check_text = d.text[:d.cursor_position]
-        status, indent = shell.input_splitter.check_complete(check_text + '\n')
+        status, indent = checker.check_complete(check_text + '\n')
 
         if not (d.on_last_line or
                 d.cursor_position_row >= d.line_count - d.empty_line_count_at_the_end()
@@ -216,6 +219,7 @@ def newline_autoindent_outer(inputsplitter) -> Callable[..., None]:
     by 4 extra space after a function definition, class definition, context
     manager... And dedent by 4 space after ``pass``, ``return``, ``raise ...``.
     """
+    checker = IncrementalCompleteChecker(inputsplitter)
 
     def newline_autoindent(event):
         """insert a newline after the cursor indented appropriately."""
@@ -225,7 +229,7 @@ def newline_autoindent(event):
         if b.complete_state:
             b.cancel_completion()
         text = d.text[:d.cursor_position] + '\n'
-        _, indent = inputsplitter.check_complete(text)
+        _, indent = checker.check_complete(text)
         b.insert_text('\n' + (' ' * (indent or 0)), move_cursor=False)
 
     return newline_autoindent
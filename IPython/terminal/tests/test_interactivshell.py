@@ -5,6 +5,7 @@
 
 import sys
 import unittest
+from unittest import mock
 
 from IPython.core.inputtransformer import InputTransformer
 from IPython.testing import tools as tt
@@ -174,3 +175,57 @@ def test_paste_magics_blankline(self):
         tm.store_or_execute(s, name=None)
         
         self.assertEqual(ip.user_ns['pasted_func'](54), 55)
+
+
+@unittest.skipUnless(sys.stdout.isatty(), "prompt_toolkit needs a terminal")
+class TerminalPdbTestCase(unittest.TestCase):
+    def setUp(self):
+        # The test shell uses the simple prompt, which doesn't set these up
+        from prompt_toolkit.shortcuts import create_eventloop
+        from prompt_toolkit.styles import style_from_dict
+        self.ip = get_ipython()
+        self.ip.style = style_from_dict({})
+        self.ip._eventloop = create_eventloop()
+
+    def tearDown(self):
+        self.ip._eventloop.close()
+        del self.ip.style, self.ip._eventloop
+        self.ip.__dict__.pop('_debugger_prompt', None)
+
+    def test_prompt_reused(self):
+        from IPython.terminal.debugger import TerminalPdb
+        first = TerminalPdb()
+        second = TerminalPdb()
+        nt.assert_is(first.pt_cli, second.pt_cli)
+        nt.assert_is(first._ptcomp, second._ptcomp)
+        # The shared prompt shows the prompt of the debugger running it
+        nt.assert_is_none(second._pt_prompt.pdb)
+
+        # Changing a setting the application depends on builds a new one
+        old_mode = self.ip.editing_mode
+        self.ip.editing_mode = 'vi' if old_mode == 'emacs' else 'emacs'
+        try:
+            third = TerminalPdb()
+        finally:
+            self.ip.editing_mode = old_mode
+        nt.assert_is_not(third.pt_cli, second.pt_cli)
+
+    def test_prompt_released(self):
+        from IPython.terminal.debugger import TerminalPdb
+        pdb = TerminalPdb()
+        pdb.reset()
+        pdb.setup(sys._getframe(), None)
+        prompt = pdb._pt_prompt
+        completer = pdb._ptcomp.ipy_completer
+        seen = []
+        def run(**kwargs):
+            seen.append((prompt.pdb, completer.namespace))
+            return mock.Mock(text='help')
+        with mock.patch.object(pdb.pt_cli, 'run', run), \
+                mock.patch.object(pdb, 'onecmd', return_value=True):
+            pdb.cmdloop()
+        nt.assert_equal(seen, [(pdb, pdb.curframe_locals)])
+        # The session is over: the prompt doesn't keep the debugger alive
+        nt.assert_is_none(prompt.pdb)
+        nt.assert_equal(completer.namespace, {})
+        nt.assert_equal(completer.global_namespace, {})
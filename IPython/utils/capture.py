@@ -154,6 +154,8 @@ def __enter__(self):
             stderr = sys.stderr = StringIO()
         if self.display:
             self.save_display_pub = self.shell.display_pub
+            if hasattr(self.save_display_pub, 'flush_updates'):
+                self.save_display_pub.flush_updates()
             self.shell.display_pub = CapturingDisplayPublisher()
             outputs = self.shell.display_pub.outputs
             self.save_display_hook = sys.displayhook
@@ -166,5 +168,6 @@ def __exit__(self, exc_type, exc_value, traceback):
         sys.stdout = self.sys_stdout
         sys.stderr = self.sys_stderr
         if self.display and self.shell:
+            self.shell.display_pub.flush_updates()
             self.shell.display_pub = self.save_display_pub
             sys.displayhook = self.save_display_hook
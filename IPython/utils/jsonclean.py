@@ -0,0 +1,196 @@
+# encoding: utf-8
+"""Making Python objects safe to encode in JSON.
+
+:func:`json_clean` follows the rules of ``jupyter_client.jsonutil.json_clean``,
+which the kernel applies to the messages it sends, but is meant for large
+payloads: it walks nested containers with an explicit stack rather than
+recursively, keeps lists and dicts which only hold JSON values as they are,
+and converts NumPy arrays and scalars with NumPy rather than element by
+element.
+"""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+from binascii import b2a_base64
+from datetime import datetime
+import math
+import numbers
+from operator import is_
+import sys
+import types
+
+# ISO8601-ify datetime objects
+ISO8601 = "%Y-%m-%dT%H:%M:%S.%f"
+
+# Types whose instances are valid JSON values as they are
+_ATOMIC_TYPES = frozenset([str, int, bool, type(None)])
+# Types of the items of lists which are valid JSON if their floats add up
+# to a finite number (no NaN nor infinity)
+_NUMBER_TYPES = frozenset([int, float, bool])
+_JSON_TYPES = _ATOMIC_TYPES | _NUMBER_TYPES
+
+_CONTAINER_TO_LIST = (tuple, set, frozenset, types.GeneratorType)
+
+
+def _is_json_list(items):
+    """Whether all the items of a list are JSON values, without cleaning."""
+    item_types = set(map(type, items))
+    if item_types <= _ATOMIC_TYPES:
+        return True
+    if not item_types <= _JSON_TYPES:
+        return False
+    if not item_types <= _NUMBER_TYPES:
+        items = [x for x in items if type(x) is float]
+    try:
+        return math.isfinite(sum(items))
+    except OverflowError:
+        return False
+
+
+def _clean_array(array, np):
+    """Convert a NumPy array to nested lists.
+
+    Returns the lists, and whether they may still need cleaning.
+    """
+    kind = array.dtype.kind
+    if kind in 'biu' or (kind == 'f' and np.isfinite(array).all()):
+        return array.tolist(), False
+    return array.tolist(), True
+
+
+def json_clean(obj):
+    """Clean an object to ensure it's safe to encode in JSON.
+
+    Atomic, immutable objects are returned unmodified. Sets, tuples and
+    iterators are converted to lists, dict keys to strings, NaN and infinite
+    floats to their repr, bytes to base64 and datetimes to ISO 8601 strings.
+    NumPy arrays become (nested) lists, and NumPy scalars Python scalars.
+
+    Lists and dicts which don't need any change are returned as they are,
+    rather than copied; others are copied, so *obj* is never modified.
+
+    Raises ValueError for objects which can't be represented in JSON, for
+    dicts whose keys collide once converted to strings, and for containers
+    which contain themselves.
+    """
+    np = sys.modules['numpy'] if 'numpy' in sys.modules else None
+    isfinite = math.isfinite
+    result = [obj]
+    # (container, key) of the values to clean, which are replaced in their
+    # container, or (None, (container, key, source, copied)) once the
+    # children of the value cleaned from source are done.
+    todo = [(result, 0)]
+    # ids of the containers whose children are being cleaned
+    walking = set()
+    while todo:
+        container, key = todo.pop()
+        if container is None:
+            container, key, source, copied = key
+            walking.discard(id(source))
+            if copied:
+                # Keep the original if none of its items had to change
+                value = container[key]
+                items = value.values() if copied is dict else value
+                originals = source.values() if copied is dict else source
+                if all(map(is_, items, originals)):
+                    container[key] = source
+            continue
+        value = container[key]
+        cls = type(value)
+        if cls in _ATOMIC_TYPES:
+            continue
+        if cls is float:
+            if not isfinite(value):
+                container[key] = repr(value)
+            continue
+
+        if np is not None:
+            if isinstance(value, np.ndarray):
+                value, dirty = _clean_array(value, np)
+                container[key] = value
+                if dirty:
+                    todo.append((container, key))
+                continue
+            if isinstance(value, np.generic):
+                container[key] = value.item()
+                if type(container[key]) not in _ATOMIC_TYPES:
+                    todo.append((container, key))
+                continue
+
+        # Since bools are a subtype of Integrals, which are a subtype of
+        # Reals, we have to check them in that order.
+        if isinstance(value, bool):
+            container[key] = bool(value)
+            continue
+        if isinstance(value, numbers.Integral):
+            # cast int to int, in case subclasses override __str__
+            container[key] = int(value)
+            continue
+        if isinstance(value, numbers.Real):
+            # cast out-of-range floats to their reprs
+            value = float(value)
+            container[key] = value if isfinite(value) else repr(value)
+            continue
+        if isinstance(value, str):
+            container[key] = str(value)
+            continue
+        if isinstance(value, bytes):
+            container[key] = b2a_base64(value).decode('ascii')
+            continue
+        if isinstance(value, datetime):
+            container[key] = value.strftime(ISO8601)
+            continue
+
+        source = value
+        # type of the container if value is a copy of it, with the same keys
+        copied = None
+        if isinstance(value, _CONTAINER_TO_LIST) or (
+                hasattr(value, '__iter__') and hasattr(value, '__next__')):
+            value = list(value)
+        if isinstance(value, list):
+            if _is_json_list(value):
+                container[key] = value
+                continue
+            if value is source:
+                value = list(value)
+                copied = list
+            children = range(len(value))
+        elif isinstance(value, dict):
+            if not set(map(type, value)) <= {str}:
+                # First, validate that the dict won't lose data in conversion
+                # due to key collisions after stringification.  This can
+                # happen with keys like True and 'true' or 1 and '1', which
+                # collide in JSON.
+                value = {str(k): v for k, v in value.items()}
+                if len(value) != len(source):
+                    raise ValueError('dict cannot be safely converted to '
+                                     'JSON: key collision would lead to '
+                                     'dropped values')
+            elif _is_json_list(list(value.values())):
+                continue
+            else:
+                value = dict(value)
+                copied = dict
+            children = list(value)
+        else:
+            # we don't understand it, it's probably an unserializable object
+            raise ValueError("Can't clean for JSON: %r" % value)
+
+        if id(source) in walking:
+            raise ValueError("Can't clean for JSON: circular reference in %r"
+                             % cls.__name__)
+        container[key] = value
+        walking.add(id(source))
+        todo.append((None, (container, key, source, copied)))
+        for k in children:
+            item = value[k]
+            item_type = type(item)
+            if item_type in _ATOMIC_TYPES:
+                continue
+            if item_type is float:
+                if not isfinite(item):
+                    value[k] = repr(item)
+                continue
+            todo.append((value, k))
+    return result[0]
@@ -0,0 +1,101 @@
+# coding: utf-8
+"""Tests for IPython.utils.jsonclean"""
+
+# Copyright (c) IPython Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+from datetime import datetime
+import json
+
+import nose.tools as nt
+
+from IPython.testing.decorators import skipif_not_numpy
+from IPython.utils.jsonclean import json_clean
+
+
+def test_json_clean():
+    now = datetime(2017, 3, 4, 5, 6, 7, 8)
+    pairs = [
+        (1, 1),
+        (1.5, 1.5),
+        (float('nan'), 'nan'),
+        (float('-inf'), '-inf'),
+        ('hi', 'hi'),
+        (None, None),
+        (True, True),
+        (b'\x00\x01', 'AAE=\n'),
+        (now, '2017-03-04T05:06:07.000008'),
+        ((1, 2), [1, 2]),
+        ({1}, [1]),
+        (iter([1, 'a']), [1, 'a']),
+        ({1: 'x', 'a': (1.0, float('inf'))}, {'1': 'x', 'a': [1.0, 'inf']}),
+        ([[1, b'\x00'], {'a': [now]}],
+         [[1, 'AA==\n'], {'a': ['2017-03-04T05:06:07.000008']}]),
+    ]
+    for obj, expected in pairs:
+        out = json_clean(obj)
+        nt.assert_equal(out, expected)
+        json.dumps(out)
+
+
+def test_json_clean_no_copy():
+    values = [1, 2.5, 'a', None, True]
+    nt.assert_is(json_clean(values), values)
+    data = {'a': values, 'b': 1}
+    nt.assert_is(json_clean(data), data)
+    # Containers needing changes are copied, not modified
+    data = {'a': values, 'b': (1,)}
+    out = json_clean(data)
+    nt.assert_equal(out, {'a': values, 'b': [1]})
+    nt.assert_is(out['a'], values)
+    nt.assert_equal(data['b'], (1,))
+    nested = [[1, float('nan')]]
+    nt.assert_equal(json_clean(nested), [[1, 'nan']])
+    nt.assert_is_instance(nested[0][1], float)
+
+
+def test_json_clean_errors():
+    with nt.assert_raises(ValueError):
+        json_clean(object())
+    with nt.assert_raises(ValueError):
+        json_clean({1: 'a', '1': 'b'})
+    loop = [1]
+    loop.append([loop])
+    with nt.assert_raises(ValueError):
+        json_clean(loop)
+    # shared, but not circular
+    shared = [[1, (2,)]]
+    nt.assert_equal(json_clean([shared, shared]), [[[1, [2]]]] * 2)
+
+
+def test_json_clean_deep():
+    deep = []
+    for i in range(10000):
+        deep = [deep, (i,)]
+    out = json_clean(deep)
+    for i in reversed(range(10000)):
+        nt.assert_equal(out[1], [i])
+        out = out[0]
+    nt.assert_equal(out, [])
+
+
+@skipif_not_numpy
+def test_json_clean_numpy():
+    import numpy as np
+    pairs = [
+        (np.arange(3), [0, 1, 2]),
+        (np.array([[1.5, 2], [3, 4]], dtype=np.float32), [[1.5, 2], [3, 4]]),
+        (np.array([1.0, np.nan, -np.inf]), [1.0, 'nan', '-inf']),
+        (np.array([True]), [True]),
+        (np.array(['a', 'b']), ['a', 'b']),
+        (np.array([b'\x01']), ['AQ==\n']),
+        (np.float32(0.5), 0.5),
+        (np.float64(np.nan), 'nan'),
+        (np.int8(3), 3),
+        (np.bool_(False), False),
+        ({'a': np.arange(2), 'b': [np.int64(1)]}, {'a': [0, 1], 'b': [1]}),
+    ]
+    for obj, expected in pairs:
+        out = json_clean(obj)
+        nt.assert_equal(out, expected)
+        json.dumps(out)
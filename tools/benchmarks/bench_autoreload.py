@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Benchmark the checks autoreload runs before each cell.
+
+Usage:
+
+./bench_autoreload.py [-n NUMBER] [-m MODULES]
+
+Imports many small modules from a temporary directory, and times
+ModuleReloader.check() as run by ``%autoreload 2`` before each cell, with the
+modification time of each module checked every time and with an
+InotifyWatcher (where inotify is available). Then changes one module, and
+checks that it is reloaded.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+from IPython.extensions.autoreload import InotifyWatcher, ModuleReloader
+
+
+def make_modules(directory, count):
+    names = []
+    for i in range(count):
+        name = 'bench_autoreload_%d' % i
+        with open(os.path.join(directory, name + '.py'), 'w') as f:
+            f.write('x = %d\n' % i)
+        names.append(name)
+    importlib.invalidate_caches()
+    return [importlib.import_module(name) for name in names]
+
+
+def time_checks(reloader, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        reloader.check()
+    return (time.perf_counter() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=20,
+                        help="number of checks to time")
+    parser.add_argument('-m', '--modules', type=int, default=2000,
+                        help="number of modules to import")
+    args = parser.parse_args()
+
+    engines = [('stat', None)]
+    if InotifyWatcher.available():
+        engines.append(('inotify', InotifyWatcher))
+
+    with tempfile.TemporaryDirectory() as td:
+        sys.path.insert(0, td)
+        try:
+            modules = make_modules(td, args.modules)
+            print("%d modules loaded" % len(sys.modules))
+            for name, watcher_cls in engines:
+                watcher = watcher_cls() if watcher_cls else None
+                reloader = ModuleReloader(watcher)
+                reloader.enabled = True
+                t = time_checks(reloader, args.number)
+                print("%-8s %8.2f ms per check" % (name, t * 1e3))
+
+                # Change a module; its mtime must differ from the last one
+                module = modules[-1]
+                value = module.x
+                time.sleep(1.05)
+                with open(module.__file__, 'w') as f:
+                    f.write('x = %d\n' % (value + 1))
+                reloader.check()
+                assert module.x == value + 1, "%s not reloaded" % name
+                if watcher is not None:
+                    watcher.close()
+        finally:
+            sys.path.remove(td)
+
+
+if __name__ == '__main__':
+    main()
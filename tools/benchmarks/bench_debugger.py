@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Benchmark running code to a breakpoint under the debugger.
+
+Usage:
+
+./bench_debugger.py [-n NUMBER] [-s SIZE]
+
+Runs a loop calling small functions, from a file with a breakpoint at its
+end, under the standard library's pdb, IPython's Pdb, and IPython's Pdb with
+fast_tracing. Each debugger is told to continue to the breakpoint, and then
+to the end. Reports the time taken by each, and the overhead over running the
+code without a debugger.
+"""
+
+import argparse
+from contextlib import redirect_stdout
+import importlib
+import io
+import os
+import pdb
+import sys
+import tempfile
+import time
+
+from IPython.core.debugger import Pdb
+
+TARGET = '''\
+def helper(i):
+    return i * i % 7
+
+
+def step(total, i):
+    return total + helper(i)
+
+
+def work(n):
+    total = 0
+    for i in range(n):
+        total = step(total, i)
+    return done(total)
+
+
+def done(total):
+    result = total
+    return result
+'''
+
+# Line of `result = total` in TARGET
+BREAK_LINE = TARGET.splitlines().index('    result = total') + 1
+
+
+def run(debugger_cls, module, n, **kwargs):
+    commands = '\n'.join([
+        'break %s:%d' % (module.__file__, BREAK_LINE),
+        'continue',
+        'p total',
+        'continue',
+    ]) + '\n'
+    stdout = io.StringIO()
+    debugger = debugger_cls(stdin=io.StringIO(commands), stdout=stdout,
+                            **kwargs)
+    # IPython's Pdb prints stack entries to sys.stdout
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = debugger.runcall(module.work, n)
+        elapsed = time.perf_counter() - start
+    debugger.clear_all_breaks()
+    assert str(result) in stdout.getvalue(), stdout.getvalue()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=3,
+                        help="number of runs to time for each debugger")
+    parser.add_argument('-s', '--size', type=int, default=200000,
+                        help="number of iterations of the loop")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        with open(os.path.join(td, 'bench_debugger_target.py'), 'w') as f:
+            f.write(TARGET)
+        sys.path.insert(0, td)
+        try:
+            module = importlib.import_module('bench_debugger_target')
+        finally:
+            sys.path.remove(td)
+
+        start = time.perf_counter()
+        module.work(args.size)
+        base = time.perf_counter() - start
+        print("%-20s %8.1f ms" % ('no debugger', base * 1e3))
+
+        engines = [('pdb', pdb.Pdb, {}),
+                   ('IPython Pdb', Pdb, {}),
+                   ('IPython Pdb fast', Pdb, {'fast_tracing': True})]
+        for name, cls, kwargs in engines:
+            t = min(run(cls, module, args.size, **kwargs)
+                    for _ in range(args.number))
+            print("%-20s %8.1f ms  (x%.1f)" % (name, t * 1e3, t / base))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark the dispatch of objects to their formatters.
+
+Usage:
+
+./bench_formatter_dispatch.py [-n NUMBER]
+
+Reports the time to look up the formatter of an object for each of the
+mimetypes of a DisplayFormatter, to compute the whole format data of objects
+of a few types, and to pretty print a list of mixed objects.
+"""
+
+import argparse
+from collections import OrderedDict
+import timeit
+
+from IPython.core.formatters import DisplayFormatter
+
+
+class Plain(object):
+    pass
+
+
+class Deep(OrderedDict):
+    """A class with a longer mro, and no printer anywhere in it."""
+
+
+def lookup_all(formatter, obj):
+    for f in formatter.formatters.values():
+        try:
+            f.lookup(obj)
+        except KeyError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=20000,
+                        help="number of calls to time for each case")
+    args = parser.parse_args()
+
+    formatter = DisplayFormatter()
+    objects = [1, 'text', [1, 2], Plain(), Deep()]
+    mixed = [1, 2.5, 'a', (1, 2), Plain(), Deep(), None] * 100
+
+    for obj in objects:
+        name = type(obj).__name__
+        t = min(timeit.repeat(lambda: lookup_all(formatter, obj),
+                              number=args.number, repeat=3))
+        print("lookup %-8s  %6.2f us" % (name, t / args.number * 1e6))
+    for obj in objects:
+        name = type(obj).__name__
+        t = min(timeit.repeat(lambda: formatter.format(obj),
+                              number=args.number, repeat=3))
+        print("format %-8s  %6.2f us" % (name, t / args.number * 1e6))
+
+    number = max(args.number // 1000, 1)
+    plain = formatter.formatters['text/plain']
+    t = min(timeit.repeat(lambda: plain(mixed), number=number, repeat=3))
+    print("pretty %d items  %6.2f ms" % (len(mixed), t / number * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Benchmark json_clean on large payloads.
+
+Usage:
+
+./bench_json_clean.py [-n NUMBER] [-s SIZE]
+
+Compares IPython.utils.jsonclean.json_clean with the recursive implementation
+of jupyter_client.jsonutil.json_clean (the installed one if jupyter_client is
+available, else a copy of it). The recursive implementation doesn't support
+NumPy arrays, so it is given ``array.tolist()`` for those, and the time of
+that conversion is included.
+"""
+
+import argparse
+from binascii import b2a_base64
+from datetime import datetime
+import math
+import numbers
+import random
+import timeit
+import types
+
+from IPython.utils.jsonclean import json_clean
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def recursive_json_clean(obj):
+    """json_clean as implemented by jupyter_client 5"""
+    atomic_ok = (str, type(None))
+    container_to_list = (tuple, set, types.GeneratorType)
+    if isinstance(obj, bool):
+        return obj
+    if isinstance(obj, numbers.Integral):
+        return int(obj)
+    if isinstance(obj, numbers.Real):
+        if math.isnan(obj) or math.isinf(obj):
+            return repr(obj)
+        return float(obj)
+    if isinstance(obj, atomic_ok):
+        return obj
+    if isinstance(obj, bytes):
+        return b2a_base64(obj).decode('ascii')
+    if isinstance(obj, container_to_list) or (
+            hasattr(obj, '__iter__') and hasattr(obj, '__next__')):
+        obj = list(obj)
+    if isinstance(obj, list):
+        return [recursive_json_clean(x) for x in obj]
+    if isinstance(obj, dict):
+        nkeys = len(obj)
+        nkeys_collapsed = len(set(map(str, obj)))
+        if nkeys != nkeys_collapsed:
+            raise ValueError('dict cannot be safely converted to JSON: '
+                             'key collision would lead to dropped values')
+        out = {}
+        for k, v in obj.items():
+            out[str(k)] = recursive_json_clean(v)
+        return out
+    if isinstance(obj, datetime):
+        return obj.strftime("%Y-%m-%dT%H:%M:%S.%f")
+    raise ValueError("Can't clean for JSON: %r" % obj)
+
+try:
+    from jupyter_client.jsonutil import json_clean as reference_json_clean
+except ImportError:
+    reference_json_clean = recursive_json_clean
+
+
+def reference(obj):
+    if np is not None and isinstance(obj, np.ndarray):
+        obj = obj.tolist()
+    return reference_json_clean(obj)
+
+
+def payloads(size):
+    rng = random.Random(0)
+    yield 'floats', [rng.random() for _ in range(size)]
+    yield 'strings', ['item-%d' % i for i in range(size)]
+    yield 'records', [{'id': i, 'name': 'item-%d' % i, 'score': rng.random(),
+                       'tags': ('a', 'b'), 'owner': None}
+                      for i in range(size // 10)]
+    yield 'mixed', [rng.random() if i % 2 else 'x' for i in range(size)]
+    if np is not None:
+        yield 'array', np.random.RandomState(0).rand(size // 100, 100)
+        yield 'array nan', np.where(np.arange(size) % 1000, 1.0, np.nan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=3,
+                        help="number of runs to time for each case")
+    parser.add_argument('-s', '--size', type=int, default=1000000,
+                        help="number of values in the payloads")
+    args = parser.parse_args()
+
+    for name, obj in payloads(args.size):
+        assert json_clean(obj) == reference(obj), name
+        for engine, func in [('reference', reference),
+                             ('json_clean', json_clean)]:
+            t = min(timeit.repeat(lambda: func(obj), number=args.number,
+                                  repeat=3))
+            print("%-10s %-10s %8.1f ms" % (name, engine,
+                                            t / args.number * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Benchmark the cost of setting up the builtin magics at shell startup.
+
+Usage:
+
+./bench_magics_startup.py [-n RUNS]
+
+Each run starts a fresh interpreter, imports IPython and creates an
+InteractiveShell, and reports the best time over all runs. It does so twice:
+with the builtin magics registered lazily, as the shell does by default, and
+with all of them loaded straight away, as the shell used to do.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Executed in a fresh interpreter for each run; prints the elapsed time.
+_template = """
+import time
+t0 = time.perf_counter()
+from IPython.core.interactiveshell import InteractiveShell
+shell = InteractiveShell.instance()
+if {eager}:
+    shell.magics_manager.load_lazy()
+print(time.perf_counter() - t0)
+"""
+
+
+def best_time(eager, runs):
+    code = _template.format(eager=eager)
+    times = []
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, '-c', code])
+        times.append(float(out.decode().split()[-1]))
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--runs', type=int, default=10,
+                        help="number of interpreters to start for each mode")
+    args = parser.parse_args()
+
+    lazy = best_time(False, args.runs)
+    eager = best_time(True, args.runs)
+    print("lazy magics:  %.1f ms" % (lazy * 1e3))
+    print("eager magics: %.1f ms" % (eager * 1e3))
+    print("saved:        %.1f ms" % ((eager - lazy) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Benchmark the pretty printer on large JSON-like payloads.
+
+Usage:
+
+./bench_pretty.py [-n NUMBER] [-s SIZE]
+
+Compares RepresentationPrinter, which prints the builtin containers from an
+explicit stack, with a printer recursing through p.pretty() for each nesting
+level like it used to. Reports the time to pretty print a few payloads, and
+the deepest nested list each printer can handle.
+"""
+
+import argparse
+from io import StringIO
+import random
+import sys
+import timeit
+
+from IPython.lib import pretty
+
+
+class RecursivePrinter(pretty.RepresentationPrinter):
+    """RepresentationPrinter calling the printer of each object recursively."""
+
+    def pretty(self, obj):
+        obj_id = id(obj)
+        cycle = obj_id in self.stack
+        self.stack.append(obj_id)
+        self.begin_group()
+        try:
+            obj_class = type(obj)
+            try:
+                printer = self.singleton_pprinters[obj_id]
+            except (TypeError, KeyError):
+                try:
+                    printer = self._class_pprinters[obj_class][0]
+                except KeyError:
+                    printer = self._find_pprinter(obj_class)[0]
+                    self._class_pprinters[obj_class] = (printer, None)
+            return printer(obj, self, cycle)
+        finally:
+            self.end_group()
+            self.stack.pop()
+
+
+def render(cls, obj, **kwargs):
+    stream = StringIO()
+    printer = cls(stream, max_seq_length=0, **kwargs)
+    printer.pretty(obj)
+    printer.flush()
+    return stream.getvalue()
+
+
+def record(rng, i):
+    return {
+        'id': i,
+        'name': 'item-%d' % i,
+        'score': rng.random(),
+        'tags': ['t%d' % rng.randrange(50) for _ in range(5)],
+        'active': bool(i % 2),
+        'owner': None if i % 3 else {'name': 'user%d' % i, 'groups': [1, 2]},
+        'position': (rng.random(), rng.random()),
+    }
+
+
+def nested(depth):
+    obj = {'leaf': [1, 2, 3]}
+    for i in range(depth):
+        obj = {'level': i, 'children': [obj, 'x']}
+    return obj
+
+
+def max_depth(cls, limit=200000):
+    """The deepest nesting of lists (by powers of two) cls can print."""
+    depth = 1
+    while depth <= limit:
+        obj = []
+        for _ in range(depth):
+            obj = [obj]
+        try:
+            render(cls, obj)
+        except RecursionError:
+            return depth // 2
+        depth *= 2
+    return limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=5,
+                        help="number of runs to time for each case")
+    parser.add_argument('-s', '--size', type=int, default=5000,
+                        help="number of records in the payloads")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    payloads = [
+        ('records', [record(rng, i) for i in range(args.size)]),
+        ('by id', {'r%d' % i: record(rng, i) for i in range(args.size)}),
+        ('nested', nested(min(args.size, sys.getrecursionlimit() // 8))),
+    ]
+    engines = [('recursive', RecursivePrinter),
+               ('iterative', pretty.RepresentationPrinter)]
+
+    for name, obj in payloads:
+        outputs = set()
+        for engine, cls in engines:
+            outputs.add(render(cls, obj))
+            t = min(timeit.repeat(lambda: render(cls, obj),
+                                  number=args.number, repeat=3))
+            print("%-8s %-10s %8.1f ms" % (name, engine,
+                                           t / args.number * 1e3))
+        assert len(outputs) == 1, "the printers disagree on %s" % name
+
+    for engine, cls in engines:
+        print("max depth %-10s %d" % (engine, max_depth(cls)))
+
+
+if __name__ == '__main__':
+    main()